@@ -0,0 +1,222 @@
+import math
+from typing import Dict, Any, Optional
+
+from qgis.PyQt.QtCore import QCoreApplication, QVariant
+from qgis.core import QgsProcessingContext, QgsProcessingFeedback, QgsProcessingAlgorithm, \
+    QgsProcessingParameterRasterLayer, QgsProcessingParameterNumber, QgsProcessingParameterFeatureSource, \
+    QgsProcessingParameterField, QgsProcessingParameterFeatureSink, QgsProcessingParameterEnum, QgsProcessing, \
+    QgsProcessingException, QgsFeature, QgsFeatureSink, QgsField, QgsFields, NULL
+
+from . import constants
+from .calculate_si_processing_script import CalculateSiProcessingScript
+from .clip_raster_processing_script import ClipRasterProcessingScript
+from .urban_sprawl.common.progress_monitor import CanceledError
+from .urban_sprawl.pipeline.batch_urban_sprawl_pipeline import BatchUrbanSprawlPipeline, UrbanSprawlZone
+from .urban_sprawl.si.si_engine import SiEngine
+
+
+class CalculateBatchWupProcessingScript(QgsProcessingAlgorithm):  # type: ignore
+    SSA = 'SSA'
+    NO_DATA_VALUE = 'NO_DATA_VALUE'
+    BUILD_UP_VALUE = 'BUILD_UP_VALUE'
+    RADIUS = 'RADIUS'
+    ENGINE = 'ENGINE'
+
+    RESIDENT_FIELD = 'RESIDENT_FIELD'
+    EMPLOYEE_FIELD = 'EMPLOYEE_FIELD'
+    SSA_FIELD = 'SSA_FIELD'
+
+    RASTER = 'RASTER'
+    VECTOR = 'VECTOR'
+
+    OUTPUT = 'OUTPUT'
+
+    @staticmethod
+    def tr(string: str) -> str:
+        return QCoreApplication.translate('Processing', string)  # type: ignore
+
+    @staticmethod
+    def createInstance() -> 'CalculateBatchWupProcessingScript':
+        return CalculateBatchWupProcessingScript()
+
+    @staticmethod
+    def name() -> str:
+        return 'usl_batch_wup_calculator'
+
+    def displayName(self) -> str:
+        return self.tr('USL Batch WUP Calculator')
+
+    def group(self) -> str:
+        return self.tr(constants.GROUP_NAME)
+
+    @staticmethod
+    def groupId() -> str:
+        return constants.GROUP_ID
+
+    def shortHelpString(self) -> str:
+        return self.tr('Calculate DIS, LUP and WUP for every polygon of a boundary layer.'
+                       ' The SI values are calculated once for all polygons.'
+                       '\nConstraints:'
+                       '\n- Polygons should not overlap'
+                       '\n- Features with a sum of resident and employee count of 0 or less get no LUP and WUP'
+                       '\n- Features with a SSA value outside of 0 and 1 get no WUP')
+
+    def initAlgorithm(self, _: Optional[Dict[str, Any]] = None) -> None:  # type: ignore
+        self.addParameter(
+            QgsProcessingParameterFeatureSource(
+                self.VECTOR,
+                self.tr('Vector with boundaries for calculations'),
+                types=[QgsProcessing.TypeVectorPolygon]
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterField(
+                self.RESIDENT_FIELD,
+                self.tr('Resident count field'),
+                parentLayerParameterName=self.VECTOR,
+                type=QgsProcessingParameterField.Numeric
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterField(
+                self.EMPLOYEE_FIELD,
+                self.tr('Employee count field'),
+                parentLayerParameterName=self.VECTOR,
+                type=QgsProcessingParameterField.Numeric
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterField(
+                self.SSA_FIELD,
+                self.tr('Share of settlement area (SSA) field'),
+                parentLayerParameterName=self.VECTOR,
+                type=QgsProcessingParameterField.Numeric,
+                optional=True
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.SSA,
+                self.tr('Share of settlement area (SSA) if no field is selected'),
+                QgsProcessingParameterNumber.Double,
+                defaultValue=constants.SSA_VALUE
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterRasterLayer(
+                self.RASTER,
+                self.tr('Raster with build up area')
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.NO_DATA_VALUE,
+                self.tr('Raster no data value'),
+                QgsProcessingParameterNumber.Integer,
+                defaultValue=constants.NO_DATA_VALUE
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.BUILD_UP_VALUE,
+                self.tr('Raster build up value'),
+                QgsProcessingParameterNumber.Integer,
+                defaultValue=constants.BUILD_UP_VALUE
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.RADIUS,
+                self.tr('Horizon of perception'),
+                QgsProcessingParameterNumber.Integer,
+                defaultValue=constants.RADIUS_VALUE
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterEnum(
+                self.ENGINE,
+                self.tr('SI engine'),
+                options=CalculateSiProcessingScript.get_engine_options(),
+                defaultValue=0
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(
+                self.OUTPUT,
+                self.tr('Output WUP table')
+            )
+        )
+
+    @staticmethod
+    def _get_ssa_value(value: Any) -> float:
+        return math.nan if value is None or value == NULL else float(value)
+
+    def processAlgorithm(self,  # type: ignore
+                         parameters: Dict[str, Any],
+                         context: QgsProcessingContext,
+                         feedback: QgsProcessingFeedback) -> Dict[str, Any]:
+        source = self.parameterAsSource(parameters, self.VECTOR, context)
+        resident_field = self.parameterAsString(parameters, self.RESIDENT_FIELD, context)
+        employee_field = self.parameterAsString(parameters, self.EMPLOYEE_FIELD, context)
+        ssa_field = self.parameterAsString(parameters, self.SSA_FIELD, context)
+        ssa_value = self.parameterAsDouble(parameters, self.SSA, context)
+        raster_layer = self.parameterAsRasterLayer(parameters, self.RASTER, context)
+        no_data_value = self.parameterAsInt(parameters, self.NO_DATA_VALUE, context)
+        build_up_value = self.parameterAsInt(parameters, self.BUILD_UP_VALUE, context)
+        radius = self.parameterAsInt(parameters, self.RADIUS, context)
+        engine = SiEngine.ENGINES[self.parameterAsEnum(parameters, self.ENGINE, context)]
+
+        fields = QgsFields(source.fields())
+        for field_name in ('DIS', 'LUP', 'WUP'):
+            fields.append(QgsField(field_name, QVariant.Double))
+
+        (sink, destination_id) = self.parameterAsSink(parameters, self.OUTPUT, context,
+                                                      fields, source.wkbType(), source.sourceCrs())
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        features = list(source.getFeatures())
+        wkt_geometries = ClipRasterProcessingScript.get_wkt_geometries(source, raster_layer.crs(), context)
+
+        zones = [UrbanSprawlZone(wkt_geometry,
+                                 int(feature[resident_field] or 0),
+                                 int(feature[employee_field] or 0),
+                                 self._get_ssa_value(feature[ssa_field]) if ssa_field else ssa_value)
+                 for (feature, wkt_geometry) in zip(features, wkt_geometries)]
+
+        feedback.pushInfo(f'Calculating SI for {len(zones)} polygons...')
+
+        pipeline = BatchUrbanSprawlPipeline(raster_layer.source(),
+                                            radius,
+                                            no_data_value,
+                                            build_up_value,
+                                            engine,
+                                            CalculateSiProcessingScript.get_progress_monitor(feedback))
+
+        try:
+            results = pipeline.calculate(zones)
+        except CanceledError:
+            feedback.pushInfo('Calculation canceled')
+            return {}
+
+        for (feature, result) in zip(features, results):
+            if feedback.isCanceled():
+                break
+
+            output_feature = QgsFeature(fields)
+            output_feature.setGeometry(feature.geometry())
+            output_feature.setAttributes(feature.attributes() + [None if math.isnan(value) else value
+                                                                 for value in (result.dis, result.lup, result.wup)])
+            sink.addFeature(output_feature, QgsFeatureSink.FastInsert)
+
+        return {self.OUTPUT: destination_id}
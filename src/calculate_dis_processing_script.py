@@ -1,18 +1,24 @@
 from typing import Optional, Dict, Any
 
-import numpy
+from osgeo import gdal
 from qgis.PyQt.QtCore import QCoreApplication
 from qgis.core import QgsProcessingContext, QgsProcessingFeedback, QgsProcessingAlgorithm, \
-    QgsProcessingParameterRasterLayer, QgsProcessingException, QgsProcessingOutputNumber
+    QgsProcessingParameterRasterLayer, QgsProcessingException, QgsProcessingOutputNumber, QgsProcessingParameterBoolean, \
+    QgsProcessingParameterFileDestination
 
 from . import constants
-from .urban_sprawl.common.common import Common
+from .urban_sprawl.common.block_reducer import BlockReducer
+from .urban_sprawl.common.dataset_cache import DatasetCache
+from .urban_sprawl.common.stage_metrics import StageMetrics
 
 
 class CalculateDisProcessingScript(QgsProcessingAlgorithm):  # type: ignore
+    METRICS = 'METRICS'
+
     SI_RASTER = 'SI_RASTER'
 
     OUTPUT = 'DIS'
+    METRICS_FILE = 'METRICS_FILE'
 
     @staticmethod
     def tr(string: str) -> str:
@@ -47,6 +53,24 @@ class CalculateDisProcessingScript(QgsProcessingAlgorithm):  # type: ignore
             )
         )
 
+        self.addParameter(
+            QgsProcessingParameterBoolean(
+                self.METRICS,
+                self.tr('Report time, memory and throughput of each stage'),
+                defaultValue=False
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterFileDestination(
+                self.METRICS_FILE,
+                self.tr('Stage metrics JSON file'),
+                fileFilter='JSON files (*.json)',
+                optional=True,
+                createByDefault=False
+            )
+        )
+
         self.addOutput(
             QgsProcessingOutputNumber(
                 self.OUTPUT,
@@ -57,22 +81,28 @@ class CalculateDisProcessingScript(QgsProcessingAlgorithm):  # type: ignore
     def processAlgorithm(self,  # type: ignore
                          parameters: Dict[str, Any],
                          context: QgsProcessingContext,
-                         _: QgsProcessingFeedback) -> Dict[str, Any]:
+                         feedback: QgsProcessingFeedback) -> Dict[str, Any]:
         si_raster_path = self.parameterAsRasterLayer(parameters, self.SI_RASTER, context).source()
+        metrics_path = self.parameterAsFileOutput(parameters, self.METRICS_FILE, context)
+        metrics = StageMetrics(self.parameterAsBool(parameters, self.METRICS, context) or bool(metrics_path))
 
-        si_matrix = Common.get_matrix_from_path(si_raster_path)
+        si_raster = DatasetCache.open(si_raster_path)
+        cell_count = si_raster.RasterXSize * si_raster.RasterYSize
 
-        shape = Common.get_shape(si_matrix)
+        with metrics.measure('DIS reduction', cell_count) as record:
+            si_statistics = BlockReducer.reduce(si_raster, lambda matrix: matrix > 0)
+            record.add_bytes_read(cell_count * gdal.GetDataTypeSize(si_raster.GetRasterBand(1).DataType) // 8)
 
-        count = 0
-        for x in range(0, shape.rows):
-            for y in range(0, shape.columns):
-                if si_matrix[x, y] > 0:
-                    count += 1
-
-        if count != 0:
-            dis = numpy.sum(si_matrix) / count
+        if si_statistics.count != 0:
+            dis = si_statistics.sum / si_statistics.count
         else:
             raise QgsProcessingException('Si Values cant be found')
 
-        return {self.OUTPUT: dis.item()}
+        metrics.report(feedback.pushInfo)
+
+        results = {self.OUTPUT: dis}
+        if metrics_path:
+            metrics.save(metrics_path)
+            results[self.METRICS_FILE] = metrics_path
+
+        return results
@@ -1,17 +1,20 @@
-from typing import Optional, Dict, Any, cast
+from typing import Optional, Dict, Any
 
 from osgeo import gdal
 from qgis.PyQt.QtCore import QCoreApplication
 from qgis.core import QgsProcessingContext, QgsProcessingFeedback, QgsProcessingAlgorithm, \
     QgsProcessingParameterRasterLayer, QgsProcessingParameterNumber, \
-    QgsProcessingOutputNumber, QgsProcessingException
+    QgsProcessingOutputNumber, QgsProcessingException, QgsProcessingParameterBoolean, QgsProcessingParameterFileDestination
 
 from . import constants
-from .urban_sprawl.common.common import Common
+from .urban_sprawl.common.block_reducer import BlockReducer
+from .urban_sprawl.common.dataset_cache import DatasetCache
+from .urban_sprawl.common.stage_metrics import StageMetrics
 
 
 class CalculateLupProcessingScript(QgsProcessingAlgorithm):  # type: ignore
     BUILD_UP_VALUE = 'BUILD_UP_VALUE'
+    METRICS = 'METRICS'
 
     RESIDENT_COUNT = 'RESIDENT_COUNT'
     EMPLOYEE_COUNT = 'EMPLOYEE_COUNT'
@@ -19,6 +22,7 @@ class CalculateLupProcessingScript(QgsProcessingAlgorithm):  # type: ignore
     CLIPPED_RASTER = 'CLIPPED_RASTER'
 
     OUTPUT = 'LUP'
+    METRICS_FILE = 'METRICS_FILE'
 
     @staticmethod
     def tr(string: str) -> str:
@@ -80,6 +84,24 @@ class CalculateLupProcessingScript(QgsProcessingAlgorithm):  # type: ignore
             )
         )
 
+        self.addParameter(
+            QgsProcessingParameterBoolean(
+                self.METRICS,
+                self.tr('Report time, memory and throughput of each stage'),
+                defaultValue=False
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterFileDestination(
+                self.METRICS_FILE,
+                self.tr('Stage metrics JSON file'),
+                fileFilter='JSON files (*.json)',
+                optional=True,
+                createByDefault=False
+            )
+        )
+
         self.addOutput(
             QgsProcessingOutputNumber(
                 self.OUTPUT,
@@ -90,16 +112,30 @@ class CalculateLupProcessingScript(QgsProcessingAlgorithm):  # type: ignore
     def processAlgorithm(self,  # type: ignore
                          parameters: Dict[str, Any],
                          context: QgsProcessingContext,
-                         _: QgsProcessingFeedback) -> Dict[str, Any]:
+                         feedback: QgsProcessingFeedback) -> Dict[str, Any]:
         clipped_raster_path = self.parameterAsRasterLayer(parameters, self.CLIPPED_RASTER, context).source()
         resident_count = self.parameterAsInt(parameters, self.RESIDENT_COUNT, context)
         employee_count = self.parameterAsInt(parameters, self.EMPLOYEE_COUNT, context)
         build_up_value = self.parameterAsInt(parameters, self.BUILD_UP_VALUE, context)
+        metrics_path = self.parameterAsFileOutput(parameters, self.METRICS_FILE, context)
+        metrics = StageMetrics(self.parameterAsBool(parameters, self.METRICS, context) or bool(metrics_path))
 
         resident_employee_count = resident_count + employee_count
         if resident_employee_count <= 0:
             raise QgsProcessingException('Sum of resident and employee count can not equal 0 or less')
 
-        build_up_area = Common.get_area(gdal.Open(clipped_raster_path), lambda x: cast(bool, x == build_up_value))
+        clipped_raster = DatasetCache.open(clipped_raster_path)
+        cell_count = clipped_raster.RasterXSize * clipped_raster.RasterYSize
+
+        with metrics.measure('LUP reduction', cell_count) as record:
+            build_up_area = BlockReducer.reduce(clipped_raster, lambda matrix: matrix == build_up_value).area
+            record.add_bytes_read(cell_count * gdal.GetDataTypeSize(clipped_raster.GetRasterBand(1).DataType) // 8)
+
+        metrics.report(feedback.pushInfo)
+
+        results = {self.OUTPUT: build_up_area / resident_employee_count}
+        if metrics_path:
+            metrics.save(metrics_path)
+            results[self.METRICS_FILE] = metrics_path
 
-        return {self.OUTPUT: build_up_area / resident_employee_count}
+        return results
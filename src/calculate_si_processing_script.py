@@ -1,25 +1,43 @@
-from typing import Optional, Dict, Any
+import os
+from typing import Optional, Dict, Any, List
 
-import numpy
 from osgeo import gdal
 from qgis.PyQt.QtCore import QCoreApplication
 from qgis.core import QgsProcessingContext, QgsProcessingFeedback, QgsProcessingAlgorithm, \
-    QgsProcessingParameterRasterLayer, QgsProcessingParameterRasterDestination, QgsProcessingParameterNumber
+    QgsProcessingParameterRasterLayer, QgsProcessingParameterRasterDestination, QgsProcessingParameterNumber, \
+    QgsProcessingParameterEnum, QgsProcessingException, QgsProcessingParameterBoolean, QgsProcessingParameterFileDestination
 
 from . import constants
-from .urban_sprawl.common.common import Common
+from .clip_raster_processing_script import ClipRasterProcessingScript
+from .urban_sprawl.common.dataset_cache import DatasetCache
+from .urban_sprawl.common.progress_monitor import CanceledError, ProgressMonitor
+from .urban_sprawl.common.raster_writer import RasterWriter
+from .urban_sprawl.common.raw_raster import RawRaster
+from .urban_sprawl.common.result_cache import ResultCache
+from .urban_sprawl.common.stage_metrics import StageMetrics
+from .urban_sprawl.si.parallel_si_calculator import ParallelSiCalculator
 from .urban_sprawl.si.si_calculator import SiCalculator
+from .urban_sprawl.si.si_engine import SiEngine
+from .urban_sprawl.si.tiled_si_calculator import TiledSiCalculator
 
 
 class CalculateSiProcessingScript(QgsProcessingAlgorithm):  # type: ignore
     NO_DATA_VALUE = 'NO_DATA_VALUE'
     BUILD_UP_VALUE = 'BUILD_UP_VALUE'
     RADIUS = 'RADIUS'
+    ENGINE = 'ENGINE'
+    MEMORY_BUDGET = 'MEMORY_BUDGET'
+    PROCESSES = 'PROCESSES'
+    CACHE_SIZE = 'CACHE_SIZE'
+    OUTPUT_FORMAT = 'OUTPUT_FORMAT'
+    PADDED = 'PADDED'
+    METRICS = 'METRICS'
 
     RASTER = 'RASTER'
     CLIPPED_RASTER = 'CLIPPED_RASTER'
 
     OUTPUT = 'SI_RASTER'
+    METRICS_FILE = 'METRICS_FILE'
 
     @staticmethod
     def tr(string: str) -> str:
@@ -46,6 +64,26 @@ class CalculateSiProcessingScript(QgsProcessingAlgorithm):  # type: ignore
     def shortHelpString(self) -> str:
         return self.tr('Calculate SI raster')
 
+    @staticmethod
+    def get_engine_options() -> List[str]:
+        return [CalculateSiProcessingScript.tr('Convolution (FFT)'),
+                CalculateSiProcessingScript.tr('Direct (exact, slow)'),
+                CalculateSiProcessingScript.tr('Sparse point index (low build up density)'),
+                CalculateSiProcessingScript.tr('Compiled direct (exact, uses numba if installed)')]
+
+    @staticmethod
+    def get_progress_monitor(feedback: QgsProcessingFeedback) -> ProgressMonitor:
+        def on_progress(progress: float, eta: Optional[float]) -> None:
+            feedback.setProgress(progress)
+            if eta is not None:
+                feedback.setProgressText(f'{progress:.0f} %, about {int(eta // 60)} min {int(eta % 60)} s remaining')
+
+        return ProgressMonitor(on_progress, feedback.isCanceled)
+
+    @staticmethod
+    def remove_output(path: str) -> None:
+        RasterWriter.delete(path)
+
     def initAlgorithm(self, _: Optional[Dict[str, Any]] = None) -> None:  # type: ignore
         self.addParameter(
             QgsProcessingParameterNumber(
@@ -74,6 +112,62 @@ class CalculateSiProcessingScript(QgsProcessingAlgorithm):  # type: ignore
             )
         )
 
+        self.addParameter(
+            QgsProcessingParameterEnum(
+                self.ENGINE,
+                self.tr('SI engine'),
+                options=self.get_engine_options(),
+                defaultValue=0
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.MEMORY_BUDGET,
+                self.tr('Memory budget in MB for tiled calculation (0 = load the whole raster)'),
+                QgsProcessingParameterNumber.Integer,
+                defaultValue=constants.MEMORY_BUDGET_VALUE,
+                minValue=0
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.PROCESSES,
+                self.tr('Worker processes (0 = all cores)'),
+                QgsProcessingParameterNumber.Integer,
+                defaultValue=constants.PROCESSES_VALUE,
+                minValue=0
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.CACHE_SIZE,
+                self.tr('Result cache size in MB (0 = disabled)'),
+                QgsProcessingParameterNumber.Integer,
+                defaultValue=constants.CACHE_SIZE_VALUE,
+                minValue=0
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterEnum(
+                self.OUTPUT_FORMAT,
+                self.tr('Output format'),
+                options=ClipRasterProcessingScript.get_output_format_options(),
+                defaultValue=constants.OUTPUT_FORMAT_VALUE
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterBoolean(
+                self.PADDED,
+                self.tr('Pad the output to the extent of the raster'),
+                defaultValue=False
+            )
+        )
+
         self.addParameter(
             QgsProcessingParameterRasterLayer(
                 self.RASTER,
@@ -88,6 +182,14 @@ class CalculateSiProcessingScript(QgsProcessingAlgorithm):  # type: ignore
             )
         )
 
+        self.addParameter(
+            QgsProcessingParameterBoolean(
+                self.METRICS,
+                self.tr('Report time, memory and throughput of each stage'),
+                defaultValue=False
+            )
+        )
+
         self.addParameter(
             QgsProcessingParameterRasterDestination(
                 self.OUTPUT,
@@ -95,6 +197,16 @@ class CalculateSiProcessingScript(QgsProcessingAlgorithm):  # type: ignore
             )
         )
 
+        self.addParameter(
+            QgsProcessingParameterFileDestination(
+                self.METRICS_FILE,
+                self.tr('Stage metrics JSON file'),
+                fileFilter='JSON files (*.json)',
+                optional=True,
+                createByDefault=False
+            )
+        )
+
     def processAlgorithm(self,  # type: ignore
                          parameters: Dict[str, Any],
                          context: QgsProcessingContext,
@@ -104,30 +216,126 @@ class CalculateSiProcessingScript(QgsProcessingAlgorithm):  # type: ignore
         no_data_value = self.parameterAsInt(parameters, self.NO_DATA_VALUE, context)
         build_up_value = self.parameterAsInt(parameters, self.BUILD_UP_VALUE, context)
         radius = self.parameterAsInt(parameters, self.RADIUS, context)
-        output_path = self.parameterAsOutputLayer(parameters, self.OUTPUT, context)
+        engine = SiEngine.ENGINES[self.parameterAsEnum(parameters, self.ENGINE, context)]
+        memory_budget = self.parameterAsInt(parameters, self.MEMORY_BUDGET, context)
+        processes = self.parameterAsInt(parameters, self.PROCESSES, context)
+        cache_size = self.parameterAsInt(parameters, self.CACHE_SIZE, context)
+        output_format = RasterWriter.FORMATS[self.parameterAsEnum(parameters, self.OUTPUT_FORMAT, context)]
+        padded = self.parameterAsBool(parameters, self.PADDED, context)
+        output_path = ClipRasterProcessingScript.get_output_path(parameters,
+                                                                 self.parameterAsOutputLayer(parameters, self.OUTPUT, context),
+                                                                 self.OUTPUT,
+                                                                 context)
+        metrics_path = self.parameterAsFileOutput(parameters, self.METRICS_FILE, context)
+
+        metrics = StageMetrics(self.parameterAsBool(parameters, self.METRICS, context) or bool(metrics_path))
+
+        result_cache = ResultCache(cache_size * 1024 ** 2)
+        cache_key = ''
+        if cache_size > 0:
+            cache_key = ResultCache.get_key(self.name(),
+                                            SiEngine.VERSION,
+                                            engine,
+                                            ResultCache.get_raster_hash(raster_path),
+                                            ResultCache.get_raster_hash(clipped_raster_path),
+                                            radius,
+                                            no_data_value,
+                                            build_up_value,
+                                            RawRaster.is_raw_path(output_path),
+                                            output_format,
+                                            padded)
+
+            if result_cache.get(cache_key, output_path):
+                feedback.pushInfo('SI raster loaded from cache')
+                return {self.OUTPUT: output_path}
 
         feedback.pushInfo('Processing...')
 
-        si_calculator = SiCalculator(raster_path,
-                                     clipped_raster_path,
-                                     radius,
-                                     no_data_value,
-                                     build_up_value)
-
-        result_matrix = si_calculator.calculate()
-
-        raster = gdal.Open(raster_path)
-        shape = Common.get_shape(result_matrix)
-
-        driver = gdal.GetDriverByName('GTiff')
-        si_raster = driver.Create(output_path,
-                                  bands=1,
-                                  xsize=shape.columns,
-                                  ysize=shape.rows,
-                                  eType=gdal.GDT_Float32)
-        si_raster.GetRasterBand(1).WriteArray(numpy.asarray(result_matrix))
-        si_raster.SetGeoTransform(raster.GetGeoTransform())
-        si_raster.SetProjection(raster.GetProjection())
-        si_raster.FlushCache()
-
-        return {self.OUTPUT: output_path}
+        si_calculator = SiEngine.create(engine,
+                                        raster_path,
+                                        clipped_raster_path,
+                                        radius,
+                                        no_data_value,
+                                        build_up_value)
+        si_calculator.metrics = metrics
+        si_calculator.progress = self.get_progress_monitor(feedback)
+        si_calculator.padded = padded
+
+        try:
+            self._calculate(si_calculator, output_path, output_format, memory_budget, processes, metrics, feedback)
+        except CanceledError:
+            self.remove_output(output_path)
+            feedback.pushInfo('SI calculation canceled, partial output removed')
+            return {}
+
+        if cache_size > 0:
+            result_cache.put(cache_key, output_path)
+
+        metrics.report(feedback.pushInfo)
+
+        results = {self.OUTPUT: output_path}
+        if metrics_path:
+            metrics.save(metrics_path)
+            results[self.METRICS_FILE] = metrics_path
+
+        return results
+
+    @staticmethod
+    def _calculate(si_calculator: SiCalculator,  # pylint: disable=too-many-positional-arguments
+                   output_path: str,
+                   output_format: str,
+                   memory_budget: int,
+                   processes: int,
+                   metrics: StageMetrics,
+                   feedback: QgsProcessingFeedback) -> None:
+        si_raster = RasterWriter.create(output_path,
+                                        DatasetCache.open(si_calculator.raster_path),
+                                        gdal.GDT_Float32,
+                                        output_format=output_format,
+                                        window=si_calculator.get_output_window(),
+                                        no_data_value=si_calculator.no_data_value)
+
+        try:
+            CalculateSiProcessingScript._calculate_band(si_calculator,
+                                                        si_raster.GetRasterBand(1),
+                                                        memory_budget,
+                                                        processes,
+                                                        metrics,
+                                                        feedback)
+            si_raster.FlushCache()
+        finally:
+            del si_raster
+
+        with metrics.measure('SI output finish') as record:
+            RasterWriter.finish(output_path, output_format)
+            record.add_bytes_written(os.path.getsize(output_path))
+
+    @staticmethod
+    def _calculate_band(si_calculator: SiCalculator,  # pylint: disable=too-many-positional-arguments
+                        band: gdal.Band,
+                        memory_budget: int,
+                        processes: int,
+                        metrics: StageMetrics,
+                        feedback: QgsProcessingFeedback) -> None:
+        cell_count = band.XSize * band.YSize
+
+        if memory_budget > 0:
+            try:
+                tiled_si_calculator = TiledSiCalculator(si_calculator, memory_budget * 1024 ** 2)
+            except ValueError as error:
+                raise QgsProcessingException(str(error)) from error
+
+            feedback.pushInfo(f'Calculating in tiles of {tiled_si_calculator.tile_size} pixels')
+            with metrics.measure('SI tiled calculation', cell_count):
+                tiled_si_calculator.calculate(band)
+            return
+
+        if processes != 1:
+            with metrics.measure('SI parallel calculation', cell_count):
+                si_matrix = ParallelSiCalculator(si_calculator, processes).calculate()
+        else:
+            si_matrix = si_calculator.calculate()
+
+        with metrics.measure('SI write', cell_count) as record:
+            RasterWriter.write_matrix(band, si_matrix)
+            record.add_bytes_written(si_matrix.nbytes)
@@ -0,0 +1,223 @@
+from typing import Optional, Dict, Any, List
+
+from osgeo import gdal
+from qgis.PyQt.QtCore import QCoreApplication, QVariant
+from qgis.core import QgsProcessingContext, QgsProcessingFeedback, QgsProcessingAlgorithm, \
+    QgsProcessingParameterRasterLayer, QgsProcessingParameterRasterDestination, QgsProcessingParameterNumber, \
+    QgsProcessingParameterString, QgsProcessingParameterBoolean, QgsProcessingParameterFeatureSink, QgsProcessingException, QgsFeature, \
+    QgsFeatureSink, QgsField, QgsFields, QgsWkbTypes, QgsCoordinateReferenceSystem, QgsProcessingParameterEnum
+
+from . import constants
+from .calculate_si_processing_script import CalculateSiProcessingScript
+from .clip_raster_processing_script import ClipRasterProcessingScript
+from .urban_sprawl.common.block_reducer import BlockReducer
+from .urban_sprawl.common.dataset_cache import DatasetCache
+from .urban_sprawl.common.progress_monitor import CanceledError
+from .urban_sprawl.common.raster_writer import RasterWriter
+from .urban_sprawl.si.multi_radius_si_calculator import MultiRadiusSiCalculator
+
+
+class CalculateSiSweepProcessingScript(QgsProcessingAlgorithm):  # type: ignore
+    NO_DATA_VALUE = 'NO_DATA_VALUE'
+    BUILD_UP_VALUE = 'BUILD_UP_VALUE'
+    RADII = 'RADII'
+    PADDED = 'PADDED'
+    OUTPUT_FORMAT = 'OUTPUT_FORMAT'
+
+    RASTER = 'RASTER'
+    CLIPPED_RASTER = 'CLIPPED_RASTER'
+
+    OUTPUT_RASTER = 'SI_RASTER'
+    OUTPUT = 'DIS'
+
+    @staticmethod
+    def tr(string: str) -> str:
+        return QCoreApplication.translate('Processing', string)  # type: ignore
+
+    @staticmethod
+    def createInstance() -> 'CalculateSiSweepProcessingScript':
+        return CalculateSiSweepProcessingScript()
+
+    @staticmethod
+    def name() -> str:
+        return 'usl_si_sweep'
+
+    def displayName(self) -> str:
+        return self.tr('USL SI Sweep')
+
+    def group(self) -> str:
+        return self.tr(constants.GROUP_NAME)
+
+    @staticmethod
+    def groupId() -> str:
+        return constants.GROUP_ID
+
+    def shortHelpString(self) -> str:
+        return self.tr('Calculate the SI raster and DIS for several horizons of perception in a single pass.'
+                       ' The output raster has one band per horizon of perception in ascending order.')
+
+    @staticmethod
+    def get_radii(string: str) -> List[int]:
+        try:
+            radii = [int(value) for value in string.replace(';', ',').split(',') if value.strip()]
+        except ValueError as error:
+            raise QgsProcessingException(f'Invalid horizons of perception: {string}') from error
+
+        if not radii or min(radii) <= 0:
+            raise QgsProcessingException('At least one horizon of perception greater than 0 is required')
+
+        return radii
+
+    def initAlgorithm(self, _: Optional[Dict[str, Any]] = None) -> None:  # type: ignore
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.NO_DATA_VALUE,
+                self.tr('Raster no data value'),
+                QgsProcessingParameterNumber.Integer,
+                defaultValue=constants.NO_DATA_VALUE
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.BUILD_UP_VALUE,
+                self.tr('Raster build up value'),
+                QgsProcessingParameterNumber.Integer,
+                defaultValue=constants.BUILD_UP_VALUE
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterString(
+                self.RADII,
+                self.tr('Horizons of perception (comma separated)'),
+                defaultValue=constants.RADII_VALUE
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterRasterLayer(
+                self.RASTER,
+                self.tr('Raster')
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterRasterLayer(
+                self.CLIPPED_RASTER,
+                self.tr('Clipped Raster')
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterBoolean(
+                self.PADDED,
+                self.tr('Pad the output to the extent of the raster'),
+                defaultValue=False
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterEnum(
+                self.OUTPUT_FORMAT,
+                self.tr('Output format'),
+                options=ClipRasterProcessingScript.get_output_format_options(),
+                defaultValue=constants.OUTPUT_FORMAT_VALUE
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterRasterDestination(
+                self.OUTPUT_RASTER,
+                self.tr('Output SI Raster')
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(
+                self.OUTPUT,
+                self.tr('Output DIS table')
+            )
+        )
+
+    def processAlgorithm(self,  # type: ignore
+                         parameters: Dict[str, Any],
+                         context: QgsProcessingContext,
+                         feedback: QgsProcessingFeedback) -> Dict[str, Any]:
+        raster_path = self.parameterAsRasterLayer(parameters, self.RASTER, context).source()
+        clipped_raster_path = self.parameterAsRasterLayer(parameters, self.CLIPPED_RASTER, context).source()
+        no_data_value = self.parameterAsInt(parameters, self.NO_DATA_VALUE, context)
+        build_up_value = self.parameterAsInt(parameters, self.BUILD_UP_VALUE, context)
+        radii = self.get_radii(self.parameterAsString(parameters, self.RADII, context))
+        output_path = self.parameterAsOutputLayer(parameters, self.OUTPUT_RASTER, context)
+        output_format = RasterWriter.FORMATS[self.parameterAsEnum(parameters, self.OUTPUT_FORMAT, context)]
+
+        fields = QgsFields()
+        fields.append(QgsField('RADIUS', QVariant.Int))
+        fields.append(QgsField('DIS', QVariant.Double))
+
+        (sink, destination_id) = self.parameterAsSink(parameters, self.OUTPUT, context,
+                                                      fields, QgsWkbTypes.NoGeometry, QgsCoordinateReferenceSystem())
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        si_calculator = MultiRadiusSiCalculator(raster_path,
+                                                clipped_raster_path,
+                                                radii,
+                                                no_data_value,
+                                                build_up_value)
+        si_calculator.padded = self.parameterAsBool(parameters, self.PADDED, context)
+        si_calculator.progress = CalculateSiProcessingScript.get_progress_monitor(feedback)
+
+        feedback.pushInfo(f'Calculating SI for horizons of perception {si_calculator.radii}...')
+
+        try:
+            dis_values = self._calculate(si_calculator, output_path, output_format)
+        except CanceledError:
+            CalculateSiProcessingScript.remove_output(output_path)
+            feedback.pushInfo('SI calculation canceled, partial output removed')
+            return {}
+
+        for (radius, dis) in zip(si_calculator.radii, dis_values):
+            feedback.pushInfo(f'{radius},{dis}')
+
+            feature = QgsFeature(fields)
+            feature.setAttributes([radius, dis])
+            sink.addFeature(feature, QgsFeatureSink.FastInsert)
+
+        return {self.OUTPUT_RASTER: output_path, self.OUTPUT: destination_id}
+
+    @staticmethod
+    def _calculate(si_calculator: MultiRadiusSiCalculator, output_path: str, output_format: str) -> List[Optional[float]]:
+        progress = si_calculator.progress
+        with progress.sub_range(0, 80):
+            si_matrices = si_calculator.calculate_all()
+
+        si_raster = RasterWriter.create(output_path,
+                                        DatasetCache.open(si_calculator.raster_path),
+                                        gdal.GDT_Float32,
+                                        len(si_matrices),
+                                        output_format=output_format,
+                                        window=si_calculator.get_output_window(),
+                                        no_data_value=si_calculator.no_data_value)
+
+        dis_values = []
+        try:
+            with progress.sub_range(80, 95):
+                for (band_index, (radius, si_matrix)) in enumerate(zip(si_calculator.radii, si_matrices), start=1):
+                    band = si_raster.GetRasterBand(band_index)
+                    band.SetDescription(f'SI {radius}')
+                    RasterWriter.write_matrix(band, si_matrix)
+
+                    si_statistics = BlockReducer.reduce_matrix(si_matrix, si_calculator.pixel_size, lambda values: values > 0)
+                    dis_values.append(si_statistics.sum / si_statistics.count if si_statistics.count != 0 else None)
+                    progress.update(band_index, len(si_matrices))
+
+            si_raster.FlushCache()
+        finally:
+            del si_raster
+
+        RasterWriter.finish(output_path, output_format)
+        progress.update(100, 100)
+
+        return dis_values
@@ -0,0 +1,227 @@
+import math
+from typing import Dict, Any, Optional
+
+from qgis.PyQt.QtCore import QCoreApplication, QVariant
+from qgis.core import QgsProcessingContext, QgsProcessingFeedback, QgsProcessingAlgorithm, \
+    QgsProcessingParameterMultipleLayers, QgsProcessingParameterNumber, QgsProcessingParameterFeatureSource, \
+    QgsProcessingParameterField, QgsProcessingParameterFeatureSink, QgsProcessing, QgsProcessingException, \
+    QgsFeature, QgsFeatureSink, QgsField, QgsFields, QgsWkbTypes, QgsCoordinateReferenceSystem
+
+from . import constants
+from .clip_raster_processing_script import ClipRasterProcessingScript
+from .urban_sprawl.pipeline.time_series_urban_sprawl_pipeline import TimeSeriesUrbanSprawlPipeline, UrbanSprawlEpoch
+
+
+class CalculateTimeSeriesWupProcessingScript(QgsProcessingAlgorithm):  # type: ignore
+    SSA = 'SSA'
+    NO_DATA_VALUE = 'NO_DATA_VALUE'
+    BUILD_UP_VALUE = 'BUILD_UP_VALUE'
+    RADIUS = 'RADIUS'
+
+    EPOCH_FIELD = 'EPOCH_FIELD'
+    RESIDENT_FIELD = 'RESIDENT_FIELD'
+    EMPLOYEE_FIELD = 'EMPLOYEE_FIELD'
+    SSA_FIELD = 'SSA_FIELD'
+
+    RASTERS = 'RASTERS'
+    VECTOR = 'VECTOR'
+    TABLE = 'TABLE'
+
+    OUTPUT = 'OUTPUT'
+
+    @staticmethod
+    def tr(string: str) -> str:
+        return QCoreApplication.translate('Processing', string)  # type: ignore
+
+    @staticmethod
+    def createInstance() -> 'CalculateTimeSeriesWupProcessingScript':
+        return CalculateTimeSeriesWupProcessingScript()
+
+    @staticmethod
+    def name() -> str:
+        return 'usl_time_series_wup_calculator'
+
+    def displayName(self) -> str:
+        return self.tr('USL Time Series WUP Calculator')
+
+    def group(self) -> str:
+        return self.tr(constants.GROUP_NAME)
+
+    @staticmethod
+    def groupId() -> str:
+        return constants.GROUP_ID
+
+    def shortHelpString(self) -> str:
+        return self.tr('Calculate DIS, LUP and WUP of one area boundary for a series of build up rasters.'
+                       ' The boundary is rasterized once and the SI values are only updated around the pixels'
+                       ' which changed since the previous epoch.'
+                       '\nConstraints:'
+                       '\n- All rasters must be on the same grid'
+                       '\n- The population table needs one row per raster, the rows are matched in the order of the'
+                       ' epoch field')
+
+    def initAlgorithm(self, _: Optional[Dict[str, Any]] = None) -> None:  # type: ignore
+        self.addParameter(
+            QgsProcessingParameterMultipleLayers(
+                self.RASTERS,
+                self.tr('Rasters with build up area, ordered from the oldest to the newest epoch'),
+                layerType=QgsProcessing.TypeRaster
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterFeatureSource(
+                self.VECTOR,
+                self.tr('Vector with boundaries for calculations'),
+                types=[QgsProcessing.TypeVectorPolygon]
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterFeatureSource(
+                self.TABLE,
+                self.tr('Table with the population of each epoch'),
+                types=[QgsProcessing.TypeVector]
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterField(
+                self.EPOCH_FIELD,
+                self.tr('Epoch field'),
+                parentLayerParameterName=self.TABLE
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterField(
+                self.RESIDENT_FIELD,
+                self.tr('Resident count field'),
+                parentLayerParameterName=self.TABLE,
+                type=QgsProcessingParameterField.Numeric
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterField(
+                self.EMPLOYEE_FIELD,
+                self.tr('Employee count field'),
+                parentLayerParameterName=self.TABLE,
+                type=QgsProcessingParameterField.Numeric
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterField(
+                self.SSA_FIELD,
+                self.tr('Share of settlement area (SSA) field'),
+                parentLayerParameterName=self.TABLE,
+                type=QgsProcessingParameterField.Numeric,
+                optional=True
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.SSA,
+                self.tr('Share of settlement area (SSA) if no field is selected'),
+                QgsProcessingParameterNumber.Double,
+                defaultValue=constants.SSA_VALUE
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.NO_DATA_VALUE,
+                self.tr('Raster no data value'),
+                QgsProcessingParameterNumber.Integer,
+                defaultValue=constants.NO_DATA_VALUE
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.BUILD_UP_VALUE,
+                self.tr('Raster build up value'),
+                QgsProcessingParameterNumber.Integer,
+                defaultValue=constants.BUILD_UP_VALUE
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.RADIUS,
+                self.tr('Horizon of perception'),
+                QgsProcessingParameterNumber.Integer,
+                defaultValue=constants.RADIUS_VALUE
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(
+                self.OUTPUT,
+                self.tr('Output WUP table')
+            )
+        )
+
+    def processAlgorithm(self,  # type: ignore
+                         parameters: Dict[str, Any],
+                         context: QgsProcessingContext,
+                         feedback: QgsProcessingFeedback) -> Dict[str, Any]:
+        raster_layers = self.parameterAsLayerList(parameters, self.RASTERS, context)
+        source = self.parameterAsSource(parameters, self.VECTOR, context)
+        table = self.parameterAsSource(parameters, self.TABLE, context)
+        epoch_field = self.parameterAsString(parameters, self.EPOCH_FIELD, context)
+        resident_field = self.parameterAsString(parameters, self.RESIDENT_FIELD, context)
+        employee_field = self.parameterAsString(parameters, self.EMPLOYEE_FIELD, context)
+        ssa_field = self.parameterAsString(parameters, self.SSA_FIELD, context)
+        ssa_value = self.parameterAsDouble(parameters, self.SSA, context)
+        no_data_value = self.parameterAsInt(parameters, self.NO_DATA_VALUE, context)
+        build_up_value = self.parameterAsInt(parameters, self.BUILD_UP_VALUE, context)
+        radius = self.parameterAsInt(parameters, self.RADIUS, context)
+
+        if not raster_layers:
+            raise QgsProcessingException('At least one raster is required')
+
+        rows = sorted(table.getFeatures(), key=lambda row: row[epoch_field])
+        if len(rows) != len(raster_layers):
+            raise QgsProcessingException(f'The table has {len(rows)} rows for {len(raster_layers)} rasters')
+
+        fields = QgsFields()
+        fields.append(table.fields().field(epoch_field))
+        fields.append(QgsField('CHANGED', QVariant.Int))
+        for field_name in ('DIS', 'LUP', 'WUP'):
+            fields.append(QgsField(field_name, QVariant.Double))
+
+        (sink, destination_id) = self.parameterAsSink(parameters, self.OUTPUT, context,
+                                                      fields, QgsWkbTypes.NoGeometry, QgsCoordinateReferenceSystem())
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        epochs = [UrbanSprawlEpoch(raster_layer.source(),
+                                   int(row[resident_field] or 0),
+                                   int(row[employee_field] or 0),
+                                   float(row[ssa_field]) if ssa_field else ssa_value)
+                  for (raster_layer, row) in zip(raster_layers, rows)]
+
+        feedback.pushInfo(f'Calculating {len(epochs)} epochs...')
+
+        pipeline = TimeSeriesUrbanSprawlPipeline(
+            ClipRasterProcessingScript.get_wkt_geometries(source, raster_layers[0].crs(), context),
+            radius,
+            no_data_value,
+            build_up_value
+        )
+
+        try:
+            results = pipeline.calculate(epochs)
+        except ValueError as error:
+            raise QgsProcessingException(str(error)) from error
+
+        for (row, changed_count, result) in zip(rows, pipeline.changed_counts, results):
+            feature = QgsFeature(fields)
+            feature.setAttributes([row[epoch_field], changed_count] + [None if math.isnan(value) else value
+                                                                       for value in (result.dis, result.lup, result.wup)])
+            sink.addFeature(feature, QgsFeatureSink.FastInsert)
+
+        return {self.OUTPUT: destination_id}
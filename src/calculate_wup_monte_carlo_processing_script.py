@@ -0,0 +1,256 @@
+from typing import Optional, Dict, Any, List
+
+import numpy
+from qgis.PyQt.QtCore import QCoreApplication, QVariant
+from qgis.core import QgsProcessingContext, QgsProcessingFeedback, QgsProcessingAlgorithm, \
+    QgsProcessingParameterNumber, QgsProcessingParameterString, QgsProcessingParameterFeatureSource, \
+    QgsProcessingParameterField, QgsProcessingParameterFeatureSink, QgsProcessingOutputNumber, QgsProcessing, \
+    QgsProcessingException, QgsFeature, QgsFeatureRequest, QgsFeatureSink, QgsField, QgsFields, QgsWkbTypes, \
+    QgsCoordinateReferenceSystem, NULL
+
+from . import constants
+from .urban_sprawl.wup.parameter_distribution import ParameterDistribution
+from .urban_sprawl.wup.wup_monte_carlo import WupMonteCarlo
+
+
+class CalculateWupMonteCarloProcessingScript(QgsProcessingAlgorithm):  # type: ignore
+    DIS = 'DIS'
+    BUILD_UP_AREA = 'BUILD_UP_AREA'
+    RESIDENTS = 'RESIDENTS'
+    EMPLOYEES = 'EMPLOYEES'
+    SSA = 'SSA'
+    SAMPLES = 'SAMPLES'
+    SEED = 'SEED'
+    QUANTILES = 'QUANTILES'
+
+    TABLE = 'TABLE'
+    DIS_FIELD = 'DIS_FIELD'
+    BUILD_UP_AREA_FIELD = 'BUILD_UP_AREA_FIELD'
+    RESIDENT_FIELD = 'RESIDENT_FIELD'
+    EMPLOYEE_FIELD = 'EMPLOYEE_FIELD'
+    SSA_FIELD = 'SSA_FIELD'
+
+    OUTPUT = 'OUTPUT'
+    WUP_MEAN = 'WUP_MEAN'
+    INVALID_COUNT = 'INVALID_COUNT'
+
+    @staticmethod
+    def tr(string: str) -> str:
+        return QCoreApplication.translate('Processing', string)  # type: ignore
+
+    @staticmethod
+    def createInstance() -> 'CalculateWupMonteCarloProcessingScript':
+        return CalculateWupMonteCarloProcessingScript()
+
+    @staticmethod
+    def name() -> str:
+        return 'usl_wup_monte_carlo'
+
+    def displayName(self) -> str:
+        return self.tr('USL WUP Monte Carlo')
+
+    def group(self) -> str:
+        return self.tr(constants.GROUP_NAME)
+
+    @staticmethod
+    def groupId() -> str:
+        return constants.GROUP_ID
+
+    def shortHelpString(self) -> str:
+        return self.tr('Calculate quantiles of LUP and WUP for uncertain inputs.'
+                       ' Every input is a fixed value or a distribution like "uniform 900 1100", "normal 1000 50"'
+                       ' or "triangular 900 1000 1200", or is read from a field of a table with one sample per row.'
+                       '\nConstraints:'
+                       '\n- Samples with a sum of resident and employee count of 0 or less, a negative DIS or build up area'
+                       ' or a SSA value outside of 0 and 1 are ignored')
+
+    @staticmethod
+    def get_quantiles(string: str) -> List[float]:
+        try:
+            quantiles = [float(value) for value in string.replace(';', ',').split(',') if value.strip()]
+        except ValueError as error:
+            raise QgsProcessingException(f'Invalid quantiles: {string}') from error
+
+        if not quantiles or min(quantiles) < 0 or max(quantiles) > 100:
+            raise QgsProcessingException('At least one quantile between 0 and 100 is required')
+
+        return quantiles
+
+    def _add_distribution_parameter(self, name: str, description: str, default_value: Optional[str] = None) -> None:
+        self.addParameter(
+            QgsProcessingParameterString(
+                name,
+                self.tr(description),
+                defaultValue=default_value,
+                optional=True
+            )
+        )
+
+    def _add_field_parameter(self, name: str, description: str) -> None:
+        self.addParameter(
+            QgsProcessingParameterField(
+                name,
+                self.tr(description),
+                parentLayerParameterName=self.TABLE,
+                type=QgsProcessingParameterField.Numeric,
+                optional=True
+            )
+        )
+
+    def initAlgorithm(self, _: Optional[Dict[str, Any]] = None) -> None:  # type: ignore
+        self._add_distribution_parameter(self.DIS, 'Degree of urban dispersion (DIS)')
+        self._add_distribution_parameter(self.BUILD_UP_AREA, 'Build up area in square meters')
+        self._add_distribution_parameter(self.RESIDENTS, 'Resident count')
+        self._add_distribution_parameter(self.EMPLOYEES, 'Employee count')
+        self._add_distribution_parameter(self.SSA, 'Share of settlement area (SSA)', str(constants.SSA_VALUE))
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.SAMPLES,
+                self.tr('Number of samples if no table is selected'),
+                QgsProcessingParameterNumber.Integer,
+                defaultValue=constants.SAMPLES_VALUE,
+                minValue=1
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.SEED,
+                self.tr('Random seed'),
+                QgsProcessingParameterNumber.Integer,
+                defaultValue=constants.SEED_VALUE,
+                minValue=0
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterString(
+                self.QUANTILES,
+                self.tr('Quantiles in percent (comma separated)'),
+                defaultValue=constants.QUANTILES_VALUE
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterFeatureSource(
+                self.TABLE,
+                self.tr('Table with one sample per row'),
+                types=[QgsProcessing.TypeVector],
+                optional=True
+            )
+        )
+
+        self._add_field_parameter(self.DIS_FIELD, 'Degree of urban dispersion (DIS) field')
+        self._add_field_parameter(self.BUILD_UP_AREA_FIELD, 'Build up area field')
+        self._add_field_parameter(self.RESIDENT_FIELD, 'Resident count field')
+        self._add_field_parameter(self.EMPLOYEE_FIELD, 'Employee count field')
+        self._add_field_parameter(self.SSA_FIELD, 'Share of settlement area (SSA) field')
+
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(
+                self.OUTPUT,
+                self.tr('Output quantile table')
+            )
+        )
+
+        self.addOutput(
+            QgsProcessingOutputNumber(
+                self.WUP_MEAN,
+                self.tr('Mean weighted urban proliferation (WUP)')
+            )
+        )
+
+        self.addOutput(
+            QgsProcessingOutputNumber(
+                self.INVALID_COUNT,
+                self.tr('Number of ignored samples')
+            )
+        )
+
+    def _get_columns(self, parameters: Dict[str, Any], context: QgsProcessingContext) -> Dict[str, numpy.ndarray]:
+        source = self.parameterAsSource(parameters, self.TABLE, context)
+        if source is None:
+            return {}
+
+        fields = {name: self.parameterAsString(parameters, field_parameter, context)
+                  for (name, field_parameter) in ((self.DIS, self.DIS_FIELD),
+                                                  (self.BUILD_UP_AREA, self.BUILD_UP_AREA_FIELD),
+                                                  (self.RESIDENTS, self.RESIDENT_FIELD),
+                                                  (self.EMPLOYEES, self.EMPLOYEE_FIELD),
+                                                  (self.SSA, self.SSA_FIELD))}
+        fields = {name: field for (name, field) in fields.items() if field}
+
+        request = QgsFeatureRequest().setFlags(QgsFeatureRequest.NoGeometry)
+        request.setSubsetOfAttributes(list(fields.values()), source.fields())
+        features = list(source.getFeatures(request))
+
+        return {name: numpy.array([self._get_value(feature[field]) for feature in features]) for (name, field) in fields.items()}
+
+    @staticmethod
+    def _get_value(value: Any) -> float:
+        return numpy.nan if value is None or value == NULL else float(value)
+
+    def _get_samples(self,
+                     parameters: Dict[str, Any],
+                     context: QgsProcessingContext,
+                     columns: Dict[str, numpy.ndarray]) -> Dict[str, numpy.ndarray]:
+        count = len(next(iter(columns.values()))) if columns else self.parameterAsInt(parameters, self.SAMPLES, context)
+        generator = numpy.random.default_rng(self.parameterAsInt(parameters, self.SEED, context))
+
+        samples = {}
+        for name in (self.DIS, self.BUILD_UP_AREA, self.RESIDENTS, self.EMPLOYEES, self.SSA):
+            if name in columns:
+                samples[name] = columns[name]
+                continue
+
+            string = self.parameterAsString(parameters, name, context)
+            if not string:
+                raise QgsProcessingException(f'{name} needs a value, a distribution or a table field')
+
+            try:
+                samples[name] = ParameterDistribution.parse(string).sample(count, generator)
+            except ValueError as error:
+                raise QgsProcessingException(str(error)) from error
+
+        return samples
+
+    def processAlgorithm(self,  # type: ignore
+                         parameters: Dict[str, Any],
+                         context: QgsProcessingContext,
+                         feedback: QgsProcessingFeedback) -> Dict[str, Any]:
+        quantiles = self.get_quantiles(self.parameterAsString(parameters, self.QUANTILES, context))
+        samples = self._get_samples(parameters, context, self._get_columns(parameters, context))
+
+        lup_values = WupMonteCarlo.get_lup(samples[self.BUILD_UP_AREA], samples[self.RESIDENTS], samples[self.EMPLOYEES])
+        wup_values = WupMonteCarlo.calculate(samples[self.DIS], lup_values, samples[self.SSA])
+
+        invalid_count = int(numpy.count_nonzero(numpy.isnan(wup_values)))
+        feedback.pushInfo(f'Evaluated {wup_values.size} samples, {invalid_count} ignored')
+
+        try:
+            lup_quantiles = WupMonteCarlo.get_quantiles(lup_values[~numpy.isnan(wup_values)], quantiles)
+            wup_quantiles = WupMonteCarlo.get_quantiles(wup_values, quantiles)
+        except ValueError as error:
+            raise QgsProcessingException(str(error)) from error
+
+        fields = QgsFields()
+        fields.append(QgsField('QUANTILE', QVariant.Double))
+        fields.append(QgsField('LUP', QVariant.Double))
+        fields.append(QgsField('WUP', QVariant.Double))
+
+        (sink, destination_id) = self.parameterAsSink(parameters, self.OUTPUT, context,
+                                                      fields, QgsWkbTypes.NoGeometry, QgsCoordinateReferenceSystem())
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        for (quantile, lup_quantile, wup_quantile) in zip(quantiles, lup_quantiles, wup_quantiles):
+            feedback.pushInfo(f'{quantile},{lup_quantile},{wup_quantile}')
+
+            feature = QgsFeature(fields)
+            feature.setAttributes([quantile, float(lup_quantile), float(wup_quantile)])
+            sink.addFeature(feature, QgsFeatureSink.FastInsert)
+
+        return {self.OUTPUT: destination_id,
+                self.WUP_MEAN: float(numpy.nanmean(wup_values)),
+                self.INVALID_COUNT: invalid_count}
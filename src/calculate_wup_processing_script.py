@@ -1,4 +1,3 @@
-import math
 from typing import Optional, Dict, Any
 
 from qgis.PyQt.QtCore import QCoreApplication
@@ -7,6 +6,7 @@ from qgis.core import QgsProcessingContext, QgsProcessingFeedback, QgsProcessing
     QgsProcessingOutputNumber, QgsProcessingException
 
 from . import constants
+from .urban_sprawl.wup.wup_calculator import WupCalculator
 
 
 class CalculateWupProcessingScript(QgsProcessingAlgorithm):  # type: ignore
@@ -87,12 +87,4 @@ class CalculateWupProcessingScript(QgsProcessingAlgorithm):  # type: ignore
         if ssa_value < 0 or ssa_value > 1:
             raise QgsProcessingException('SSA value needs to be between 0 and 1 or less')
 
-        up = ssa_value * dis_value
-
-        value1 = math.exp(4.159 - 613.125 / lup_value)
-        weight1 = value1 / (1 + value1)
-
-        value2 = math.exp(0.294432 * dis_value - 12.955)
-        weight2 = value2 / (1 + value2)
-
-        return {self.OUTPUT: up * weight1 * (0.5 + weight2)}
+        return {self.OUTPUT: WupCalculator.calculate(dis_value, lup_value, ssa_value)}
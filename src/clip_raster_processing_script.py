@@ -1,25 +1,33 @@
-from typing import Dict, Any, Optional
+import os
+from typing import Dict, Any, Optional, List
 
-import gdal
-import numpy
-from qgis import processing
 from qgis.PyQt.QtCore import QCoreApplication
 from qgis.core import QgsProcessingContext, QgsProcessingFeedback, QgsProcessingAlgorithm, \
     QgsProcessingParameterRasterLayer, QgsProcessingParameterRasterDestination, \
-    QgsProcessingParameterNumber, QgsProcessingParameterFeatureSource
+    QgsProcessingParameterNumber, QgsProcessingParameterFeatureSource, QgsFeatureSource, \
+    QgsCoordinateReferenceSystem, QgsCoordinateTransform, QgsProcessingParameterBoolean, QgsProcessingParameterFileDestination, \
+    QgsProcessing, QgsProcessingParameterEnum, QgsProcessingOutputLayerDefinition
 
 from . import constants
 from .urban_sprawl.clip_raster.raster_clipper import RasterClipper
-from .urban_sprawl.common.common import Common
+from .urban_sprawl.common.dataset_cache import DatasetCache
+from .urban_sprawl.common.raster_writer import RasterWriter
+from .urban_sprawl.common.raw_raster import RawRaster
+from .urban_sprawl.common.result_cache import ResultCache
+from .urban_sprawl.common.stage_metrics import StageMetrics
 
 
 class ClipRasterProcessingScript(QgsProcessingAlgorithm):  # type: ignore
     NO_DATA_VALUE = 'NO_DATA_VALUE'
+    CACHE_SIZE = 'CACHE_SIZE'
+    OUTPUT_FORMAT = 'OUTPUT_FORMAT'
+    METRICS = 'METRICS'
 
     RASTER = 'RASTER'
     VECTOR = 'VECTOR'
 
     OUTPUT = 'CLIPPED_RASTER'
+    METRICS_FILE = 'METRICS_FILE'
 
     @staticmethod
     def tr(string: str) -> str:
@@ -47,6 +55,45 @@ class ClipRasterProcessingScript(QgsProcessingAlgorithm):  # type: ignore
         return self.tr('Clip raster with the provided polygon.'
                        ' This processing script normalizes the raster and speeds up the SI calculation.')
 
+    @staticmethod
+    def get_wkt_geometries(source: QgsFeatureSource,
+                           crs: QgsCoordinateReferenceSystem,
+                           context: QgsProcessingContext) -> List[str]:
+        transform = QgsCoordinateTransform(source.sourceCrs(), crs, context.transformContext())
+
+        wkt_geometries = []
+        for feature in source.getFeatures():
+            geometry = feature.geometry()
+            geometry.transform(transform)
+            wkt_geometries.append(geometry.asWkt())
+
+        return wkt_geometries
+
+    @staticmethod
+    def get_output_path(parameters: Dict[str, Any], output_path: str, name: str, context: QgsProcessingContext) -> str:
+        value = parameters.get(name)
+        if isinstance(value, QgsProcessingOutputLayerDefinition):
+            value = value.sink.staticValue()
+
+        if value != QgsProcessing.TEMPORARY_OUTPUT:
+            return output_path
+
+        raw_path = RawRaster.get_raw_path(output_path)
+
+        if context.willLoadLayerOnCompletion(output_path):
+            layers = context.layersToLoadOnCompletion()
+            layers[raw_path] = layers.pop(output_path)
+            context.setLayersToLoadOnCompletion(layers)
+
+        return raw_path
+
+    @staticmethod
+    def get_output_format_options() -> List[str]:
+        return [ClipRasterProcessingScript.tr('GeoTIFF (striped, uncompressed)'),
+                ClipRasterProcessingScript.tr('GeoTIFF (tiled, DEFLATE, overviews)'),
+                ClipRasterProcessingScript.tr('GeoTIFF (tiled, ZSTD, overviews)'),
+                ClipRasterProcessingScript.tr('Cloud optimized GeoTIFF (ZSTD)')]
+
     def initAlgorithm(self, _: Optional[Dict[str, Any]] = None) -> None:  # type: ignore
         self.addParameter(
             QgsProcessingParameterNumber(
@@ -57,6 +104,25 @@ class ClipRasterProcessingScript(QgsProcessingAlgorithm):  # type: ignore
             )
         )
 
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.CACHE_SIZE,
+                self.tr('Result cache size in MB (0 = disabled)'),
+                QgsProcessingParameterNumber.Integer,
+                defaultValue=constants.CACHE_SIZE_VALUE,
+                minValue=0
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterEnum(
+                self.OUTPUT_FORMAT,
+                self.tr('Output format'),
+                options=self.get_output_format_options(),
+                defaultValue=constants.OUTPUT_FORMAT_VALUE
+            )
+        )
+
         self.addParameter(
             QgsProcessingParameterRasterLayer(
                 self.RASTER,
@@ -71,6 +137,14 @@ class ClipRasterProcessingScript(QgsProcessingAlgorithm):  # type: ignore
             )
         )
 
+        self.addParameter(
+            QgsProcessingParameterBoolean(
+                self.METRICS,
+                self.tr('Report time, memory and throughput of each stage'),
+                defaultValue=False
+            )
+        )
+
         self.addParameter(
             QgsProcessingParameterRasterDestination(
                 self.OUTPUT,
@@ -78,43 +152,77 @@ class ClipRasterProcessingScript(QgsProcessingAlgorithm):  # type: ignore
             )
         )
 
+        self.addParameter(
+            QgsProcessingParameterFileDestination(
+                self.METRICS_FILE,
+                self.tr('Stage metrics JSON file'),
+                fileFilter='JSON files (*.json)',
+                optional=True,
+                createByDefault=False
+            )
+        )
+
     def processAlgorithm(self,  # type: ignore
                          parameters: Dict[str, Any],
                          context: QgsProcessingContext,
-                         _: QgsProcessingFeedback) -> Dict[str, Any]:
-        raster_path = self.parameterAsRasterLayer(parameters, self.RASTER, context).source()
+                         feedback: QgsProcessingFeedback) -> Dict[str, Any]:
+        raster_layer = self.parameterAsRasterLayer(parameters, self.RASTER, context)
+        source = self.parameterAsSource(parameters, self.VECTOR, context)
         no_data_value = self.parameterAsInt(parameters, self.NO_DATA_VALUE, context)
-
-        output_path = self.parameterAsOutputLayer(parameters, self.OUTPUT, context)
-
-        clipped_raster_path = processing.run(
-            'gdal:cliprasterbymasklayer',
-            {
-                'INPUT': parameters[self.RASTER],
-                'MASK': parameters[self.VECTOR],
-                'OUTPUT': parameters[self.OUTPUT]
-            }
-        )['OUTPUT']
-
-        raster = gdal.Open(raster_path)
-
-        pixel_size = Common.get_pixel_size(raster)
-
-        clipped_normalized_matrix = RasterClipper.get_clipped_normalized_matrix(raster_path,
-                                                                                clipped_raster_path,
-                                                                                pixel_size,
-                                                                                no_data_value)
-        shape = Common.get_shape(clipped_normalized_matrix)
-
-        driver = gdal.GetDriverByName('GTiff')
-        clipped_normalized_raster = driver.Create(output_path,
-                                                  bands=1,
-                                                  xsize=shape.columns,
-                                                  ysize=shape.rows,
-                                                  eType=gdal.GDT_Int16)
-        clipped_normalized_raster.GetRasterBand(1).WriteArray(numpy.asarray(clipped_normalized_matrix))
-        clipped_normalized_raster.SetGeoTransform(raster.GetGeoTransform())
-        clipped_normalized_raster.SetProjection(raster.GetProjection())
+        cache_size = self.parameterAsInt(parameters, self.CACHE_SIZE, context)
+        output_format = RasterWriter.FORMATS[self.parameterAsEnum(parameters, self.OUTPUT_FORMAT, context)]
+
+        output_path = self.get_output_path(parameters,
+                                           self.parameterAsOutputLayer(parameters, self.OUTPUT, context),
+                                           self.OUTPUT,
+                                           context)
+        metrics_path = self.parameterAsFileOutput(parameters, self.METRICS_FILE, context)
+        metrics = StageMetrics(self.parameterAsBool(parameters, self.METRICS, context) or bool(metrics_path))
+
+        with metrics.measure('Clip geometry transform'):
+            wkt_geometries = ClipRasterProcessingScript.get_wkt_geometries(source, raster_layer.crs(), context)
+
+        result_cache = ResultCache(cache_size * 1024 ** 2)
+        cache_key = ''
+        if cache_size > 0:
+            cache_key = ResultCache.get_key(self.name(),
+                                            ResultCache.get_raster_hash(raster_layer.source()),
+                                            wkt_geometries,
+                                            no_data_value,
+                                            RawRaster.is_raw_path(output_path),
+                                            output_format)
+
+            if result_cache.get(cache_key, output_path):
+                feedback.pushInfo('Clipped raster loaded from cache')
+                return {self.OUTPUT: output_path}
+
+        raster = DatasetCache.open(raster_layer.source())
+
+        clipped_normalized_raster = RasterWriter.create(output_path,
+                                                        raster,
+                                                        raster.GetRasterBand(1).DataType,
+                                                        output_format=output_format,
+                                                        no_data_value=no_data_value)
+        RasterClipper.clip(raster,
+                           wkt_geometries,
+                           no_data_value,
+                           clipped_normalized_raster.GetRasterBand(1),
+                           metrics)
         clipped_normalized_raster.FlushCache()
+        del clipped_normalized_raster
+
+        with metrics.measure('Clip output finish') as record:
+            RasterWriter.finish(output_path, output_format)
+            record.add_bytes_written(os.path.getsize(output_path))
+
+        if cache_size > 0:
+            result_cache.put(cache_key, output_path)
+
+        metrics.report(feedback.pushInfo)
+
+        results = {self.OUTPUT: output_path}
+        if metrics_path:
+            metrics.save(metrics_path)
+            results[self.METRICS_FILE] = metrics_path
 
-        return {self.OUTPUT: output_path}
+        return results
@@ -1,7 +1,15 @@
 BUILD_UP_VALUE = 1
 NO_DATA_VALUE = 0
 RADIUS_VALUE = 2000
+RADII_VALUE = '500,1000,1500,2000,3000'
 SSA_VALUE = 1
+MEMORY_BUDGET_VALUE = 0
+PROCESSES_VALUE = 1
+CACHE_SIZE_VALUE = 1024
+OUTPUT_FORMAT_VALUE = 1
+SAMPLES_VALUE = 100000
+SEED_VALUE = 0
+QUANTILES_VALUE = '5,25,50,75,95'
 
 GROUP_NAME = 'Urban Sprawl'
 GROUP_ID = 'usl'
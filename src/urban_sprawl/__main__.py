@@ -0,0 +1,5 @@
+import sys
+
+from .cli.urban_sprawl_cli import UrbanSprawlCli
+
+sys.exit(UrbanSprawlCli.main())
@@ -0,0 +1,155 @@
+from typing import List, Optional
+
+from osgeo import gdal
+
+from ...urban_sprawl.clip_raster.polygon_rasterizer import PolygonRasterizer
+from ...urban_sprawl.clip_raster.raster_clipper import RasterClipper
+from ...urban_sprawl.common.block_reducer import BlockReducer
+from ...urban_sprawl.common.common import Common
+from ...urban_sprawl.common.dataset_cache import DatasetCache
+from ...urban_sprawl.common.progress_monitor import CanceledError, ProgressMonitor
+from ...urban_sprawl.common.raster_writer import RasterWriter
+from ...urban_sprawl.pipeline.urban_sprawl_pipeline import UrbanSprawlPipeline, UrbanSprawlResult
+from ...urban_sprawl.si.convolution_si_calculator import ConvolutionSiCalculator
+from ...urban_sprawl.si.incremental_si_calculator import IncrementalSiCalculator
+from ...urban_sprawl.si.parallel_si_calculator import ParallelSiCalculator
+from ...urban_sprawl.si.si_engine import SiEngine
+from ...urban_sprawl.si.tiled_si_calculator import TiledSiCalculator
+from ...urban_sprawl.wup.wup_calculator import WupCalculator
+
+
+class UrbanSprawlApi:
+    @staticmethod
+    def clip_raster(raster_path: str,
+                    wkt_geometries: List[str],
+                    output_path: str,
+                    no_data_value: int,
+                    output_format: str = RasterWriter.GTIFF) -> None:
+        raster = DatasetCache.open(raster_path)
+
+        clipped_raster = RasterWriter.create(output_path,
+                                             raster,
+                                             raster.GetRasterBand(1).DataType,
+                                             output_format=output_format,
+                                             no_data_value=no_data_value)
+        RasterClipper.clip(raster, wkt_geometries, no_data_value, clipped_raster.GetRasterBand(1))
+        clipped_raster.FlushCache()
+        del clipped_raster
+
+        RasterWriter.finish(output_path, output_format)
+
+    @staticmethod
+    def calculate_si(raster_path: str,  # pylint: disable=too-many-arguments,too-many-positional-arguments
+                     clipped_raster_path: str,
+                     output_path: str,
+                     radius: int,
+                     no_data_value: int,
+                     build_up_value: int,
+                     engine: str = SiEngine.CONVOLUTION,
+                     memory_budget: int = 0,
+                     processes: int = 1,
+                     progress: Optional[ProgressMonitor] = None,
+                     output_format: str = RasterWriter.GTIFF,
+                     padded: bool = False) -> None:
+        si_calculator = SiEngine.create(engine, raster_path, clipped_raster_path, radius, no_data_value, build_up_value)
+        si_calculator.padded = padded
+        if progress is not None:
+            si_calculator.progress = progress
+
+        si_raster = RasterWriter.create(output_path,
+                                        DatasetCache.open(raster_path),
+                                        gdal.GDT_Float32,
+                                        output_format=output_format,
+                                        window=si_calculator.get_output_window(),
+                                        no_data_value=no_data_value)
+
+        try:
+            try:
+                if memory_budget > 0:
+                    TiledSiCalculator(si_calculator, memory_budget).calculate(si_raster.GetRasterBand(1))
+                elif processes != 1:
+                    RasterWriter.write_matrix(si_raster.GetRasterBand(1), ParallelSiCalculator(si_calculator, processes).calculate())
+                else:
+                    RasterWriter.write_matrix(si_raster.GetRasterBand(1), si_calculator.calculate())
+
+                si_raster.FlushCache()
+            finally:
+                del si_raster
+        except CanceledError:
+            RasterWriter.delete(output_path)
+            raise
+
+        RasterWriter.finish(output_path, output_format)
+
+    @staticmethod
+    def calculate_dis(si_raster_path: str) -> float:
+        si_statistics = BlockReducer.reduce(DatasetCache.open(si_raster_path), lambda matrix: matrix > 0)
+
+        if si_statistics.count == 0:
+            raise ValueError('Si Values cant be found')
+
+        return si_statistics.sum / si_statistics.count
+
+    @staticmethod
+    def calculate_lup(clipped_raster_path: str, resident_count: int, employee_count: int, build_up_value: int) -> float:
+        resident_employee_count = resident_count + employee_count
+        if resident_employee_count <= 0:
+            raise ValueError('Sum of resident and employee count can not equal 0 or less')
+
+        build_up_area = BlockReducer.reduce(DatasetCache.open(clipped_raster_path), lambda matrix: matrix == build_up_value).area
+
+        return build_up_area / resident_employee_count
+
+    @staticmethod
+    def calculate_wup(dis_value: float, lup_value: float, ssa_value: float) -> float:
+        if ssa_value < 0 or ssa_value > 1:
+            raise ValueError('SSA value needs to be between 0 and 1 or less')
+
+        return WupCalculator.calculate(dis_value, lup_value, ssa_value)
+
+    @staticmethod
+    def calculate_urban_sprawl(raster_path: str,  # pylint: disable=too-many-positional-arguments
+                               wkt_geometries: List[str],
+                               resident_count: int,
+                               employee_count: int,
+                               ssa_value: float,
+                               radius: int,
+                               no_data_value: int,
+                               build_up_value: int,
+                               engine: str = SiEngine.CONVOLUTION,
+                               memory_budget: int = 0) -> UrbanSprawlResult:
+        if ssa_value < 0 or ssa_value > 1:
+            raise ValueError('SSA value needs to be between 0 and 1 or less')
+
+        return UrbanSprawlPipeline(raster_path,
+                                   wkt_geometries,
+                                   radius,
+                                   no_data_value,
+                                   build_up_value,
+                                   engine,
+                                   memory_budget=memory_budget).calculate(resident_count, employee_count, ssa_value)
+
+    @staticmethod
+    def create_incremental_si(raster_path: str,  # pylint: disable=too-many-positional-arguments
+                              wkt_geometries: List[str],
+                              radius: int,
+                              no_data_value: int,
+                              build_up_value: int,
+                              sums_path: Optional[str] = None) -> IncrementalSiCalculator:
+        si_calculator = ConvolutionSiCalculator(raster_path, None, radius, no_data_value, build_up_value)
+        sums = IncrementalSiCalculator.load_sums(sums_path, si_calculator) if sums_path else None
+
+        return IncrementalSiCalculator(si_calculator,
+                                       Common.get_matrix_from_path(raster_path),
+                                       PolygonRasterizer.rasterize(DatasetCache.open(raster_path), wkt_geometries),
+                                       sums)
+
+    @staticmethod
+    def update_incremental_si(incremental_si_calculator: IncrementalSiCalculator, raster_path: str, changed_raster_path: str) -> int:
+        raster = DatasetCache.open(raster_path)
+        changed_raster = DatasetCache.open(changed_raster_path)
+        if (changed_raster.RasterXSize, changed_raster.RasterYSize, changed_raster.GetGeoTransform()) != \
+                (raster.RasterXSize, raster.RasterYSize, raster.GetGeoTransform()):
+            raise ValueError(f'Raster {changed_raster_path} is not on the grid of {raster_path}')
+
+        return incremental_si_calculator.update_matrix(Common.get_matrix_from_path(changed_raster_path))
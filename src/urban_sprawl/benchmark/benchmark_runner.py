@@ -0,0 +1,166 @@
+import json
+import os
+import platform
+import tempfile
+import time
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy
+
+from ...urban_sprawl.api.urban_sprawl_api import UrbanSprawlApi
+from ...urban_sprawl.benchmark.synthetic_raster import SyntheticRaster
+from ...urban_sprawl.common.dataset_cache import DatasetCache
+
+
+class BenchmarkResult:
+    def __init__(self,  # pylint: disable=too-many-positional-arguments
+                 stage: str,
+                 size: int,
+                 radius: Optional[int],
+                 engine: Optional[str],
+                 density: float,
+                 clustering: float,
+                 seconds: float):
+        self._stage = stage
+        self._size = size
+        self._radius = radius
+        self._engine = engine
+        self._density = density
+        self._clustering = clustering
+        self._seconds = seconds
+
+    def __str__(self) -> str:
+        return f'BenchmarkResult(stage={self._stage}, size={self._size}, radius={self._radius}, ' \
+               f'engine={self._engine}, seconds={self._seconds:.4f})'
+
+    @staticmethod
+    def from_dict(values: Dict[str, Any]) -> 'BenchmarkResult':
+        return BenchmarkResult(values['stage'],
+                               values['size'],
+                               values['radius'],
+                               values['engine'],
+                               values['density'],
+                               values['clustering'],
+                               values['seconds'])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'stage': self._stage,
+                'size': self._size,
+                'radius': self._radius,
+                'engine': self._engine,
+                'density': self._density,
+                'clustering': self._clustering,
+                'seconds': self._seconds,
+                'cells_per_second': self.cells_per_second}
+
+    @property
+    def key(self) -> Tuple[str, int, Optional[int], Optional[str], float, float]:
+        return self._stage, self._size, self._radius, self._engine, self._density, self._clustering
+
+    @property
+    def stage(self) -> str:
+        return self._stage
+
+    @property
+    def seconds(self) -> float:
+        return self._seconds
+
+    @property
+    def cells_per_second(self) -> float:
+        return self._size ** 2 / self._seconds if self._seconds > 0 else float('inf')
+
+
+class BenchmarkRunner:
+    VERSION = 1
+
+    RESIDENT_COUNT = 10000
+    COVERAGE = 0.5
+
+    def __init__(self,  # pylint: disable=too-many-positional-arguments
+                 sizes: List[int],
+                 radii: List[int],
+                 engines: List[str],
+                 density: float,
+                 clustering: float,
+                 pixel_size: float,
+                 repeats: int,
+                 seed: int):
+        self._sizes = sizes
+        self._radii = radii
+        self._engines = engines
+        self._density = density
+        self._clustering = clustering
+        self._pixel_size = pixel_size
+        self._repeats = max(1, repeats)
+        self._seed = seed
+
+    def run(self, log: Callable[[str], None] = lambda _: None) -> List[BenchmarkResult]:
+        results = []
+
+        with tempfile.TemporaryDirectory(prefix='usl_benchmark_') as directory:
+            for size in self._sizes:
+                raster_path = os.path.join(directory, f'raster_{size}.tif')
+                clipped_raster_path = os.path.join(directory, f'clipped_{size}.tif')
+                si_raster_path = os.path.join(directory, f'si_{size}.tif')
+
+                SyntheticRaster.write(raster_path,
+                                      SyntheticRaster.generate((size, size), self._density, self._clustering, self._seed),
+                                      self._pixel_size)
+                wkt_geometries = [SyntheticRaster.get_polygon((size, size), self._pixel_size, self.COVERAGE, self._seed)]
+
+                stages: List[Tuple[str, Optional[int], Optional[str], Callable[[], Any]]] = [
+                    ('clip', None, None, partial(UrbanSprawlApi.clip_raster, raster_path, wkt_geometries, clipped_raster_path, 0)),
+                    ('lup', None, None, partial(UrbanSprawlApi.calculate_lup, clipped_raster_path, self.RESIDENT_COUNT, 0, 1))
+                ]
+
+                for radius in self._radii:
+                    for engine in self._engines:
+                        stages.extend([
+                            ('si', radius, engine, partial(UrbanSprawlApi.calculate_si, raster_path, clipped_raster_path,
+                                                           si_raster_path, radius, 0, 1, engine)),
+                            ('dis', radius, engine, partial(UrbanSprawlApi.calculate_dis, si_raster_path)),
+                            ('pipeline', radius, engine, partial(UrbanSprawlApi.calculate_urban_sprawl, raster_path,
+                                                                 wkt_geometries, self.RESIDENT_COUNT, 0, 1, radius, 0, 1, engine))
+                        ])
+
+                for (stage, stage_radius, stage_engine, function) in stages:
+                    result = BenchmarkResult(stage, size, stage_radius, stage_engine, self._density, self._clustering,
+                                             self._measure(function))
+                    log(str(result))
+                    results.append(result)
+
+        return results
+
+    def _measure(self, function: Callable[[], Any]) -> float:
+        timings = []
+        for _ in range(self._repeats):
+            DatasetCache.clear()
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+
+        return min(timings)
+
+    @staticmethod
+    def save(path: str, results: List[BenchmarkResult]) -> None:
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({'version': BenchmarkRunner.VERSION,
+                       'python': platform.python_version(),
+                       'numpy': numpy.__version__,
+                       'machine': platform.machine(),
+                       'results': [result.to_dict() for result in results]}, file, indent=2)
+
+    @staticmethod
+    def load(path: str) -> List[BenchmarkResult]:
+        with open(path, encoding='utf-8') as file:
+            return [BenchmarkResult.from_dict(values) for values in json.load(file)['results']]
+
+    @staticmethod
+    def compare(results: List[BenchmarkResult],
+                baseline: List[BenchmarkResult],
+                threshold: float) -> List[Tuple[BenchmarkResult, BenchmarkResult]]:
+        baseline_results = {result.key: result for result in baseline}
+
+        return [(result, baseline_results[result.key]) for result in results
+                if result.key in baseline_results and result.seconds > baseline_results[result.key].seconds * (1 + threshold)]
@@ -0,0 +1,70 @@
+import math
+from typing import Tuple
+
+import numpy
+from osgeo import gdal, osr
+
+
+class SyntheticRaster:
+    EPSG = 2056
+    ORIGIN = (2600000.0, 1200000.0)
+    MAX_CLUSTER_SIGMA = 16.0
+    POLYGON_VERTICES = 32
+
+    @staticmethod
+    def generate(shape: Tuple[int, int], density: float, clustering: float, seed: int) -> numpy.ndarray:
+        if not 0 <= density <= 1:
+            raise ValueError('Density needs to be between 0 and 1')
+
+        if not 0 <= clustering <= 1:
+            raise ValueError('Clustering needs to be between 0 and 1')
+
+        noise = numpy.random.default_rng(seed).random(shape)
+
+        sigma = clustering * SyntheticRaster.MAX_CLUSTER_SIGMA
+        if sigma > 0:
+            row_frequencies = numpy.fft.fftfreq(shape[0])[:, numpy.newaxis]
+            column_frequencies = numpy.fft.rfftfreq(shape[1])[numpy.newaxis, :]
+            gaussian = numpy.exp(-2 * (math.pi * sigma) ** 2 * (row_frequencies ** 2 + column_frequencies ** 2))
+            noise = numpy.fft.irfft2(numpy.fft.rfft2(noise) * gaussian, s=shape)
+
+        if density <= 0:
+            return numpy.zeros(shape, dtype=numpy.uint8)
+
+        return (noise >= numpy.quantile(noise, 1 - density)).astype(numpy.uint8)
+
+    @staticmethod
+    def get_geo_transform(pixel_size: float, rows: int) -> Tuple[float, float, float, float, float, float]:
+        return (SyntheticRaster.ORIGIN[0], pixel_size, 0.0, SyntheticRaster.ORIGIN[1] + rows * pixel_size, 0.0, -pixel_size)
+
+    @staticmethod
+    def get_polygon(shape: Tuple[int, int], pixel_size: float, coverage: float, seed: int) -> str:
+        (rows, columns) = shape
+        rng = numpy.random.default_rng(seed)
+
+        center_x = SyntheticRaster.ORIGIN[0] + columns * pixel_size / 2
+        center_y = SyntheticRaster.ORIGIN[1] + rows * pixel_size / 2
+        radius = math.sqrt(coverage * rows * columns / math.pi) * pixel_size
+
+        angles = numpy.linspace(0, 2 * math.pi, SyntheticRaster.POLYGON_VERTICES, endpoint=False)
+        radii = radius * rng.uniform(0.75, 1.25, SyntheticRaster.POLYGON_VERTICES)
+
+        points = [f'{center_x + point_radius * math.cos(angle)} {center_y + point_radius * math.sin(angle)}'
+                  for (angle, point_radius) in zip(angles, radii)]
+
+        return f'POLYGON (({", ".join(points + points[:1])}))'
+
+    @staticmethod
+    def write(path: str, matrix: numpy.ndarray, pixel_size: float) -> None:
+        spatial_reference = osr.SpatialReference()
+        spatial_reference.ImportFromEPSG(SyntheticRaster.EPSG)
+
+        raster = gdal.GetDriverByName('GTiff').Create(path,
+                                                      bands=1,
+                                                      xsize=matrix.shape[1],
+                                                      ysize=matrix.shape[0],
+                                                      eType=gdal.GDT_Byte)
+        raster.SetGeoTransform(SyntheticRaster.get_geo_transform(pixel_size, matrix.shape[0]))
+        raster.SetProjection(spatial_reference.ExportToWkt())
+        raster.GetRasterBand(1).WriteArray(matrix)
+        raster.FlushCache()
@@ -0,0 +1,300 @@
+import argparse
+import os
+import sys
+import time
+from typing import Any, List, Optional
+
+from osgeo import gdal
+
+from ... import constants
+from ...urban_sprawl.api.urban_sprawl_api import UrbanSprawlApi
+from ...urban_sprawl.benchmark.benchmark_runner import BenchmarkRunner
+from ...urban_sprawl.clip_raster.vector_reader import VectorReader
+from ...urban_sprawl.common.dataset_cache import DatasetCache
+from ...urban_sprawl.common.raster_writer import RasterWriter
+from ...urban_sprawl.jobs.job_runner import JobRunner
+from ...urban_sprawl.jobs.urban_sprawl_job import UrbanSprawlJob
+from ...urban_sprawl.si.si_engine import SiEngine
+
+
+class UrbanSprawlCli:
+    @staticmethod
+    def get_parser() -> argparse.ArgumentParser:
+        parser = argparse.ArgumentParser(prog='urban_sprawl', description='Calculate urban sprawl without QGIS')
+        commands = parser.add_subparsers(dest='command', required=True)
+
+        clip = commands.add_parser('clip', help='Clip a raster with the polygons of a vector')
+        clip.add_argument('raster')
+        clip.add_argument('vector')
+        clip.add_argument('output')
+        clip.add_argument('--layer')
+        clip.add_argument('--no-data', type=int, default=constants.NO_DATA_VALUE)
+        UrbanSprawlCli._add_output_format_argument(clip)
+
+        si = commands.add_parser('si', help='Calculate the SI raster')
+        si.add_argument('raster')
+        si.add_argument('clipped_raster')
+        si.add_argument('output')
+        UrbanSprawlCli._add_si_arguments(si)
+        si.add_argument('--memory-budget', type=int, default=constants.MEMORY_BUDGET_VALUE,
+                        help='Memory budget in MB for tiled calculation (0 = load the whole raster)')
+        si.add_argument('--processes', type=int, default=constants.PROCESSES_VALUE,
+                        help='Worker processes (0 = all cores)')
+        si.add_argument('--padded', action='store_true',
+                        help='Write the SI raster with the extent of the raster instead of the clipped build up area')
+        UrbanSprawlCli._add_output_format_argument(si)
+
+        dis = commands.add_parser('dis', help='Calculate DIS of a SI raster')
+        dis.add_argument('si_raster')
+
+        lup = commands.add_parser('lup', help='Calculate LUP of a clipped raster')
+        lup.add_argument('clipped_raster')
+        lup.add_argument('--residents', type=int, required=True)
+        lup.add_argument('--employees', type=int, required=True)
+        lup.add_argument('--build-up', type=int, default=constants.BUILD_UP_VALUE)
+
+        wup = commands.add_parser('wup', help='Calculate WUP from DIS, LUP and SSA')
+        wup.add_argument('--dis', type=float, required=True)
+        wup.add_argument('--lup', type=float, required=True)
+        wup.add_argument('--ssa', type=float, default=constants.SSA_VALUE)
+
+        run = commands.add_parser('run', help='Calculate DIS, LUP and WUP of an area boundary in memory')
+        run.add_argument('raster')
+        run.add_argument('vector')
+        run.add_argument('--layer')
+        run.add_argument('--residents', type=int, required=True)
+        run.add_argument('--employees', type=int, required=True)
+        run.add_argument('--ssa', type=float, default=constants.SSA_VALUE)
+        UrbanSprawlCli._add_si_arguments(run)
+        run.add_argument('--memory-budget', type=int, default=constants.MEMORY_BUDGET_VALUE,
+                         help='Memory budget in MB for tiled SI calculation (0 = load the SI read window at once)')
+        run.add_argument('--si-output', help='Optional path of the SI raster')
+        UrbanSprawlCli._add_output_format_argument(run)
+
+        UrbanSprawlCli._add_update_parser(commands)
+        UrbanSprawlCli._add_benchmark_parser(commands)
+        UrbanSprawlCli._add_jobs_parser(commands)
+
+        return parser
+
+    @staticmethod
+    def _add_update_parser(commands: Any) -> None:
+        update = commands.add_parser('update', help='Update DIS, LUP and WUP of an area boundary for changed build up cells')
+        update.add_argument('raster', help='The raster the distance sums were calculated for')
+        update.add_argument('changed_raster', help='The raster with the changed build up cells on the same grid')
+        update.add_argument('vector')
+        update.add_argument('--sums', required=True,
+                            help='Path of the distance sums. Read when it exists and written for the changed raster afterwards')
+        update.add_argument('--layer')
+        update.add_argument('--residents', type=int, required=True)
+        update.add_argument('--employees', type=int, required=True)
+        update.add_argument('--ssa', type=float, default=constants.SSA_VALUE)
+        update.add_argument('--radius', type=int, default=constants.RADIUS_VALUE)
+        update.add_argument('--no-data', type=int, default=constants.NO_DATA_VALUE)
+        update.add_argument('--build-up', type=int, default=constants.BUILD_UP_VALUE)
+        update.add_argument('--si-output', help='Optional path of the SI raster of the changed raster')
+        UrbanSprawlCli._add_output_format_argument(update)
+
+    @staticmethod
+    def _add_benchmark_parser(commands: Any) -> None:
+        benchmark = commands.add_parser('benchmark', help='Time all stages on synthetic rasters')
+        benchmark.add_argument('--sizes', type=UrbanSprawlCli._get_integers, default=[500, 1000, 2000],
+                               help='Comma separated raster sizes in pixels')
+        benchmark.add_argument('--radii', type=UrbanSprawlCli._get_integers, default=[500, 2000],
+                               help='Comma separated horizons of perception')
+        benchmark.add_argument('--engines', type=lambda value: value.split(','), default=[SiEngine.CONVOLUTION],
+                               help='Comma separated SI engines')
+        benchmark.add_argument('--density', type=float, default=0.15, help='Share of build up pixels')
+        benchmark.add_argument('--clustering', type=float, default=0.5,
+                               help='0 scatters the build up pixels randomly, 1 forms large settlements')
+        benchmark.add_argument('--pixel-size', type=float, default=25.0)
+        benchmark.add_argument('--repeats', type=int, default=3, help='The fastest of the repeats is reported')
+        benchmark.add_argument('--seed', type=int, default=0)
+        benchmark.add_argument('--output', help='Path of the JSON results')
+        benchmark.add_argument('--baseline', help='Path of the JSON results to compare with')
+        benchmark.add_argument('--threshold', type=float, default=0.1,
+                               help='Relative slow down compared with the baseline which counts as regression')
+
+    @staticmethod
+    def _add_jobs_parser(commands: Any) -> None:
+        jobs = commands.add_parser('jobs', help='Run the urban sprawl calculation for every job of a CSV or JSON manifest')
+        jobs.add_argument('manifest')
+        jobs.add_argument('--output', help='Path of the CSV results table, printed when missing')
+        jobs.add_argument('--workers', type=int, default=0, help='Jobs calculated at the same time (0 = all cores)')
+        jobs.add_argument('--executor', choices=JobRunner.EXECUTORS, default=JobRunner.PROCESS,
+                          help='Run the jobs in worker processes or in threads of this process')
+
+    @staticmethod
+    def _get_integers(string: str) -> List[int]:
+        return [int(value) for value in string.split(',') if value.strip()]
+
+    @staticmethod
+    def _add_si_arguments(parser: argparse.ArgumentParser) -> None:
+        parser.add_argument('--radius', type=int, default=constants.RADIUS_VALUE)
+        parser.add_argument('--no-data', type=int, default=constants.NO_DATA_VALUE)
+        parser.add_argument('--build-up', type=int, default=constants.BUILD_UP_VALUE)
+        parser.add_argument('--engine', choices=SiEngine.ENGINES, default=SiEngine.CONVOLUTION)
+
+    @staticmethod
+    def _add_output_format_argument(parser: argparse.ArgumentParser) -> None:
+        parser.add_argument('--output-format', choices=RasterWriter.FORMATS, default=RasterWriter.FORMATS[constants.OUTPUT_FORMAT_VALUE],
+                            help='Layout and compression of the output GeoTIFF')
+
+    @staticmethod
+    def main(argv: Optional[List[str]] = None) -> int:
+        arguments = UrbanSprawlCli.get_parser().parse_args(argv)
+
+        gdal.UseExceptions()
+
+        try:
+            return UrbanSprawlCli._run(arguments)
+        except (ValueError, RuntimeError) as error:
+            print(f'error: {error}', file=sys.stderr)
+            return 1
+
+    @staticmethod
+    def _run(arguments: argparse.Namespace) -> int:
+        if arguments.command == 'benchmark':
+            return UrbanSprawlCli._run_benchmark(arguments)
+
+        if arguments.command == 'jobs':
+            return UrbanSprawlCli._run_jobs(arguments)
+
+        if arguments.command == 'update':
+            return UrbanSprawlCli._run_update(arguments)
+
+        if arguments.command == 'clip':
+            UrbanSprawlApi.clip_raster(arguments.raster,
+                                       VectorReader.get_wkt_geometries(arguments.vector,
+                                                                       DatasetCache.open(arguments.raster),
+                                                                       arguments.layer),
+                                       arguments.output,
+                                       arguments.no_data,
+                                       arguments.output_format)
+        elif arguments.command == 'si':
+            UrbanSprawlApi.calculate_si(arguments.raster,
+                                        arguments.clipped_raster,
+                                        arguments.output,
+                                        arguments.radius,
+                                        arguments.no_data,
+                                        arguments.build_up,
+                                        arguments.engine,
+                                        arguments.memory_budget * 1024 ** 2,
+                                        arguments.processes,
+                                        output_format=arguments.output_format,
+                                        padded=arguments.padded)
+        elif arguments.command == 'dis':
+            print(UrbanSprawlApi.calculate_dis(arguments.si_raster))
+        elif arguments.command == 'lup':
+            print(UrbanSprawlApi.calculate_lup(arguments.clipped_raster,
+                                               arguments.residents,
+                                               arguments.employees,
+                                               arguments.build_up))
+        elif arguments.command == 'wup':
+            print(UrbanSprawlApi.calculate_wup(arguments.dis, arguments.lup, arguments.ssa))
+        elif arguments.command == 'run':
+            raster = DatasetCache.open(arguments.raster)
+            result = UrbanSprawlApi.calculate_urban_sprawl(arguments.raster,
+                                                           VectorReader.get_wkt_geometries(arguments.vector,
+                                                                                           raster,
+                                                                                           arguments.layer),
+                                                           arguments.residents,
+                                                           arguments.employees,
+                                                           arguments.ssa,
+                                                           arguments.radius,
+                                                           arguments.no_data,
+                                                           arguments.build_up,
+                                                           arguments.engine,
+                                                           arguments.memory_budget * 1024 ** 2)
+
+            if arguments.si_output and result.si_matrix is not None:
+                RasterWriter.write(arguments.si_output,
+                                   result.si_matrix,
+                                   raster,
+                                   gdal.GDT_Float32,
+                                   arguments.output_format,
+                                   result.si_window,
+                                   no_data_value=arguments.no_data)
+
+            print('WUP,DIS,LUP')
+            print(f'{result.wup},{result.dis},{result.lup}')
+
+        return 0
+
+    @staticmethod
+    def _run_update(arguments: argparse.Namespace) -> int:
+        if arguments.ssa < 0 or arguments.ssa > 1:
+            raise ValueError('SSA value needs to be between 0 and 1 or less')
+
+        raster = DatasetCache.open(arguments.raster)
+        incremental_si_calculator = UrbanSprawlApi.create_incremental_si(arguments.raster,
+                                                                         VectorReader.get_wkt_geometries(arguments.vector,
+                                                                                                         raster,
+                                                                                                         arguments.layer),
+                                                                         arguments.radius,
+                                                                         arguments.no_data,
+                                                                         arguments.build_up,
+                                                                         arguments.sums if os.path.exists(arguments.sums) else None)
+        changed_count = UrbanSprawlApi.update_incremental_si(incremental_si_calculator, arguments.raster, arguments.changed_raster)
+        incremental_si_calculator.save_sums(arguments.sums)
+
+        if arguments.si_output:
+            window = incremental_si_calculator.window
+            RasterWriter.write(arguments.si_output,
+                               incremental_si_calculator.si_matrix[window.slices],
+                               raster,
+                               gdal.GDT_Float32,
+                               arguments.output_format,
+                               window,
+                               no_data_value=arguments.no_data)
+
+        print('WUP,DIS,LUP,CHANGED')
+        print(f'{incremental_si_calculator.get_wup(arguments.residents, arguments.employees, arguments.ssa)},'
+              f'{incremental_si_calculator.dis},'
+              f'{incremental_si_calculator.get_lup(arguments.residents, arguments.employees)},'
+              f'{changed_count}')
+
+        return 0
+
+    @staticmethod
+    def _run_benchmark(arguments: argparse.Namespace) -> int:
+        unknown_engines = set(arguments.engines) - set(SiEngine.ENGINES)
+        if unknown_engines:
+            raise ValueError(f'Unknown SI engines: {", ".join(sorted(unknown_engines))}')
+
+        results = BenchmarkRunner(arguments.sizes,
+                                  arguments.radii,
+                                  arguments.engines,
+                                  arguments.density,
+                                  arguments.clustering,
+                                  arguments.pixel_size,
+                                  arguments.repeats,
+                                  arguments.seed).run(print)
+
+        if arguments.output:
+            BenchmarkRunner.save(arguments.output, results)
+
+        if not arguments.baseline:
+            return 0
+
+        regressions = BenchmarkRunner.compare(results, BenchmarkRunner.load(arguments.baseline), arguments.threshold)
+        for (result, baseline_result) in regressions:
+            print(f'regression: {result} (baseline {baseline_result.seconds:.4f} s)', file=sys.stderr)
+
+        return 1 if regressions else 0
+
+    @staticmethod
+    def _run_jobs(arguments: argparse.Namespace) -> int:
+        job_runner = JobRunner(UrbanSprawlJob.load(arguments.manifest), arguments.workers, arguments.executor)
+
+        start = time.perf_counter()
+        results = job_runner.run(lambda message: print(message, file=sys.stderr))
+        print(f'{len(results)} jobs in {time.perf_counter() - start:.1f} s with {job_runner.workers} workers, '
+              f'slowest job {max((result.seconds for result in results), default=0.0):.1f} s', file=sys.stderr)
+
+        if arguments.output:
+            JobRunner.save(arguments.output, results)
+        else:
+            JobRunner.write(sys.stdout, results)
+
+        return 1 if any(result.failed for result in results) else 0
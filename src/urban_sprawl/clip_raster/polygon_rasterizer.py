@@ -0,0 +1,59 @@
+from typing import List, Tuple
+
+import numpy
+from osgeo import gdal, ogr, osr
+
+from ...urban_sprawl.common.raster_window import RasterWindow
+
+
+class PolygonRasterizer:
+    LABEL_FIELD = 'label'
+
+    @staticmethod
+    def get_window(raster: gdal.Dataset, wkt_geometries: List[str]) -> RasterWindow:
+        envelopes = [ogr.CreateGeometryFromWkt(wkt_geometry).GetEnvelope() for wkt_geometry in wkt_geometries]
+
+        if not envelopes:
+            return RasterWindow(0, 0, 0, 0)
+
+        return RasterWindow.from_envelope(raster, (min(envelope[0] for envelope in envelopes),
+                                                   max(envelope[1] for envelope in envelopes),
+                                                   min(envelope[2] for envelope in envelopes),
+                                                   max(envelope[3] for envelope in envelopes)))
+
+    @staticmethod
+    def rasterize(raster: gdal.Dataset, wkt_geometries: List[str]) -> numpy.ndarray:
+        (window, labels) = PolygonRasterizer.rasterize_window(raster, wkt_geometries)
+
+        mask = numpy.zeros((raster.RasterYSize, raster.RasterXSize), dtype=bool)
+        mask[window.slices] = labels > 0
+
+        return mask
+
+    @staticmethod
+    def rasterize_window(raster: gdal.Dataset, wkt_geometries: List[str]) -> Tuple[RasterWindow, numpy.ndarray]:
+        window = PolygonRasterizer.get_window(raster, wkt_geometries)
+
+        if window.is_empty():
+            return window, numpy.zeros((window.rows, window.columns), dtype=numpy.int32)
+
+        label_raster = gdal.GetDriverByName('MEM').Create('', window.columns, window.rows, 1, gdal.GDT_Int32)
+        label_raster.SetGeoTransform(window.get_geo_transform(raster))
+        label_raster.SetProjection(raster.GetProjection())
+
+        spatial_reference = osr.SpatialReference()
+        spatial_reference.ImportFromWkt(raster.GetProjection())
+
+        vector = ogr.GetDriverByName('Memory').CreateDataSource('')
+        layer = vector.CreateLayer('mask', srs=spatial_reference, geom_type=ogr.wkbUnknown)
+        layer.CreateField(ogr.FieldDefn(PolygonRasterizer.LABEL_FIELD, ogr.OFTInteger))
+
+        for (index, wkt_geometry) in enumerate(wkt_geometries):
+            feature = ogr.Feature(layer.GetLayerDefn())
+            feature.SetField(PolygonRasterizer.LABEL_FIELD, index + 1)
+            feature.SetGeometry(ogr.CreateGeometryFromWkt(wkt_geometry))
+            layer.CreateFeature(feature)
+
+        gdal.RasterizeLayer(label_raster, [1], layer, options=[f'ATTRIBUTE={PolygonRasterizer.LABEL_FIELD}'])
+
+        return window, label_raster.GetRasterBand(1).ReadAsArray()
@@ -1,42 +1,40 @@
-import gdal
+from typing import List, Optional
+
 import numpy
+from osgeo import gdal
 
-from ...urban_sprawl.common.common import Common
+from ...urban_sprawl.clip_raster.polygon_rasterizer import PolygonRasterizer
+from ...urban_sprawl.common.raster_writer import RasterWriter
+from ...urban_sprawl.common.stage_metrics import StageMetrics
 
 
 class RasterClipper:
     @staticmethod
-    def get_clipped_normalized_matrix(raster_path: str,
-                                      clipped_raster_path: str,
-                                      pixel_size: float,
-                                      no_data: int) -> numpy.ndarray:
-        raster = gdal.Open(raster_path)
-        clipped_raster = gdal.Open(clipped_raster_path)
-
-        return RasterClipper._join_matrices(raster, clipped_raster, pixel_size, no_data)
+    def clip(raster: gdal.Dataset,
+             wkt_geometries: List[str],
+             no_data: int,
+             output_band: gdal.Band,
+             metrics: Optional[StageMetrics] = None) -> None:
+        metrics = metrics or StageMetrics()
 
-    @staticmethod
-    def _join_matrices(raster: gdal.Dataset,
-                       clipped_raster: gdal.Dataset,
-                       pixel_size: float,
-                       no_data: int) -> numpy.ndarray:
-        matrix = numpy.array(raster.GetRasterBand(1).ReadAsArray())
-        clipped_matrix = numpy.array(clipped_raster.GetRasterBand(1).ReadAsArray())
+        with metrics.measure('Clip rasterize') as record:
+            output_band.Fill(no_data)
 
-        raster_geo_transform = Common.get_geo_transform(raster)
-        clipped_raster_geo_transform = Common.get_geo_transform(clipped_raster)
+            (window, labels) = PolygonRasterizer.rasterize_window(raster, wkt_geometries)
+            record.add_cells(labels.size)
 
-        x_index = int((raster_geo_transform.position_y - clipped_raster_geo_transform.position_y) / pixel_size)
-        y_index = int((clipped_raster_geo_transform.position_x - raster_geo_transform.position_x) / pixel_size)
+        if window.is_empty():
+            return
 
-        matrix_shape = Common.get_shape(matrix)
-        clipped_matrix_shape = Common.get_shape(clipped_matrix)
+        with metrics.measure('Clip read', labels.size) as record:
+            window_matrix = window.read(raster.GetRasterBand(1))
+            record.add_bytes_read(window_matrix.nbytes)
 
-        return_matrix = numpy.full((matrix_shape.rows, matrix_shape.columns), no_data)
+        with metrics.measure('Clip write', labels.size) as record:
+            numpy.copyto(window_matrix, numpy.array(no_data, dtype=window_matrix.dtype), where=labels == 0)
+            RasterWriter.write_matrix(output_band, window_matrix, window.row_start, window.column_start)
+            record.add_bytes_written(window_matrix.nbytes)
 
-        # @formatter:off
-        return_matrix[x_index:x_index + clipped_matrix_shape.rows,
-                      y_index:y_index + clipped_matrix_shape.columns] = clipped_matrix
-        # @formatter:on
-
-        return return_matrix
+    @staticmethod
+    def get_clipped_matrix(matrix: numpy.ndarray, mask: numpy.ndarray, no_data: int) -> numpy.ndarray:
+        return numpy.where(mask, matrix, numpy.array(no_data, dtype=matrix.dtype))
@@ -0,0 +1,40 @@
+from typing import List, Optional
+
+from osgeo import gdal, ogr, osr
+
+
+class VectorReader:
+    @staticmethod
+    def get_wkt_geometries(vector_path: str, raster: gdal.Dataset, layer_name: Optional[str] = None) -> List[str]:
+        vector = ogr.Open(vector_path)
+        if vector is None:
+            raise ValueError(f'Vector {vector_path} can not be opened')
+
+        layer = vector.GetLayerByName(layer_name) if layer_name else vector.GetLayer(0)
+        if layer is None:
+            raise ValueError(f'Layer {layer_name} not found in {vector_path}')
+
+        transform = None
+        if layer.GetSpatialRef() is not None and raster.GetProjection():
+            source_reference = layer.GetSpatialRef().Clone()
+            target_reference = osr.SpatialReference()
+            target_reference.ImportFromWkt(raster.GetProjection())
+
+            for reference in (source_reference, target_reference):
+                reference.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+
+            if not source_reference.IsSame(target_reference):
+                transform = osr.CoordinateTransformation(source_reference, target_reference)
+
+        wkt_geometries = []
+        for feature in layer:
+            geometry = feature.GetGeometryRef()
+            if geometry is None:
+                continue
+
+            geometry = geometry.Clone()
+            if transform is not None:
+                geometry.Transform(transform)
+            wkt_geometries.append(geometry.ExportToWkt())
+
+        return wkt_geometries
@@ -0,0 +1,71 @@
+from typing import Callable
+
+import numpy
+from osgeo import gdal
+
+from ..common.common import Common
+from ..common.raw_raster import RawRaster
+
+
+class BlockStatistics:
+    def __init__(self, count: int, value_sum: float, pixel_size: float):
+        self._count = count
+        self._value_sum = value_sum
+        self._pixel_size = pixel_size
+
+    def __str__(self) -> str:
+        return f'BlockStatistics(count={self._count}, sum={self._value_sum}, area={self.area})'
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._value_sum
+
+    @property
+    def area(self) -> float:
+        return (self._pixel_size ** 2) * self._count
+
+
+class BlockReducer:
+    TARGET_BLOCK_CELLS = 4 * 1024 ** 2
+
+    @staticmethod
+    def reduce(raster: gdal.Dataset, selection_function: Callable[[numpy.ndarray], numpy.ndarray]) -> BlockStatistics:
+        band = raster.GetRasterBand(1)
+        raw_matrix = RawRaster.get_matrix(raster)
+        (block_columns, block_rows) = band.GetBlockSize()
+
+        window_columns = min(band.XSize, block_columns * max(1, BlockReducer.TARGET_BLOCK_CELLS // (block_columns * block_rows)))
+        window_rows = block_rows * max(1, BlockReducer.TARGET_BLOCK_CELLS // (window_columns * block_rows))
+
+        count = 0
+        value_sum = 0.0
+
+        for row_start in range(0, band.YSize, window_rows):
+            for column_start in range(0, band.XSize, window_columns):
+                if raw_matrix is not None:
+                    matrix = raw_matrix[row_start:row_start + window_rows, column_start:column_start + window_columns]
+                else:
+                    matrix = band.ReadAsArray(column_start,
+                                              row_start,
+                                              min(window_columns, band.XSize - column_start),
+                                              min(window_rows, band.YSize - row_start))
+                selection = selection_function(matrix)
+
+                count += int(numpy.count_nonzero(selection))
+                value_sum += float(numpy.sum(matrix, where=selection, dtype=numpy.float64))
+
+        return BlockStatistics(count, value_sum, Common.get_pixel_size(raster))
+
+    @staticmethod
+    def reduce_matrix(matrix: numpy.ndarray,
+                      pixel_size: float,
+                      selection_function: Callable[[numpy.ndarray], numpy.ndarray]) -> BlockStatistics:
+        selection = selection_function(matrix)
+
+        return BlockStatistics(int(numpy.count_nonzero(selection)),
+                               float(numpy.sum(matrix, where=selection, dtype=numpy.float64)),
+                               pixel_size)
@@ -1,13 +1,18 @@
-from typing import Callable
+from typing import Iterator, Optional, Tuple
 
-import gdal
 import numpy
+from osgeo import gdal
 
+from ..common.dataset_cache import DatasetCache
 from ..common.gdal_geo_transform import GdalGeoTransform
 from ..common.numpy_shape import NumpyShape
+from ..common.raster_window import RasterWindow
+from ..common.raw_raster import RawRaster
 
 
 class Common:
+    MASK_BLOCK_CELLS = 4 * 1024 ** 2
+
     @staticmethod
     def get_geo_transform(raster: gdal.Dataset) -> GdalGeoTransform:
         return GdalGeoTransform.parse(raster.GetGeoTransform())
@@ -18,30 +23,105 @@ class Common:
 
     @staticmethod
     def get_pixel_size(raster: gdal.Dataset) -> float:
-        geo_transform = Common.get_geo_transform(raster)
+        return Common.get_geo_transform(raster).pixel_size
+
+    @staticmethod
+    def get_matrix_from_path(path: str, buffer: Optional[numpy.ndarray] = None) -> numpy.ndarray:
+        raster = DatasetCache.open(path)
+        raw_matrix = RawRaster.get_matrix(raster)
+
+        if raw_matrix is None:
+            return raster.GetRasterBand(1).ReadAsArray(buf_obj=buffer)
+
+        if buffer is None:
+            return raw_matrix
+
+        buffer[...] = raw_matrix
+        return buffer
 
-        if geo_transform.pixel_size_x == geo_transform.pixel_size_y:
-            return geo_transform.pixel_size_x
-        else:
-            raise ValueError('Pixels are not square')
+    @staticmethod
+    def get_mask_from_path(path: str,
+                           value: int,
+                           mask: Optional[numpy.ndarray] = None,
+                           window: Optional[RasterWindow] = None) -> numpy.ndarray:
+        name = f'mask {value}' if window is None else f'mask {value} {window}'
+
+        if mask is None:
+            return DatasetCache.get_array(path, name, lambda raster: Common.get_mask(raster, value, window=window))
+
+        cached_mask = DatasetCache.get_cached_array(path, name)
+        if cached_mask is None:
+            return Common.get_mask(DatasetCache.open(path), value, mask, window)
+
+        mask[...] = cached_mask
+        return mask
 
     @staticmethod
-    def get_matrix_from_path(path: str) -> numpy.ndarray:
-        raster = gdal.Open(path)
+    def get_mask(raster: gdal.Dataset,
+                 value: int,
+                 mask: Optional[numpy.ndarray] = None,
+                 window: Optional[RasterWindow] = None) -> numpy.ndarray:
+        window = window or RasterWindow.from_raster(raster)
+
+        if mask is None:
+            mask = numpy.empty((window.rows, window.columns), dtype=bool)
+
+        for (row_start, block) in Common.read_blocks(raster, window):
+            numpy.equal(block, value, out=mask[row_start:row_start + block.shape[0]])
 
-        return numpy.array(raster.GetRasterBand(1).ReadAsArray())
+        return mask
 
     @staticmethod
-    def get_area(raster: gdal.Dataset, selection_function: Callable[[float], bool]) -> float:
-        matrix = numpy.array(raster.GetRasterBand(1).ReadAsArray())
+    def get_value_window(raster: gdal.Dataset, value: int) -> RasterWindow:
+        (first_row, last_row) = (-1, -1)
+        column_hits = numpy.zeros(raster.RasterXSize, dtype=bool)
+
+        for (row_start, block) in Common.read_blocks(raster):
+            matches = block == value
+            row_hits = numpy.flatnonzero(matches.any(axis=1))
+
+            if row_hits.size > 0:
+                first_row = row_start + int(row_hits[0]) if first_row < 0 else first_row
+                last_row = row_start + int(row_hits[-1])
+                column_hits |= matches.any(axis=0)
+
+        columns = numpy.flatnonzero(column_hits)
+        if columns.size == 0:
+            return RasterWindow(0, 0, 0, 0)
+
+        return RasterWindow(first_row, int(columns[0]), last_row - first_row + 1, int(columns[-1]) - int(columns[0]) + 1)
+
+    @staticmethod
+    def get_mask_window(mask: numpy.ndarray) -> RasterWindow:
+        rows = numpy.flatnonzero(mask.any(axis=1))
+        columns = numpy.flatnonzero(mask.any(axis=0))
+        if rows.size == 0:
+            return RasterWindow(0, 0, 0, 0)
+
+        return RasterWindow(int(rows[0]), int(columns[0]), int(rows[-1]) - int(rows[0]) + 1, int(columns[-1]) - int(columns[0]) + 1)
+
+    @staticmethod
+    def read_blocks(raster: gdal.Dataset, window: Optional[RasterWindow] = None) -> Iterator[Tuple[int, numpy.ndarray]]:
+        window = window or RasterWindow.from_raster(raster)
+        raw_matrix = RawRaster.get_matrix(raster)
+        band = raster.GetRasterBand(1)
+
+        block_rows = max(1, Common.MASK_BLOCK_CELLS // max(1, window.columns))
+        buffer: Optional[numpy.ndarray] = None
+
+        for row_start in range(0, window.rows, block_rows):
+            rows = min(block_rows, window.rows - row_start)
 
-        shape = Common.get_shape(matrix)
-        pixel_size = Common.get_pixel_size(raster)
+            if raw_matrix is not None:
+                yield row_start, raw_matrix[window.row_start + row_start:window.row_start + row_start + rows, window.slices[1]]
+                continue
 
-        count = 0
-        for x in range(0, shape.rows):
-            for y in range(0, shape.columns):
-                if selection_function(matrix[x, y]):
-                    count += 1
+            block = band.ReadAsArray(window.column_start,
+                                     window.row_start + row_start,
+                                     window.columns,
+                                     rows,
+                                     buf_obj=None if buffer is None else buffer[:rows])
+            if buffer is None:
+                buffer = block
 
-        return (pixel_size ** 2) * count
+            yield row_start, block
@@ -0,0 +1,147 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy
+from osgeo import gdal
+
+from ..common.gdal_geo_transform import GdalGeoTransform
+
+
+class CachedDataset:
+    def __init__(self, version: Tuple[int, int], dataset: gdal.Dataset):
+        self._version = version
+        self._dataset = dataset
+        self._geo_transform: Optional[GdalGeoTransform] = None
+        self._arrays: Dict[str, numpy.ndarray] = {}
+
+    @property
+    def version(self) -> Tuple[int, int]:
+        return self._version
+
+    @property
+    def dataset(self) -> gdal.Dataset:
+        return self._dataset
+
+    @property
+    def geo_transform(self) -> GdalGeoTransform:
+        if self._geo_transform is None:
+            self._geo_transform = GdalGeoTransform.parse(self._dataset.GetGeoTransform())
+
+        return self._geo_transform
+
+    @property
+    def arrays(self) -> Dict[str, numpy.ndarray]:
+        return self._arrays
+
+    @property
+    def array_bytes(self) -> int:
+        return sum(array.nbytes for array in self._arrays.values())
+
+
+class DatasetCache:
+    MAX_DATASETS = 16
+    MAX_ARRAY_BYTES = 128 * 1024 ** 2
+
+    _local = threading.local()
+
+    @staticmethod
+    def _get_entries() -> 'OrderedDict[str, CachedDataset]':
+        if not hasattr(DatasetCache._local, 'entries'):
+            DatasetCache._local.entries = OrderedDict()
+
+        return DatasetCache._local.entries  # type: ignore
+
+    @staticmethod
+    def _get_version(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _get_entry(path: str) -> Optional[CachedDataset]:
+        version = DatasetCache._get_version(path)
+        if version is None:
+            return None
+
+        entries = DatasetCache._get_entries()
+        key = os.path.abspath(path)
+
+        entry = entries.get(key)
+        if entry is not None and entry.version == version:
+            entries.move_to_end(key)
+            return entry
+
+        dataset = gdal.Open(path)
+        if dataset is None:
+            return None
+
+        entries[key] = CachedDataset(version, dataset)
+        entries.move_to_end(key)
+
+        while len(entries) > DatasetCache.MAX_DATASETS:
+            entries.popitem(last=False)
+
+        return entries[key]
+
+    @staticmethod
+    def open(path: str) -> gdal.Dataset:
+        entry = DatasetCache._get_entry(path)
+
+        return gdal.Open(path) if entry is None else entry.dataset
+
+    @staticmethod
+    def get_geo_transform(path: str) -> GdalGeoTransform:
+        entry = DatasetCache._get_entry(path)
+
+        return GdalGeoTransform.parse(gdal.Open(path).GetGeoTransform()) if entry is None else entry.geo_transform
+
+    @staticmethod
+    def get_pixel_size(path: str) -> float:
+        return DatasetCache.get_geo_transform(path).pixel_size
+
+    @staticmethod
+    def get_array(path: str, name: str, read: Callable[[gdal.Dataset], numpy.ndarray]) -> numpy.ndarray:
+        entry = DatasetCache._get_entry(path)
+        if entry is None:
+            return read(gdal.Open(path))
+
+        if name in entry.arrays:
+            return entry.arrays[name]
+
+        array = read(entry.dataset)
+        if array.nbytes > DatasetCache.MAX_ARRAY_BYTES:
+            return array
+
+        array.setflags(write=False)
+        entry.arrays[name] = array
+
+        entries = DatasetCache._get_entries()
+        for other_entry in entries.values():
+            if sum(cached_entry.array_bytes for cached_entry in entries.values()) <= DatasetCache.MAX_ARRAY_BYTES:
+                break
+
+            if other_entry is not entry:
+                other_entry.arrays.clear()
+
+        return array
+
+    @staticmethod
+    def get_cached_array(path: str, name: str) -> Optional[numpy.ndarray]:
+        entry = DatasetCache._get_entries().get(os.path.abspath(path))
+        if entry is None or entry.version != DatasetCache._get_version(path):
+            return None
+
+        return entry.arrays.get(name)
+
+    @staticmethod
+    def release(path: str) -> None:
+        DatasetCache._get_entries().pop(os.path.abspath(path), None)
+
+    @staticmethod
+    def clear() -> None:
+        DatasetCache._get_entries().clear()
@@ -46,6 +46,13 @@ class GdalGeoTransform:
     def pixel_size_y(self) -> float:
         return self._pixel_size_y
 
+    @property
+    def pixel_size(self) -> float:
+        if self._pixel_size_x == self._pixel_size_y:
+            return self._pixel_size_x
+        else:
+            raise ValueError('Pixels are not square')
+
     @property
     def rotation_x(self) -> float:
         return self._rotation_x
@@ -0,0 +1,63 @@
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Tuple, Type
+
+
+class CanceledError(Exception):
+    pass
+
+
+class ProgressMonitor:
+    REPORT_INTERVAL = 0.25
+
+    def __init__(self,
+                 on_progress: Callable[[float, Optional[float]], None] = lambda _, __: None,
+                 is_canceled: Callable[[], bool] = lambda: False):
+        self._on_progress = on_progress
+        self._is_canceled = is_canceled
+
+        self._start = time.perf_counter()
+        self._reported = 0.0
+        self._low = 0.0
+        self._high = 100.0
+
+    def __reduce__(self) -> Tuple[Type['ProgressMonitor'], Tuple[()]]:
+        return ProgressMonitor, ()
+
+    @property
+    def canceled(self) -> bool:
+        return bool(self._is_canceled())
+
+    def check(self) -> None:
+        if self._is_canceled():
+            raise CanceledError('Calculation was canceled')
+
+    def reset(self) -> None:
+        self._start = time.perf_counter()
+        self._reported = 0.0
+
+    @contextmanager
+    def sub_range(self, start: float, end: float) -> Iterator['ProgressMonitor']:
+        (low, high) = (self._low, self._high)
+        self._low = low + (high - low) * start / 100
+        self._high = low + (high - low) * end / 100
+
+        try:
+            yield self
+        finally:
+            (self._low, self._high) = (low, high)
+
+    def update(self, done: int, total: int) -> None:
+        self.check()
+
+        now = time.perf_counter()
+        if done < total and now - self._reported < ProgressMonitor.REPORT_INTERVAL:
+            return
+
+        self._reported = now
+
+        progress = self._low + (self._high - self._low) * (done / total if total > 0 else 1.0)
+        elapsed = now - self._start
+        eta = elapsed * (100 - progress) / progress if progress > 0 else None
+
+        self._on_progress(progress, eta)
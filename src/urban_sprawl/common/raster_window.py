@@ -0,0 +1,87 @@
+import math
+from typing import Tuple
+
+import numpy
+from osgeo import gdal
+
+from ..common.gdal_geo_transform import GdalGeoTransform
+
+
+class RasterWindow:
+    def __init__(self, row_start: int, column_start: int, rows: int, columns: int):
+        self._row_start = row_start
+        self._column_start = column_start
+        self._rows = rows
+        self._columns = columns
+
+    def __str__(self) -> str:
+        return f'RasterWindow(row_start={self._row_start}, column_start={self._column_start}, ' \
+               f'rows={self._rows}, columns={self._columns})'
+
+    @staticmethod
+    def from_envelope(raster: gdal.Dataset, envelope: Tuple[float, float, float, float]) -> 'RasterWindow':
+        (min_x, max_x, min_y, max_y) = envelope
+        geo_transform = GdalGeoTransform.parse(raster.GetGeoTransform())
+
+        column_start = max(0, math.floor((min_x - geo_transform.position_x) / geo_transform.pixel_size_x))
+        column_end = min(raster.RasterXSize, math.ceil((max_x - geo_transform.position_x) / geo_transform.pixel_size_x))
+        row_start = max(0, math.floor((geo_transform.position_y - max_y) / geo_transform.pixel_size_y))
+        row_end = min(raster.RasterYSize, math.ceil((geo_transform.position_y - min_y) / geo_transform.pixel_size_y))
+
+        return RasterWindow(row_start, column_start, max(0, row_end - row_start), max(0, column_end - column_start))
+
+    @staticmethod
+    def from_raster(raster: gdal.Dataset) -> 'RasterWindow':
+        return RasterWindow(0, 0, raster.RasterYSize, raster.RasterXSize)
+
+    @property
+    def row_start(self) -> int:
+        return self._row_start
+
+    @property
+    def column_start(self) -> int:
+        return self._column_start
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    @property
+    def columns(self) -> int:
+        return self._columns
+
+    @property
+    def slices(self) -> Tuple[slice, slice]:
+        return (slice(self._row_start, self._row_start + self._rows),
+                slice(self._column_start, self._column_start + self._columns))
+
+    def is_empty(self) -> bool:
+        return self._rows == 0 or self._columns == 0
+
+    def expand(self, cells: int, rows: int, columns: int) -> 'RasterWindow':
+        if self.is_empty():
+            return self
+
+        row_start = max(0, self._row_start - cells)
+        column_start = max(0, self._column_start - cells)
+
+        return RasterWindow(row_start,
+                            column_start,
+                            min(rows, self._row_start + self._rows + cells) - row_start,
+                            min(columns, self._column_start + self._columns + cells) - column_start)
+
+    def relative_to(self, window: 'RasterWindow') -> 'RasterWindow':
+        return RasterWindow(self._row_start - window.row_start, self._column_start - window.column_start, self._rows, self._columns)
+
+    def get_geo_transform(self, raster: gdal.Dataset) -> Tuple[float, float, float, float, float, float]:
+        (position_x, pixel_size_x, rotation_x, position_y, rotation_y, pixel_size_y) = raster.GetGeoTransform()
+
+        return (position_x + self._column_start * pixel_size_x + self._row_start * rotation_x,
+                pixel_size_x,
+                rotation_x,
+                position_y + self._column_start * rotation_y + self._row_start * pixel_size_y,
+                rotation_y,
+                pixel_size_y)
+
+    def read(self, band: gdal.Band) -> numpy.ndarray:
+        return band.ReadAsArray(self._column_start, self._row_start, self._columns, self._rows)
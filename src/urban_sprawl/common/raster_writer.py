@@ -0,0 +1,162 @@
+import os
+from typing import Dict, List, Optional
+
+import numpy
+from osgeo import gdal
+
+from ..common.dataset_cache import DatasetCache
+from ..common.raster_window import RasterWindow
+from ..common.raw_raster import RawRaster
+
+
+class RasterWriter:
+    GTIFF = 'gtiff'
+    DEFLATE = 'deflate'
+    ZSTD = 'zstd'
+    COG = 'cog'
+
+    FORMATS: List[str] = [GTIFF, DEFLATE, ZSTD, COG]
+
+    BLOCK_SIZE = 512
+    MIN_OVERVIEW_SIZE = 256
+    WRITE_BLOCK_CELLS = 16 * 1024 ** 2
+
+    @staticmethod
+    def get_creation_options(output_format: str, data_type: int) -> List[str]:
+        if output_format not in RasterWriter.FORMATS:
+            raise ValueError(f'Unknown output format: {output_format}')
+
+        if output_format == RasterWriter.GTIFF:
+            return []
+
+        predictor = '3' if data_type in (gdal.GDT_Float32, gdal.GDT_Float64) else '2'
+        compression = 'DEFLATE' if output_format == RasterWriter.DEFLATE else 'ZSTD'
+
+        return ['TILED=YES',
+                f'BLOCKXSIZE={RasterWriter.BLOCK_SIZE}',
+                f'BLOCKYSIZE={RasterWriter.BLOCK_SIZE}',
+                f'COMPRESS={compression}',
+                f'PREDICTOR={predictor}',
+                'SPARSE_OK=TRUE',
+                'NUM_THREADS=ALL_CPUS',
+                'BIGTIFF=IF_SAFER']
+
+    @staticmethod
+    def create(path: str,  # pylint: disable=too-many-positional-arguments
+               reference: gdal.Dataset,
+               data_type: int,
+               bands: int = 1,
+               output_format: str = GTIFF,
+               window: Optional[RasterWindow] = None,
+               no_data_value: Optional[float] = None) -> gdal.Dataset:
+        DatasetCache.release(path)
+        window = window or RasterWindow.from_raster(reference)
+
+        if RawRaster.is_raw_path(path):
+            (driver, options) = (gdal.GetDriverByName(RawRaster.DRIVER), [])
+        else:
+            (driver, options) = (gdal.GetDriverByName('GTiff'), RasterWriter.get_creation_options(output_format, data_type))
+
+        raster = driver.Create(path,
+                               bands=bands,
+                               xsize=window.columns,
+                               ysize=window.rows,
+                               eType=data_type,
+                               options=options)
+        raster.SetGeoTransform(window.get_geo_transform(reference))
+        raster.SetProjection(reference.GetProjection())
+
+        if no_data_value is not None:
+            for band in range(1, bands + 1):
+                raster.GetRasterBand(band).SetNoDataValue(no_data_value)
+
+        return raster
+
+    @staticmethod
+    def write_matrix(band: gdal.Band, matrix: numpy.ndarray, row_offset: int = 0, column_offset: int = 0) -> None:
+        (_, block_rows) = band.GetBlockSize()
+        rows = block_rows * max(1, RasterWriter.WRITE_BLOCK_CELLS // (matrix.shape[1] * block_rows))
+
+        for row_start in range(0, matrix.shape[0], rows):
+            band.WriteArray(matrix[row_start:row_start + rows], xoff=column_offset, yoff=row_offset + row_start)
+
+    @staticmethod
+    def finish(path: str, output_format: str = GTIFF) -> None:
+        if output_format == RasterWriter.GTIFF or RawRaster.is_raw_path(path):
+            return
+
+        DatasetCache.release(path)
+
+        if output_format == RasterWriter.COG:
+            RasterWriter._convert_to_cog(path)
+            return
+
+        raster = gdal.Open(path, gdal.GA_Update)
+        raster.BuildOverviews('NEAREST', RasterWriter.get_overview_levels(raster.RasterXSize, raster.RasterYSize))
+        raster.FlushCache()
+
+    @staticmethod
+    def delete(path: str) -> None:
+        DatasetCache.release(path)
+        if not os.path.exists(path):
+            return
+
+        driver = gdal.GetDriverByName(RawRaster.DRIVER if RawRaster.is_raw_path(path) else 'GTiff')
+        try:
+            driver.Delete(path)
+        except RuntimeError:
+            pass
+
+        companion_paths = [path + '.aux.xml']
+        if RawRaster.is_raw_path(path):
+            companion_paths.append(os.path.splitext(path)[0] + RawRaster.HEADER_EXTENSION)
+
+        for file_path in [path] + companion_paths:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+    @staticmethod
+    def get_overview_levels(columns: int, rows: int) -> List[int]:
+        levels = []
+        level = 2
+        while max(columns, rows) / level >= RasterWriter.MIN_OVERVIEW_SIZE:
+            levels.append(level)
+            level *= 2
+
+        return levels
+
+    @staticmethod
+    def _convert_to_cog(path: str) -> None:
+        source_path = path + '.tmp.tif'
+        os.replace(path, source_path)
+
+        source = gdal.Open(source_path)
+        cog = gdal.GetDriverByName('COG').CreateCopy(path, source, options=['COMPRESS=ZSTD',
+                                                                            'PREDICTOR=YES',
+                                                                            f'BLOCKSIZE={RasterWriter.BLOCK_SIZE}',
+                                                                            'OVERVIEWS=AUTO',
+                                                                            'RESAMPLING=NEAREST',
+                                                                            'SPARSE_OK=TRUE',
+                                                                            'NUM_THREADS=ALL_CPUS',
+                                                                            'BIGTIFF=IF_SAFER'])
+        del cog
+        del source
+        gdal.GetDriverByName('GTiff').Delete(source_path)
+
+    @staticmethod
+    def write(path: str,  # pylint: disable=too-many-positional-arguments
+              matrix: numpy.ndarray,
+              reference: gdal.Dataset,
+              data_type: int,
+              output_format: str = GTIFF,
+              window: Optional[RasterWindow] = None,
+              metadata: Optional[Dict[str, str]] = None,
+              no_data_value: Optional[float] = None) -> None:
+        raster = RasterWriter.create(path, reference, data_type, output_format=output_format, window=window, no_data_value=no_data_value)
+        RasterWriter.write_matrix(raster.GetRasterBand(1), matrix)
+        if metadata:
+            raster.SetMetadata(metadata)
+        raster.FlushCache()
+        del raster
+
+        RasterWriter.finish(path, output_format)
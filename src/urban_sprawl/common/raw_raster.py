@@ -0,0 +1,49 @@
+import os
+import sys
+from typing import Dict, Optional
+
+import numpy
+from osgeo import gdal, gdal_array
+
+
+class RawRaster:
+    DRIVER = 'ENVI'
+    EXTENSION = '.bsq'
+    HEADER_EXTENSION = '.hdr'
+
+    @staticmethod
+    def is_raw_path(path: str) -> bool:
+        return path.lower().endswith(RawRaster.EXTENSION)
+
+    @staticmethod
+    def get_raw_path(path: str) -> str:
+        return os.path.splitext(path)[0] + RawRaster.EXTENSION
+
+    @staticmethod
+    def get_matrix(raster: gdal.Dataset) -> Optional[numpy.ndarray]:
+        if raster.GetDriver().ShortName != RawRaster.DRIVER or raster.RasterCount != 1:
+            return None
+
+        file_list = raster.GetFileList() or []
+        data_paths = [path for path in file_list if not path.lower().endswith((RawRaster.HEADER_EXTENSION, '.aux.xml'))]
+        header_paths = [path for path in file_list if path.lower().endswith(RawRaster.HEADER_EXTENSION)]
+
+        if len(data_paths) != 1 or len(header_paths) != 1:
+            return None
+
+        header = RawRaster._read_header(header_paths[0])
+        if header.get('header offset', '0') != '0' or header.get('byte order', '0') != ('0' if sys.byteorder == 'little' else '1'):
+            return None
+
+        band = raster.GetRasterBand(1)
+        dtype = numpy.dtype(gdal_array.GDALTypeCodeToNumericTypeCode(band.DataType))
+
+        if os.path.getsize(data_paths[0]) != band.XSize * band.YSize * dtype.itemsize:
+            return None
+
+        return numpy.memmap(data_paths[0], dtype=dtype, mode='r', shape=(band.YSize, band.XSize))
+
+    @staticmethod
+    def _read_header(path: str) -> Dict[str, str]:
+        with open(path, encoding='ascii', errors='ignore') as file:
+            return {key.strip().lower(): value.strip() for (key, separator, value) in (line.partition('=') for line in file) if separator}
@@ -0,0 +1,229 @@
+import functools
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from osgeo import gdal
+
+from ..common.dataset_cache import DatasetCache
+
+
+class ResultCache:
+    DIRECTORY = os.path.join(tempfile.gettempdir(), 'urban_sprawl_cache')
+    EXTENSION = '.tif'
+    TEMPORARY_EXTENSION = '.tmp'
+    HASH_ROWS = 1024
+    ORIGIN_LIMIT = 256
+
+    _ORIGINS: 'OrderedDict[Tuple[str, int, int, int, int], str]' = OrderedDict()
+    _ORIGINS_LOCK = threading.Lock()
+
+    def __init__(self, size_limit: int, directory: str = DIRECTORY):
+        self._size_limit = size_limit
+        self._directory = directory
+
+    @property
+    def size_limit(self) -> int:
+        return self._size_limit
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @staticmethod
+    def get_key(*parts: Any) -> str:
+        return hashlib.blake2b(repr(parts).encode(), digest_size=20).hexdigest()
+
+    @staticmethod
+    def get_raster_hash(path: str) -> str:
+        identity = ResultCache._get_identity(path)
+        if identity is None:
+            return ResultCache._hash_raster(path)
+
+        with ResultCache._ORIGINS_LOCK:
+            origin = ResultCache._ORIGINS.get(identity)
+
+        return origin or ResultCache.get_key(*identity)
+
+    @staticmethod
+    def _get_identity(path: str) -> Optional[Tuple[str, int, int, int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        return (os.path.abspath(path), stat.st_ino, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size)
+
+    @staticmethod
+    def _set_origin(path: str, key: str) -> None:
+        identity = ResultCache._get_identity(path)
+        if identity is None:
+            return
+
+        with ResultCache._ORIGINS_LOCK:
+            for stale_identity in [origin for origin in ResultCache._ORIGINS if origin[0] == identity[0]]:
+                del ResultCache._ORIGINS[stale_identity]
+
+            ResultCache._ORIGINS[identity] = key
+            while len(ResultCache._ORIGINS) > ResultCache.ORIGIN_LIMIT:
+                ResultCache._ORIGINS.popitem(last=False)
+
+    @staticmethod
+    def _drop_origins(keys: Iterable[str]) -> None:
+        dropped_keys = set(keys)
+        with ResultCache._ORIGINS_LOCK:
+            for identity in [identity for (identity, key) in ResultCache._ORIGINS.items() if key in dropped_keys]:
+                del ResultCache._ORIGINS[identity]
+
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _hash_raster(path: str) -> str:
+        raster = DatasetCache.open(path)
+        band = raster.GetRasterBand(1)
+
+        raster_hash = hashlib.blake2b(digest_size=20)
+        raster_hash.update(repr((raster.RasterXSize,
+                                 raster.RasterYSize,
+                                 band.DataType,
+                                 raster.GetGeoTransform(),
+                                 raster.GetProjection())).encode())
+
+        for row_start in range(0, raster.RasterYSize, ResultCache.HASH_ROWS):
+            rows = min(ResultCache.HASH_ROWS, raster.RasterYSize - row_start)
+            raster_hash.update(band.ReadRaster(0, row_start, raster.RasterXSize, rows))
+
+        return raster_hash.hexdigest()
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self._directory, key + self.EXTENSION)
+
+    def get(self, key: str, output_path: str) -> bool:
+        if self._size_limit <= 0:
+            return False
+
+        path = self.get_path(key)
+        DatasetCache.release(output_path)
+
+        try:
+            shutil.copyfile(path, output_path)
+            for (companion_path, suffix) in self._get_companions(key):
+                shutil.copyfile(companion_path, os.path.splitext(output_path)[0] + suffix)
+            os.utime(path)
+        except OSError:
+            return False
+
+        ResultCache._set_origin(output_path, key)
+
+        return True
+
+    def get_metadata(self, key: str) -> Optional[Dict[str, str]]:
+        if self._size_limit <= 0:
+            return None
+
+        path = self.get_path(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            raster = gdal.Open(path)
+            metadata = raster.GetMetadata() if raster is not None else None
+            del raster
+            os.utime(path)
+        except (OSError, RuntimeError):
+            return None
+
+        return metadata
+
+    def put(self, key: str, path: str) -> None:
+        companions = ResultCache._get_companion_paths(path)
+        ResultCache._set_origin(path, key)
+
+        if self._size_limit <= 0 or sum(os.path.getsize(file_path) for file_path in [path] + companions) > self._size_limit:
+            return
+
+        os.makedirs(self._directory, exist_ok=True)
+
+        (handle, temporary_path) = tempfile.mkstemp(suffix=self.TEMPORARY_EXTENSION, dir=self._directory)
+        os.close(handle)
+
+        try:
+            for companion_path in companions:
+                shutil.copyfile(companion_path, os.path.join(self._directory, key + companion_path[len(os.path.splitext(path)[0]):]))
+
+            shutil.copyfile(path, temporary_path)
+            os.replace(temporary_path, self.get_path(key))
+        except OSError:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            return
+
+        self._evict()
+
+    def clear(self) -> None:
+        entries = self._get_entries()
+        for (paths, _, __) in entries:
+            for path in paths:
+                os.remove(path)
+
+        ResultCache._drop_origins(self._get_entry_key(paths) for (paths, _, __) in entries)
+
+    @staticmethod
+    def _get_entry_key(paths: List[str]) -> str:
+        return os.path.basename(paths[0]).split('.')[0]
+
+    @staticmethod
+    def _get_companion_paths(path: str) -> List[str]:
+        base_path = os.path.splitext(path)[0]
+        raster = gdal.Open(path)
+        if raster is None:
+            return []
+
+        return [file_path for file_path in (raster.GetFileList() or [])
+                if os.path.abspath(file_path) != os.path.abspath(path) and file_path.startswith(base_path)]
+
+    def _get_companions(self, key: str) -> List[Tuple[str, str]]:
+        return [(entry.path, entry.name[len(key):]) for entry in os.scandir(self._directory)
+                if entry.name.startswith(key + '.') and entry.name != key + self.EXTENSION]
+
+    def _get_entries(self) -> List[Tuple[List[str], float, int]]:
+        if not os.path.isdir(self._directory):
+            return []
+
+        entries: Dict[str, Tuple[List[str], float, int]] = {}
+        for entry in os.scandir(self._directory):
+            if not entry.is_file() or entry.name.endswith(self.TEMPORARY_EXTENSION):
+                continue
+
+            key = entry.name.split('.')[0]
+            stat = entry.stat()
+            (paths, modified, size) = entries.get(key, ([], 0.0, 0))
+            if entry.name == key + self.EXTENSION:
+                modified = stat.st_mtime
+
+            entries[key] = (paths + [entry.path], modified, size + stat.st_size)
+
+        return list(entries.values())
+
+    def _evict(self) -> None:
+        entries = sorted(self._get_entries(), key=lambda entry: entry[1])
+        cache_size = sum(size for (_, __, size) in entries)
+
+        evicted_keys = []
+        for (paths, _, size) in entries:
+            if cache_size <= self._size_limit:
+                break
+
+            try:
+                for path in paths:
+                    os.remove(path)
+            except OSError:
+                continue
+
+            evicted_keys.append(self._get_entry_key(paths))
+            cache_size -= size
+
+        ResultCache._drop_origins(evicted_keys)
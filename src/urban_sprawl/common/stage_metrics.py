@@ -0,0 +1,119 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List
+
+
+class StageRecord:
+    def __init__(self, name: str, cells: int = 0):
+        self._name = name
+        self._cells = cells
+        self._seconds = 0.0
+        self._peak_memory = 0
+        self._bytes_read = 0
+        self._bytes_written = 0
+
+    def __str__(self) -> str:
+        return f'{self._name}: {self._seconds:.3f} s, peak memory {self._peak_memory / 1024 ** 2:.1f} MB, ' \
+               f'{self.cells_per_second:.0f} cells/s, read {self._bytes_read / 1024 ** 2:.1f} MB, ' \
+               f'written {self._bytes_written / 1024 ** 2:.1f} MB'
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def seconds(self) -> float:
+        return self._seconds
+
+    @property
+    def peak_memory(self) -> int:
+        return self._peak_memory
+
+    @property
+    def cells(self) -> int:
+        return self._cells
+
+    @property
+    def cells_per_second(self) -> float:
+        return self._cells / self._seconds if self._seconds > 0 else 0.0
+
+    @property
+    def bytes_read(self) -> int:
+        return self._bytes_read
+
+    @property
+    def bytes_written(self) -> int:
+        return self._bytes_written
+
+    def add_cells(self, cells: int) -> None:
+        self._cells += cells
+
+    def add_bytes_read(self, byte_count: int) -> None:
+        self._bytes_read += byte_count
+
+    def add_bytes_written(self, byte_count: int) -> None:
+        self._bytes_written += byte_count
+
+    def finish(self, seconds: float, peak_memory: int) -> None:
+        self._seconds = seconds
+        self._peak_memory = peak_memory
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'name': self._name,
+                'seconds': self._seconds,
+                'peak_memory': self._peak_memory,
+                'cells': self._cells,
+                'cells_per_second': self.cells_per_second,
+                'bytes_read': self._bytes_read,
+                'bytes_written': self._bytes_written}
+
+
+class StageMetrics:
+    def __init__(self, enabled: bool = False):
+        self._enabled = enabled
+        self._records: List[StageRecord] = []
+        self._depth = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @property
+    def records(self) -> List[StageRecord]:
+        return self._records
+
+    @contextmanager
+    def measure(self, name: str, cells: int = 0) -> Iterator[StageRecord]:
+        record = StageRecord(name, cells)
+
+        if not self._enabled:
+            yield record
+            return
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        elif self._depth == 0 and hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.finish(time.perf_counter() - start, tracemalloc.get_traced_memory()[1])
+            self._depth -= 1
+            self._records.append(record)
+
+            if started_tracing:
+                tracemalloc.stop()
+
+    def report(self, log: Callable[[str], None]) -> None:
+        for record in self._records:
+            log(str(record))
+
+    def save(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({'stages': [record.to_dict() for record in self._records]}, file, indent=2)
@@ -0,0 +1,200 @@
+import csv
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+from osgeo import gdal
+
+from ...urban_sprawl.api.urban_sprawl_api import UrbanSprawlApi
+from ...urban_sprawl.clip_raster.vector_reader import VectorReader
+from ...urban_sprawl.common.dataset_cache import DatasetCache
+from ...urban_sprawl.common.raster_writer import RasterWriter
+from ...urban_sprawl.jobs.urban_sprawl_job import UrbanSprawlJob
+
+
+class JobResult:
+    FIELDS = ['id', 'status', 'dis', 'lup', 'wup', 'seconds', 'error']
+
+    def __init__(self,  # pylint: disable=too-many-positional-arguments
+                 job_id: str,
+                 dis: Optional[float],
+                 lup: Optional[float],
+                 wup: Optional[float],
+                 seconds: float,
+                 error: Optional[str] = None):
+        self._job_id = job_id
+        self._dis = dis
+        self._lup = lup
+        self._wup = wup
+        self._seconds = seconds
+        self._error = error
+
+    def __str__(self) -> str:
+        if self._error is not None:
+            return f'JobResult(id={self._job_id}, seconds={self._seconds:.2f}, error={self._error})'
+
+        return f'JobResult(id={self._job_id}, seconds={self._seconds:.2f}, dis={self._dis}, lup={self._lup}, wup={self._wup})'
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'id': self._job_id,
+                'status': 'failed' if self.failed else 'ok',
+                'dis': self._dis,
+                'lup': self._lup,
+                'wup': self._wup,
+                'seconds': round(self._seconds, 3),
+                'error': self._error}
+
+    @property
+    def job_id(self) -> str:
+        return self._job_id
+
+    @property
+    def failed(self) -> bool:
+        return self._error is not None
+
+    @property
+    def seconds(self) -> float:
+        return self._seconds
+
+
+def _run_job(job: UrbanSprawlJob, marker_path: Optional[str] = None) -> JobResult:
+    if marker_path is not None:
+        with open(marker_path, 'w', encoding='utf-8'):
+            pass
+
+    gdal.UseExceptions()
+    start = time.perf_counter()
+
+    try:
+        raster = DatasetCache.open(job.raster_path)
+        result = UrbanSprawlApi.calculate_urban_sprawl(job.raster_path,
+                                                       VectorReader.get_wkt_geometries(job.vector_path, raster, job.layer),
+                                                       job.resident_count,
+                                                       job.employee_count,
+                                                       job.ssa_value,
+                                                       job.radius,
+                                                       job.no_data_value,
+                                                       job.build_up_value,
+                                                       job.engine)
+
+        if job.si_output_path and result.si_matrix is not None:
+            RasterWriter.write(job.si_output_path,
+                               result.si_matrix,
+                               raster,
+                               gdal.GDT_Float32,
+                               job.output_format,
+                               result.si_window,
+                               no_data_value=job.no_data_value)
+    except Exception as error:  # pylint: disable=broad-except
+        return JobResult(job.job_id, None, None, None, time.perf_counter() - start, f'{type(error).__name__}: {error}')
+
+    return JobResult(job.job_id, result.dis, result.lup, result.wup, time.perf_counter() - start)
+
+
+class JobRunner:
+    PROCESS = 'process'
+    THREAD = 'thread'
+
+    EXECUTORS: List[str] = [PROCESS, THREAD]
+
+    def __init__(self, jobs: List[UrbanSprawlJob], workers: int, executor: str = PROCESS):
+        if executor not in JobRunner.EXECUTORS:
+            raise ValueError(f'Unknown executor: {executor}')
+
+        self._jobs = jobs
+        self._workers = max(1, min(len(jobs), workers if workers > 0 else (os.cpu_count() or 1)))
+        self._executor = executor
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    def _create_executor(self, workers: int) -> Executor:
+        if self._executor == JobRunner.THREAD:
+            return ThreadPoolExecutor(workers)
+
+        return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context())
+
+    @staticmethod
+    def _get_size(job: UrbanSprawlJob) -> int:
+        try:
+            return os.path.getsize(job.raster_path)
+        except OSError:
+            return 0
+
+    def _run_batch(self,
+                   indices: List[int],
+                   workers: int,
+                   directory: str,
+                   results: Dict[int, JobResult],
+                   log: Callable[[str], None]) -> List[int]:
+        with self._create_executor(workers) as executor:
+            futures = {executor.submit(_run_job,
+                                       self._jobs[index],
+                                       os.path.join(directory, f'{index}.started') if self._executor == JobRunner.PROCESS else None): index
+                       for index in indices}
+
+            for future in as_completed(futures):
+                job = self._jobs[futures[future]]
+
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    continue
+                except Exception as error:  # pylint: disable=broad-except
+                    result = JobResult(job.job_id, None, None, None, 0.0, f'{type(error).__name__}: {error}')
+
+                log(str(result))
+                results[futures[future]] = result
+
+        return [index for index in indices if index not in results]
+
+    def _run_isolated(self, index: int, directory: str, results: Dict[int, JobResult], log: Callable[[str], None]) -> None:
+        if self._run_batch([index], 1, directory, results, log):
+            results[index] = JobResult(self._jobs[index].job_id, None, None, None, 0.0, 'Worker process terminated unexpectedly')
+            log(str(results[index]))
+
+    def run(self, log: Callable[[str], None] = lambda _: None) -> List[JobResult]:
+        results: Dict[int, JobResult] = {}
+
+        for (index, job) in enumerate(self._jobs):
+            if job.error is not None:
+                results[index] = JobResult(job.job_id, None, None, None, 0.0, job.error)
+                log(str(results[index]))
+
+        pending = sorted((index for index in range(len(self._jobs)) if index not in results),
+                         key=lambda index: JobRunner._get_size(self._jobs[index]),
+                         reverse=True)
+
+        with tempfile.TemporaryDirectory(prefix='usl_jobs_') as directory:
+            while pending:
+                unfinished = self._run_batch(pending, self._workers, directory, results, log)
+                started = [index for index in unfinished if os.path.exists(os.path.join(directory, f'{index}.started'))]
+                pending = [index for index in unfinished if index not in started]
+
+                if unfinished:
+                    log(f'Worker process terminated, restarting the workers for {len(unfinished)} unfinished jobs')
+
+                if unfinished and not started:
+                    started, pending = pending, []
+
+                with ThreadPoolExecutor(self._workers) as executor:
+                    for future in [executor.submit(self._run_isolated, index, directory, results, log) for index in started]:
+                        future.result()
+
+        return [results[index] for index in range(len(self._jobs))]
+
+    @staticmethod
+    def save(path: str, results: List[JobResult]) -> None:
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            JobRunner.write(file, results)
+
+    @staticmethod
+    def write(file: TextIO, results: List[JobResult]) -> None:
+        writer = csv.DictWriter(file, fieldnames=JobResult.FIELDS)
+        writer.writeheader()
+        writer.writerows(result.to_dict() for result in results)
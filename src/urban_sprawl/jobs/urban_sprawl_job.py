@@ -0,0 +1,123 @@
+import csv
+import json
+import os
+from typing import Dict, List, Optional
+
+from ... import constants
+from ...urban_sprawl.common.raster_writer import RasterWriter
+from ...urban_sprawl.si.si_engine import SiEngine
+
+
+class UrbanSprawlJob:
+    def __init__(self, job_id: str, values: Dict[str, str], error: Optional[str] = None):
+        self._job_id = job_id
+        self._values = values
+        self._error = error
+
+    def __str__(self) -> str:
+        if self._error is not None:
+            return f'UrbanSprawlJob(id={self._job_id}, error={self._error})'
+
+        return f'UrbanSprawlJob(id={self._job_id}, raster={self.raster_path}, vector={self.vector_path})'
+
+    @staticmethod
+    def from_dict(row: object, index: int, directory: str) -> 'UrbanSprawlJob':
+        if not isinstance(row, dict):
+            return UrbanSprawlJob(str(index + 1), {}, f'Job {index + 1} is not an object')
+
+        values = {str(key).strip().lower(): str(value).strip() for (key, value) in row.items() if key and value is not None}
+        job_id = values.get('id') or str(index + 1)
+
+        missing = [key for key in ('raster', 'vector', 'residents', 'employees') if not values.get(key)]
+        if missing:
+            return UrbanSprawlJob(job_id, values, f'Job {index + 1} is missing {", ".join(missing)}')
+
+        for key in ('raster', 'vector', 'si_output'):
+            if values.get(key):
+                values[key] = os.path.join(directory, values[key])
+
+        return UrbanSprawlJob(job_id, values)
+
+    @staticmethod
+    def load(path: str) -> List['UrbanSprawlJob']:
+        with open(path, encoding='utf-8', newline='') as file:
+            if path.lower().endswith('.json'):
+                content = json.load(file)
+                rows = content['jobs'] if isinstance(content, dict) else content
+            else:
+                rows = list(csv.DictReader(file))
+
+        directory = os.path.dirname(os.path.abspath(path))
+        jobs = []
+        job_ids = set()
+
+        for (index, row) in enumerate(rows):
+            job = UrbanSprawlJob.from_dict(row, index, directory)
+
+            if job.job_id in job_ids:
+                job = UrbanSprawlJob(job.job_id, job.values, f'Job {index + 1} has the duplicate id {job.job_id}')
+
+            job_ids.add(job.job_id)
+            jobs.append(job)
+
+        return jobs
+
+    @property
+    def job_id(self) -> str:
+        return self._job_id
+
+    @property
+    def values(self) -> Dict[str, str]:
+        return self._values
+
+    @property
+    def error(self) -> Optional[str]:
+        return self._error
+
+    @property
+    def raster_path(self) -> str:
+        return self._values['raster']
+
+    @property
+    def vector_path(self) -> str:
+        return self._values['vector']
+
+    @property
+    def layer(self) -> Optional[str]:
+        return self._values.get('layer') or None
+
+    @property
+    def resident_count(self) -> int:
+        return int(self._values['residents'])
+
+    @property
+    def employee_count(self) -> int:
+        return int(self._values['employees'])
+
+    @property
+    def ssa_value(self) -> float:
+        return float(self._values.get('ssa') or constants.SSA_VALUE)
+
+    @property
+    def radius(self) -> int:
+        return int(self._values.get('radius') or constants.RADIUS_VALUE)
+
+    @property
+    def no_data_value(self) -> int:
+        return int(self._values.get('no_data') or constants.NO_DATA_VALUE)
+
+    @property
+    def build_up_value(self) -> int:
+        return int(self._values.get('build_up') or constants.BUILD_UP_VALUE)
+
+    @property
+    def engine(self) -> str:
+        return self._values.get('engine') or SiEngine.CONVOLUTION
+
+    @property
+    def si_output_path(self) -> Optional[str]:
+        return self._values.get('si_output') or None
+
+    @property
+    def output_format(self) -> str:
+        return self._values.get('output_format') or RasterWriter.FORMATS[constants.OUTPUT_FORMAT_VALUE]
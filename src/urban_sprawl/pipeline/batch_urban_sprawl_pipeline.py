@@ -0,0 +1,100 @@
+import math
+from typing import List, Optional
+
+import numpy
+
+from ...urban_sprawl.clip_raster.polygon_rasterizer import PolygonRasterizer
+from ...urban_sprawl.common.common import Common
+from ...urban_sprawl.common.dataset_cache import DatasetCache
+from ...urban_sprawl.common.progress_monitor import ProgressMonitor
+from ...urban_sprawl.pipeline.urban_sprawl_pipeline import UrbanSprawlResult
+from ...urban_sprawl.si.si_engine import SiEngine
+from ...urban_sprawl.wup.wup_calculator import WupCalculator
+
+
+class UrbanSprawlZone:
+    def __init__(self, wkt_geometry: str, resident_count: int, employee_count: int, ssa_value: float):
+        self._wkt_geometry = wkt_geometry
+        self._resident_count = resident_count
+        self._employee_count = employee_count
+        self._ssa_value = ssa_value
+
+    def __str__(self) -> str:
+        return f'UrbanSprawlZone(resident_count={self._resident_count}, employee_count={self._employee_count}, ' \
+               f'ssa_value={self._ssa_value})'
+
+    @property
+    def wkt_geometry(self) -> str:
+        return self._wkt_geometry
+
+    @property
+    def resident_employee_count(self) -> int:
+        return self._resident_count + self._employee_count
+
+    @property
+    def ssa_value(self) -> float:
+        return self._ssa_value
+
+
+class BatchUrbanSprawlPipeline:
+    def __init__(self,  # pylint: disable=too-many-positional-arguments
+                 raster_path: str,
+                 radius: int,
+                 no_data_value: int,
+                 build_up_value: int,
+                 engine: str,
+                 progress: Optional[ProgressMonitor] = None):
+        self._raster_path = raster_path
+        self._radius = radius
+        self._no_data_value = no_data_value
+        self._build_up_value = build_up_value
+        self._engine = engine
+        self._progress = progress or ProgressMonitor()
+
+    def calculate(self, zones: List[UrbanSprawlZone]) -> List[UrbanSprawlResult]:
+        raster = DatasetCache.open(self._raster_path)
+        mask = Common.get_mask_from_path(self._raster_path, self._build_up_value)
+
+        zone_masks = []
+        clipped_mask = numpy.zeros(mask.shape, dtype=bool)
+        with self._progress.sub_range(0, 10):
+            for (index, zone) in enumerate(zones):
+                (window, labels) = PolygonRasterizer.rasterize_window(raster, [zone.wkt_geometry])
+                zone_masks.append((window, labels > 0))
+                clipped_mask[window.slices] |= labels > 0
+                self._progress.update(index + 1, len(zones))
+
+        clipped_mask &= mask
+
+        si_calculator = SiEngine.create(self._engine,
+                                        self._raster_path,
+                                        None,
+                                        self._radius,
+                                        self._no_data_value,
+                                        self._build_up_value)
+        si_calculator.progress = self._progress
+        with self._progress.sub_range(10, 95):
+            si_matrix = si_calculator.calculate_matrix(mask, clipped_mask)
+
+        results = []
+        for (zone, (window, zone_mask)) in zip(zones, zone_masks):
+            si_values = si_matrix[window.slices][zone_mask]
+            si_values = si_values[si_values > 0]
+
+            dis = float(numpy.mean(si_values, dtype=numpy.float64)) if si_values.size > 0 else math.nan
+            build_up_area = float(numpy.count_nonzero(clipped_mask[window.slices][zone_mask]) * si_calculator.pixel_size ** 2)
+            if zone.resident_employee_count > 0:
+                lup = build_up_area / zone.resident_employee_count
+            else:
+                lup = math.nan
+
+            if math.isnan(dis) or math.isnan(lup) or lup <= 0 or not 0 <= zone.ssa_value <= 1:
+                wup = math.nan
+            else:
+                wup = WupCalculator.calculate(dis, lup, zone.ssa_value)
+
+            results.append(UrbanSprawlResult(dis, lup, wup, None, build_up_area))
+
+        self._progress.update(100, 100)
+
+        return results
@@ -0,0 +1,107 @@
+import math
+from typing import List, Optional
+
+
+from ...urban_sprawl.clip_raster.polygon_rasterizer import PolygonRasterizer
+from ...urban_sprawl.common.dataset_cache import DatasetCache
+from ...urban_sprawl.pipeline.urban_sprawl_pipeline import UrbanSprawlResult
+from ...urban_sprawl.si.convolution_si_calculator import ConvolutionSiCalculator
+from ...urban_sprawl.si.incremental_si_calculator import IncrementalSiCalculator
+from ...urban_sprawl.wup.wup_calculator import WupCalculator
+
+
+class UrbanSprawlEpoch:
+    def __init__(self, raster_path: str, resident_count: int, employee_count: int, ssa_value: float):
+        self._raster_path = raster_path
+        self._resident_count = resident_count
+        self._employee_count = employee_count
+        self._ssa_value = ssa_value
+
+    def __str__(self) -> str:
+        return f'UrbanSprawlEpoch(raster_path={self._raster_path}, resident_count={self._resident_count}, ' \
+               f'employee_count={self._employee_count}, ssa_value={self._ssa_value})'
+
+    @property
+    def raster_path(self) -> str:
+        return self._raster_path
+
+    @property
+    def resident_employee_count(self) -> int:
+        return self._resident_count + self._employee_count
+
+    @property
+    def ssa_value(self) -> float:
+        return self._ssa_value
+
+
+class TimeSeriesUrbanSprawlPipeline:
+    def __init__(self,
+                 wkt_geometries: List[str],
+                 radius: int,
+                 no_data_value: int,
+                 build_up_value: int):
+        self._wkt_geometries = wkt_geometries
+        self._radius = radius
+        self._no_data_value = no_data_value
+        self._build_up_value = build_up_value
+
+        self._changed_counts: List[int] = []
+
+    @property
+    def changed_counts(self) -> List[int]:
+        return self._changed_counts
+
+    def calculate(self, epochs: List[UrbanSprawlEpoch]) -> List[UrbanSprawlResult]:
+        self._changed_counts = []
+
+        if not epochs:
+            return []
+
+        reference = DatasetCache.open(epochs[0].raster_path)
+        mask = PolygonRasterizer.rasterize(reference, self._wkt_geometries)
+
+        si_calculator = ConvolutionSiCalculator(epochs[0].raster_path,
+                                                None,
+                                                self._radius,
+                                                self._no_data_value,
+                                                self._build_up_value)
+
+        incremental_si_calculator: Optional[IncrementalSiCalculator] = None
+
+        results = []
+        for epoch in epochs:
+            raster = DatasetCache.open(epoch.raster_path)
+            if (raster.RasterXSize, raster.RasterYSize, raster.GetGeoTransform()) != \
+                    (reference.RasterXSize, reference.RasterYSize, reference.GetGeoTransform()):
+                raise ValueError(f'Raster {epoch.raster_path} is not on the grid of {epochs[0].raster_path}')
+
+            matrix = raster.GetRasterBand(1).ReadAsArray()
+
+            if incremental_si_calculator is None:
+                incremental_si_calculator = IncrementalSiCalculator(si_calculator, matrix, mask)
+                self._changed_counts.append(0)
+            else:
+                self._changed_counts.append(incremental_si_calculator.update_matrix(matrix))
+
+            results.append(self._get_result(incremental_si_calculator, epoch))
+
+        return results
+
+    @staticmethod
+    def _get_result(incremental_si_calculator: IncrementalSiCalculator, epoch: UrbanSprawlEpoch) -> UrbanSprawlResult:
+        try:
+            dis = incremental_si_calculator.dis
+        except ValueError:
+            dis = math.nan
+
+        if epoch.resident_employee_count > 0:
+            lup = incremental_si_calculator.build_up_area / epoch.resident_employee_count
+        else:
+            lup = math.nan
+
+        if math.isnan(dis) or math.isnan(lup) or lup <= 0 or not 0 <= epoch.ssa_value <= 1:
+            wup = math.nan
+        else:
+            wup = WupCalculator.calculate(dis, lup, epoch.ssa_value)
+
+        return UrbanSprawlResult(float(dis), float(lup), wup, None, float(incremental_si_calculator.build_up_area))
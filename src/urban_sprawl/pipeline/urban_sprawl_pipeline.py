@@ -0,0 +1,165 @@
+from typing import List, Optional
+
+import numpy
+from osgeo import gdal
+
+from ...urban_sprawl.clip_raster.polygon_rasterizer import PolygonRasterizer
+from ...urban_sprawl.common.block_reducer import BlockReducer
+from ...urban_sprawl.common.common import Common
+from ...urban_sprawl.common.dataset_cache import DatasetCache
+from ...urban_sprawl.common.progress_monitor import ProgressMonitor
+from ...urban_sprawl.common.raster_window import RasterWindow
+from ...urban_sprawl.common.stage_metrics import StageMetrics
+from ...urban_sprawl.si.si_calculator import SiCalculator
+from ...urban_sprawl.si.si_engine import SiEngine
+from ...urban_sprawl.si.tiled_si_calculator import TiledSiCalculator
+from ...urban_sprawl.wup.wup_calculator import WupCalculator
+
+
+class UrbanSprawlResult:
+    def __init__(self,  # pylint: disable=too-many-positional-arguments
+                 dis: float,
+                 lup: float,
+                 wup: float,
+                 si_matrix: Optional[numpy.ndarray],
+                 build_up_area: float = 0.0,
+                 si_window: Optional[RasterWindow] = None):
+        self._dis = dis
+        self._lup = lup
+        self._wup = wup
+        self._si_matrix = si_matrix
+        self._build_up_area = build_up_area
+        self._si_window = si_window
+
+    def __str__(self) -> str:
+        return f'UrbanSprawlResult(dis={self._dis}, lup={self._lup}, wup={self._wup})'
+
+    @property
+    def dis(self) -> float:
+        return self._dis
+
+    @property
+    def lup(self) -> float:
+        return self._lup
+
+    @property
+    def wup(self) -> float:
+        return self._wup
+
+    @property
+    def si_matrix(self) -> Optional[numpy.ndarray]:
+        return self._si_matrix
+
+    @property
+    def build_up_area(self) -> float:
+        return self._build_up_area
+
+    @property
+    def si_window(self) -> Optional[RasterWindow]:
+        return self._si_window
+
+
+class UrbanSprawlPipeline:
+    def __init__(self,  # pylint: disable=too-many-positional-arguments
+                 raster_path: str,
+                 wkt_geometries: List[str],
+                 radius: int,
+                 no_data_value: int,
+                 build_up_value: int,
+                 engine: str,
+                 metrics: Optional[StageMetrics] = None,
+                 progress: Optional[ProgressMonitor] = None,
+                 memory_budget: int = 0):
+        self._raster_path = raster_path
+        self._wkt_geometries = wkt_geometries
+        self._radius = radius
+        self._no_data_value = no_data_value
+        self._build_up_value = build_up_value
+        self._engine = engine
+        self._metrics = metrics or StageMetrics()
+        self._progress = progress or ProgressMonitor()
+        self._memory_budget = memory_budget
+
+    def calculate(self, resident_count: int, employee_count: int, ssa_value: float) -> UrbanSprawlResult:
+        resident_employee_count = resident_count + employee_count
+        if resident_employee_count <= 0:
+            raise ValueError('Sum of resident and employee count can not equal 0 or less')
+
+        raster = DatasetCache.open(self._raster_path)
+
+        with self._metrics.measure('Clip') as record:
+            (polygon_window, labels) = PolygonRasterizer.rasterize_window(raster, self._wkt_geometries)
+            clipped_mask = labels > 0
+            clipped_mask &= Common.get_mask_from_path(self._raster_path, self._build_up_value, window=polygon_window)
+            record.add_cells(clipped_mask.size)
+            record.add_bytes_read(clipped_mask.size * gdal.GetDataTypeSize(raster.GetRasterBand(1).DataType) // 8)
+
+        clipped_window = Common.get_mask_window(clipped_mask)
+        if clipped_window.is_empty():
+            raise ValueError('Si Values cant be found')
+
+        region = RasterWindow(polygon_window.row_start + clipped_window.row_start,
+                              polygon_window.column_start + clipped_window.column_start,
+                              clipped_window.rows,
+                              clipped_window.columns)
+
+        si_calculator = SiEngine.create(self._engine,
+                                        self._raster_path,
+                                        None,
+                                        self._radius,
+                                        self._no_data_value,
+                                        self._build_up_value)
+        si_calculator.progress = self._progress
+
+        read_window = region.expand(si_calculator.offset, raster.RasterYSize, raster.RasterXSize)
+        with self._metrics.measure('SI calculation', read_window.rows * read_window.columns), self._progress.sub_range(0, 90):
+            if 0 < self._memory_budget < read_window.rows * read_window.columns * TiledSiCalculator.BYTES_PER_CELL:
+                si_matrix = self._calculate_tiled(si_calculator, region, clipped_mask, polygon_window)
+            else:
+                si_matrix = self._calculate_window(si_calculator, region, read_window, clipped_mask, polygon_window)
+
+        with self._metrics.measure('DIS reduction', si_matrix.size):
+            si_statistics = BlockReducer.reduce_matrix(si_matrix, si_calculator.pixel_size, lambda values: values > 0)
+
+        if si_statistics.count == 0:
+            raise ValueError('Si Values cant be found')
+
+        dis = si_statistics.sum / si_statistics.count
+
+        self._progress.update(95, 100)
+
+        with self._metrics.measure('LUP reduction', clipped_mask.size):
+            build_up_area = BlockReducer.reduce_matrix(clipped_mask, si_calculator.pixel_size, lambda values: values).area
+        self._progress.update(100, 100)
+        lup = build_up_area / resident_employee_count
+
+        return UrbanSprawlResult(dis, lup, WupCalculator.calculate(dis, lup, ssa_value), si_matrix, build_up_area, region)
+
+    def _calculate_window(self,
+                          si_calculator: SiCalculator,
+                          region: RasterWindow,
+                          read_window: RasterWindow,
+                          clipped_mask: numpy.ndarray,
+                          polygon_window: RasterWindow) -> numpy.ndarray:
+        mask = Common.get_mask_from_path(self._raster_path, self._build_up_value, window=read_window)
+
+        read_clipped_mask = numpy.zeros(mask.shape, dtype=bool)
+        read_clipped_mask[region.relative_to(read_window).slices] = clipped_mask[region.relative_to(polygon_window).slices]
+
+        return si_calculator.calculate_matrix(mask, read_clipped_mask)[region.relative_to(read_window).slices]
+
+    def _calculate_tiled(self,
+                         si_calculator: SiCalculator,
+                         region: RasterWindow,
+                         clipped_mask: numpy.ndarray,
+                         polygon_window: RasterWindow) -> numpy.ndarray:
+        si_matrix = numpy.full((region.rows, region.columns), fill_value=self._no_data_value, dtype=numpy.float32)
+
+        tiles = TiledSiCalculator(si_calculator, self._memory_budget).calculate_tiles(
+            region,
+            lambda window: clipped_mask[window.relative_to(polygon_window).slices]
+        )
+        for (window, tile) in tiles:
+            si_matrix[window.relative_to(region).slices] = tile
+
+        return si_matrix
@@ -0,0 +1,94 @@
+from functools import lru_cache
+from typing import Callable, Tuple
+
+import numpy
+
+from ...urban_sprawl.si.si_calculator import SiCalculator
+from ...urban_sprawl.si.si_kernel import SiKernel
+
+
+def _accumulate_vectorized(padded_mask: numpy.ndarray,  # pylint: disable=too-many-positional-arguments
+                           center_rows: numpy.ndarray,
+                           center_columns: numpy.ndarray,
+                           offset_rows: numpy.ndarray,
+                           offset_columns: numpy.ndarray,
+                           offset_weights: numpy.ndarray) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    distance_sums = numpy.zeros(center_rows.size, dtype=numpy.float64)
+    counts = numpy.zeros(center_rows.size, dtype=numpy.int64)
+
+    for (offset_row, offset_column, offset_weight) in zip(offset_rows, offset_columns, offset_weights):
+        hits = padded_mask[center_rows + offset_row, center_columns + offset_column]
+        counts += hits
+        distance_sums += offset_weight * hits
+
+    return distance_sums, counts
+
+
+@lru_cache(maxsize=1)
+def _get_accumulate() -> Callable[..., Tuple[numpy.ndarray, numpy.ndarray]]:
+    try:
+        from ...urban_sprawl.si.numba_accumulator import accumulate
+    except ImportError:
+        return _accumulate_vectorized
+
+    kernel = SiKernel(1, 1.0)
+    centers = numpy.full(1, kernel.offset, dtype=numpy.intp)
+    try:
+        accumulate(numpy.zeros((2 * kernel.offset + 1, 2 * kernel.offset + 1), dtype=numpy.uint8),
+                   centers,
+                   centers,
+                   kernel.offset_rows,
+                   kernel.offset_columns,
+                   kernel.offset_weights)
+    except Exception:  # pylint: disable=broad-except
+        return _accumulate_vectorized
+
+    return accumulate
+
+
+class CompiledSiCalculator(SiCalculator):
+    CENTERS_PER_CHUNK = 16_384
+
+    @staticmethod
+    def is_compiled() -> bool:
+        return _get_accumulate() is not _accumulate_vectorized
+
+    def calculate_matrix(self, matrix: numpy.ndarray, clipped_matrix: numpy.ndarray) -> numpy.ndarray:
+        result_matrix = numpy.full(clipped_matrix.shape, fill_value=self._no_data_value, dtype=numpy.float32)
+
+        (center_rows, center_columns) = numpy.nonzero(self._get_mask(clipped_matrix))
+
+        if center_rows.size == 0:
+            return result_matrix
+
+        kernel = SiKernel.get(self._radius, self._pixel_size)
+        offset = kernel.offset
+
+        row_start = max(0, int(center_rows.min()) - offset)
+        row_end = min(matrix.shape[0], int(center_rows.max()) + offset + 1)
+        column_start = max(0, int(center_columns.min()) - offset)
+        column_end = min(matrix.shape[1], int(center_columns.max()) + offset + 1)
+
+        padded_mask = numpy.zeros((row_end - row_start + 2 * offset, column_end - column_start + 2 * offset), dtype=numpy.uint8)
+        padded_mask[offset:offset + row_end - row_start, offset:offset + column_end - column_start] = \
+            self._get_mask(matrix[row_start:row_end, column_start:column_end])
+
+        chunk_size = CompiledSiCalculator.CENTERS_PER_CHUNK
+
+        for chunk_start in range(0, center_rows.size, chunk_size):
+            rows = center_rows[chunk_start:chunk_start + chunk_size]
+            columns = center_columns[chunk_start:chunk_start + chunk_size]
+
+            (distance_sums, counts) = _get_accumulate()(padded_mask,
+                                                        rows - row_start + offset,
+                                                        columns - column_start + offset,
+                                                        kernel.offset_rows,
+                                                        kernel.offset_columns,
+                                                        kernel.offset_weights)
+
+            found = counts > 0
+            result_matrix[rows[found], columns[found]] = (distance_sums[found] + self._wcc) / counts[found]
+
+            self._progress.update(min(center_rows.size, chunk_start + chunk_size), center_rows.size)
+
+        return result_matrix
@@ -0,0 +1,137 @@
+from typing import Iterator, List, Tuple
+
+import numpy
+
+from ...urban_sprawl.si.si_calculator import SiCalculator
+from ...urban_sprawl.si.si_kernel import SiKernel
+
+
+class ConvolutionSiCalculator(SiCalculator):
+    MIN_BLOCK_ROWS = 256
+
+    @staticmethod
+    def _fast_length(length: int) -> int:
+        best = 1
+        while best < length:
+            best *= 2
+
+        power5 = 1
+        while power5 < best:
+            power35 = power5
+            while power35 < best:
+                candidate = power35
+                while candidate < length:
+                    candidate *= 2
+
+                best = min(best, candidate)
+                power35 *= 3
+            power5 *= 5
+
+        return best
+
+    @staticmethod
+    def _get_spectra(kernel: SiKernel, shape: Tuple[int, int], offset: int) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        padding = offset - kernel.offset
+
+        return (numpy.fft.rfft2(numpy.pad(kernel.weights, padding), s=shape),
+                numpy.fft.rfft2(numpy.pad(kernel.counts, padding), s=shape))
+
+    def calculate_sums(self,
+                       matrix: numpy.ndarray,
+                       rows: Tuple[int, int],
+                       columns: Tuple[int, int]) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        return self._convolve(matrix, rows, columns, [SiKernel.get(self._radius, self._pixel_size)])[0]
+
+    def _convolve(self,
+                  matrix: numpy.ndarray,
+                  rows: Tuple[int, int],
+                  columns: Tuple[int, int],
+                  kernels: List[SiKernel]) -> List[Tuple[numpy.ndarray, numpy.ndarray]]:
+        (row_start, row_end) = rows
+        shape = (row_end - row_start, columns[1] - columns[0])
+
+        sums = [(numpy.zeros(shape, dtype=numpy.float64), numpy.zeros(shape, dtype=numpy.int64)) for _ in kernels]
+
+        for (block_start, block_end, block_sums) in self._convolve_blocks(matrix, rows, columns, kernels):
+            for ((distance_sums, counts), (block_distance_sums, block_counts)) in zip(sums, block_sums):
+                distance_sums[block_start - row_start:block_end - row_start] = block_distance_sums
+                counts[block_start - row_start:block_end - row_start] = block_counts
+
+        return sums
+
+    def _convolve_blocks(self,
+                         matrix: numpy.ndarray,
+                         rows: Tuple[int, int],
+                         columns: Tuple[int, int],
+                         kernels: List[SiKernel]) -> Iterator[Tuple[int, int, List[Tuple[numpy.ndarray, numpy.ndarray]]]]:
+        offset = max(kernel.offset for kernel in kernels)
+
+        (row_start, row_end) = rows
+        (column_start, column_end) = columns
+        (matrix_rows, matrix_columns) = matrix.shape
+
+        block_rows = min(row_end - row_start, max(2 * offset, ConvolutionSiCalculator.MIN_BLOCK_ROWS))
+        block_columns = column_end - column_start
+
+        fft_shape = (ConvolutionSiCalculator._fast_length(block_rows + 4 * offset),
+                     ConvolutionSiCalculator._fast_length(block_columns + 4 * offset))
+        spectra = [ConvolutionSiCalculator._get_spectra(kernel, fft_shape, offset) for kernel in kernels]
+
+        source_column_start = max(0, column_start - offset)
+        source_column_end = min(matrix_columns, column_end + offset)
+
+        extended = numpy.empty((block_rows + 2 * offset, block_columns + 2 * offset), dtype=numpy.float64)
+
+        for block_start in range(row_start, row_end, block_rows):
+            block_end = min(row_end, block_start + block_rows)
+
+            source_row_start = max(0, block_start - offset)
+            source_row_end = min(matrix_rows, block_end + offset)
+
+            extended.fill(0)
+
+            # @formatter:off
+            extended[source_row_start - block_start + offset:source_row_end - block_start + offset,
+                     source_column_start - column_start + offset:source_column_end - column_start + offset] = \
+                self._get_mask(matrix[source_row_start:source_row_end, source_column_start:source_column_end])
+            # @formatter:on
+
+            spectrum = numpy.fft.rfft2(extended, s=fft_shape)
+            core = (slice(2 * offset, 2 * offset + block_end - block_start), slice(2 * offset, 2 * offset + block_columns))
+
+            yield block_start, block_end, [(numpy.fft.irfft2(spectrum * weights_spectrum, s=fft_shape)[core],
+                                            numpy.rint(numpy.fft.irfft2(spectrum * counts_spectrum, s=fft_shape)[core]))
+                                           for (weights_spectrum, counts_spectrum) in spectra]
+
+            self._progress.update(block_end - row_start, row_end - row_start)
+
+    def calculate_matrix(self, matrix: numpy.ndarray, clipped_matrix: numpy.ndarray) -> numpy.ndarray:
+        return self._calculate_matrices(matrix, clipped_matrix, [SiKernel.get(self._radius, self._pixel_size)])[0]
+
+    def _calculate_matrices(self,
+                            matrix: numpy.ndarray,
+                            clipped_matrix: numpy.ndarray,
+                            kernels: List[SiKernel]) -> List[numpy.ndarray]:
+        clipped_mask = self._get_mask(clipped_matrix)
+        result_matrices = [numpy.full(clipped_matrix.shape, fill_value=self._no_data_value, dtype=numpy.float32)
+                           for _ in kernels]
+
+        center_rows = numpy.flatnonzero(clipped_mask.any(axis=1))
+        center_columns = numpy.flatnonzero(clipped_mask.any(axis=0))
+
+        if center_rows.size == 0:
+            return result_matrices
+
+        columns = slice(int(center_columns[0]), int(center_columns[-1]) + 1)
+
+        for (block_start, block_end, block_sums) in self._convolve_blocks(matrix,
+                                                                          (int(center_rows[0]), int(center_rows[-1]) + 1),
+                                                                          (columns.start, columns.stop),
+                                                                          kernels):
+            centers = clipped_mask[block_start:block_end, columns]
+
+            for (result_matrix, (distance_sums, counts)) in zip(result_matrices, block_sums):
+                found = centers & (counts > 0)
+                result_matrix[block_start:block_end, columns][found] = (distance_sums[found] + self._wcc) / counts[found]
+
+        return result_matrices
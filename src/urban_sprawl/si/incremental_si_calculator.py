@@ -0,0 +1,197 @@
+from typing import Optional, Tuple
+
+import numpy
+
+from ...urban_sprawl.common.raster_window import RasterWindow
+from ...urban_sprawl.si.convolution_si_calculator import ConvolutionSiCalculator
+from ...urban_sprawl.si.si_kernel import SiKernel
+from ...urban_sprawl.wup.wup_calculator import WupCalculator
+
+
+class IncrementalSiCalculator:  # pylint: disable=too-many-instance-attributes
+    FULL_UPDATE_RATIO = 32
+
+    def __init__(self,
+                 si_calculator: ConvolutionSiCalculator,
+                 matrix: numpy.ndarray,
+                 clip_mask: numpy.ndarray,
+                 sums: Optional[Tuple[numpy.ndarray, numpy.ndarray]] = None):
+        self._si_calculator = si_calculator
+        self._kernel = SiKernel.get(si_calculator.radius, si_calculator.pixel_size)
+        self._kernel_counts = self._kernel.counts.astype(numpy.int64)
+
+        self._matrix = matrix.copy()
+        self._clip_mask = clip_mask
+
+        (rows, columns) = numpy.nonzero(clip_mask)
+        if rows.size == 0:
+            self._window = RasterWindow(0, 0, 0, 0)
+        else:
+            self._window = RasterWindow(int(rows.min()), int(columns.min()),
+                                        int(rows.max() - rows.min()) + 1, int(columns.max() - columns.min()) + 1)
+
+        if sums is None:
+            (self._distance_sums, self._counts) = self._calculate_sums()
+        elif sums[0].shape != (self._window.rows, self._window.columns) or sums[1].shape != sums[0].shape:
+            raise ValueError('Distance sums do not match the clipped build up area')
+        else:
+            (self._distance_sums, self._counts) = (sums[0].astype(numpy.float64), sums[1].astype(numpy.int64))
+
+        self._si_matrix = numpy.full(matrix.shape, fill_value=si_calculator.no_data_value, dtype=numpy.float32)
+        self._si_sum = 0.0
+        self._si_count = 0
+        self._update_si(self._window)
+
+        self._build_up_count = int(numpy.count_nonzero(self._is_build_up(self._matrix) & clip_mask))
+
+    @property
+    def matrix(self) -> numpy.ndarray:
+        return self._matrix
+
+    @property
+    def si_matrix(self) -> numpy.ndarray:
+        return self._si_matrix
+
+    @property
+    def window(self) -> RasterWindow:
+        return self._window
+
+    @property
+    def sums(self) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        return self._distance_sums, self._counts
+
+    @property
+    def dis(self) -> float:
+        if self._si_count == 0:
+            raise ValueError('Si Values cant be found')
+
+        return self._si_sum / self._si_count
+
+    @property
+    def build_up_area(self) -> float:
+        return self._build_up_count * self._si_calculator.pixel_size ** 2
+
+    def get_lup(self, resident_count: int, employee_count: int) -> float:
+        resident_employee_count = resident_count + employee_count
+        if resident_employee_count <= 0:
+            raise ValueError('Sum of resident and employee count can not equal 0 or less')
+
+        return self.build_up_area / resident_employee_count
+
+    def get_wup(self, resident_count: int, employee_count: int, ssa_value: float) -> float:
+        return WupCalculator.calculate(self.dis, self.get_lup(resident_count, employee_count), ssa_value)
+
+    def save_sums(self, path: str) -> None:
+        with open(path, 'wb') as file:
+            numpy.savez(file,
+                        distance_sums=self._distance_sums,
+                        counts=self._counts,
+                        kernel=numpy.array([self._si_calculator.radius, self._si_calculator.pixel_size]))
+
+    @staticmethod
+    def load_sums(path: str, si_calculator: ConvolutionSiCalculator) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        with numpy.load(path) as sums:
+            if tuple(sums['kernel']) != (si_calculator.radius, si_calculator.pixel_size):
+                raise ValueError(f'Distance sums in {path} were calculated for another horizon of perception or pixel size')
+
+            return sums['distance_sums'], sums['counts']
+
+    def _calculate_sums(self) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        if self._window.is_empty():
+            return numpy.zeros((0, 0), dtype=numpy.float64), numpy.zeros((0, 0), dtype=numpy.int64)
+
+        return self._si_calculator.calculate_sums(
+            self._matrix,
+            (self._window.row_start, self._window.row_start + self._window.rows),
+            (self._window.column_start, self._window.column_start + self._window.columns)
+        )
+
+    def _is_build_up(self, matrix: numpy.ndarray) -> numpy.ndarray:
+        return matrix == self._si_calculator.build_up_value
+
+    def update_matrix(self, matrix: numpy.ndarray) -> int:
+        (rows, columns) = numpy.nonzero(self._is_build_up(matrix) != self._is_build_up(self._matrix))
+        self._matrix[...] = matrix
+
+        if self._window.is_empty():
+            return int(rows.size)
+
+        if rows.size * self._kernel.counts.size > IncrementalSiCalculator.FULL_UPDATE_RATIO * self._distance_sums.size:
+            (self._distance_sums, self._counts) = self._calculate_sums()
+            self._build_up_count = int(numpy.count_nonzero(self._is_build_up(self._matrix) & self._clip_mask))
+            self._update_si(self._window)
+        else:
+            self._update_cells(rows, columns)
+
+        return int(rows.size)
+
+    def update(self, rows: numpy.ndarray, columns: numpy.ndarray, values: numpy.ndarray) -> int:
+        (indices, positions) = numpy.unique(numpy.ravel_multi_index((rows[::-1], columns[::-1]), self._matrix.shape), return_index=True)
+        (rows, columns) = numpy.divmod(indices, self._matrix.shape[1])
+        values = values[::-1][positions]
+
+        changed = self._is_build_up(values) != self._is_build_up(self._matrix[rows, columns])
+        self._matrix[rows, columns] = values
+
+        self._update_cells(rows[changed], columns[changed])
+
+        return int(numpy.count_nonzero(changed))
+
+    def _update_cells(self, rows: numpy.ndarray, columns: numpy.ndarray) -> None:
+        if rows.size == 0 or self._window.is_empty():
+            return
+
+        offset = self._kernel.offset
+        deltas = numpy.where(self._is_build_up(self._matrix[rows, columns]), 1, -1)
+
+        self._build_up_count += int(numpy.sum(deltas[self._clip_mask[rows, columns]]))
+
+        window_rows = rows - self._window.row_start
+        window_columns = columns - self._window.column_start
+
+        for (row, column, delta) in zip(window_rows, window_columns, deltas):
+            row_start = max(0, row - offset)
+            row_end = min(self._window.rows, row + offset + 1)
+            column_start = max(0, column - offset)
+            column_end = min(self._window.columns, column + offset + 1)
+
+            if row_start >= row_end or column_start >= column_end:
+                continue
+
+            kernel_slices = (slice(row_start - row + offset, row_end - row + offset),
+                             slice(column_start - column + offset, column_end - column + offset))
+
+            self._distance_sums[row_start:row_end, column_start:column_end] += delta * self._kernel.weights[kernel_slices]
+            self._counts[row_start:row_end, column_start:column_end] += delta * self._kernel_counts[kernel_slices]
+
+        row_start = max(0, int(window_rows.min()) - offset)
+        row_end = min(self._window.rows, int(window_rows.max()) + offset + 1)
+        column_start = max(0, int(window_columns.min()) - offset)
+        column_end = min(self._window.columns, int(window_columns.max()) + offset + 1)
+
+        if row_start < row_end and column_start < column_end:
+            self._update_si(RasterWindow(self._window.row_start + row_start,
+                                         self._window.column_start + column_start,
+                                         row_end - row_start,
+                                         column_end - column_start))
+
+    def _update_si(self, window: RasterWindow) -> None:
+        old_si_matrix = self._si_matrix[window.slices]
+        old_selection = old_si_matrix > 0
+        self._si_sum -= float(numpy.sum(old_si_matrix, where=old_selection, dtype=numpy.float64))
+        self._si_count -= int(numpy.count_nonzero(old_selection))
+
+        local_slices = (slice(window.row_start - self._window.row_start, window.row_start - self._window.row_start + window.rows),
+                        slice(window.column_start - self._window.column_start,
+                              window.column_start - self._window.column_start + window.columns))
+
+        counts = self._counts[local_slices]
+        centers = self._is_build_up(self._matrix[window.slices]) & self._clip_mask[window.slices] & (counts > 0)
+
+        si_matrix = numpy.full((window.rows, window.columns), fill_value=self._si_calculator.no_data_value, dtype=numpy.float32)
+        si_matrix[centers] = (self._distance_sums[local_slices][centers] + self._si_calculator.wcc) / counts[centers]
+        self._si_matrix[window.slices] = si_matrix
+
+        selection = si_matrix > 0
+        self._si_sum += float(numpy.sum(si_matrix, where=selection, dtype=numpy.float64))
+        self._si_count += int(numpy.count_nonzero(selection))
@@ -0,0 +1,41 @@
+from typing import List, Optional
+
+import numpy
+
+from ...urban_sprawl.common.common import Common
+from ...urban_sprawl.si.convolution_si_calculator import ConvolutionSiCalculator
+from ...urban_sprawl.si.si_kernel import SiKernel
+
+
+class MultiRadiusSiCalculator(ConvolutionSiCalculator):
+    def __init__(self,
+                 raster_path: str,
+                 clipped_raster_path: Optional[str],
+                 radii: List[int],
+                 no_data_value: int,
+                 build_up_value: int):
+        if not radii:
+            raise ValueError('At least one horizon of perception is required')
+
+        self._radii = sorted(set(radii))
+
+        super().__init__(raster_path, clipped_raster_path, self._radii[-1], no_data_value, build_up_value)
+
+    @property
+    def radii(self) -> List[int]:
+        return self._radii
+
+    def calculate_all(self) -> List[numpy.ndarray]:
+        window = self.get_read_window()
+        matrix = Common.get_mask_from_path(self._raster_path, self._build_up_value, window=window)
+        clipped_matrix = Common.get_mask_from_path(self.clipped_raster_path, self._build_up_value, window=window)
+
+        if window.is_empty():
+            return [self.get_output_matrix(matrix, window) for _ in self._radii]
+
+        return [self.get_output_matrix(si_matrix, window) for si_matrix in self.calculate_matrices(matrix, clipped_matrix)]
+
+    def calculate_matrices(self, matrix: numpy.ndarray, clipped_matrix: numpy.ndarray) -> List[numpy.ndarray]:
+        return self._calculate_matrices(matrix,
+                                        clipped_matrix,
+                                        [SiKernel.get(radius, self._pixel_size) for radius in self._radii])
@@ -0,0 +1,33 @@
+from typing import Tuple
+
+import numba
+import numpy
+
+
+def _accumulate(padded_mask: numpy.ndarray,  # pylint: disable=too-many-positional-arguments
+                center_rows: numpy.ndarray,
+                center_columns: numpy.ndarray,
+                offset_rows: numpy.ndarray,
+                offset_columns: numpy.ndarray,
+                offset_weights: numpy.ndarray) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    distance_sums = numpy.zeros(center_rows.size, dtype=numpy.float64)
+    counts = numpy.zeros(center_rows.size, dtype=numpy.int64)
+
+    for index in numba.prange(center_rows.size):  # pylint: disable=not-an-iterable
+        row = center_rows[index]
+        column = center_columns[index]
+
+        distance_sum = 0.0
+        count = 0
+        for offset_index in range(offset_rows.size):
+            if padded_mask[row + offset_rows[offset_index], column + offset_columns[offset_index]]:
+                distance_sum += offset_weights[offset_index]
+                count += 1
+
+        distance_sums[index] = distance_sum
+        counts[index] = count
+
+    return distance_sums, counts
+
+
+accumulate = numba.njit(parallel=True, nogil=True)(_accumulate)
@@ -0,0 +1,141 @@
+import atexit
+import multiprocessing
+import os
+import sys
+import tempfile
+from multiprocessing.pool import IMapIterator, Pool
+from typing import List, Optional, Tuple
+
+import numpy
+
+from ...urban_sprawl.common.common import Common
+from ...urban_sprawl.common.progress_monitor import CanceledError
+from ...urban_sprawl.common.raster_window import RasterWindow
+from ...urban_sprawl.si.si_calculator import SiCalculator
+
+
+def _calculate_stripe(si_calculator: SiCalculator,  # pylint: disable=too-many-positional-arguments
+                      matrix_path: str,
+                      clipped_matrix_path: str,
+                      result_path: str,
+                      row_start: int,
+                      row_end: int) -> None:
+    matrix = numpy.load(matrix_path, mmap_mode='r')
+    clipped_matrix = numpy.load(clipped_matrix_path, mmap_mode='r')
+    result_matrix = numpy.load(result_path, mmap_mode='r+')
+
+    halo_row_start = max(0, row_start - si_calculator.offset)
+    halo_row_end = min(matrix.shape[0], row_end + si_calculator.offset)
+    core = slice(row_start - halo_row_start, row_end - halo_row_start)
+
+    clipped_stripe = numpy.zeros((halo_row_end - halo_row_start, matrix.shape[1]), dtype=bool)
+    clipped_stripe[core] = clipped_matrix[row_start:row_end]
+
+    result_matrix[row_start:row_end] = si_calculator.calculate_matrix(matrix[halo_row_start:halo_row_end], clipped_stripe)[core]
+    result_matrix.flush()
+
+
+def _calculate_stripe_arguments(arguments: Tuple[SiCalculator, str, str, str, int, int]) -> None:
+    _calculate_stripe(*arguments)
+
+
+class ParallelSiCalculator:
+    STRIPES_PER_PROCESS = 2
+    POLL_INTERVAL = 0.5
+
+    _pool: Optional[Pool] = None
+    _pool_processes = 0
+
+    def __init__(self, si_calculator: SiCalculator, processes: int):
+        self._si_calculator = si_calculator
+        self._processes = processes if processes > 0 else (os.cpu_count() or 1)
+
+    @staticmethod
+    def get_pool(processes: int) -> Pool:
+        if ParallelSiCalculator._pool is None or ParallelSiCalculator._pool_processes != processes:
+            ParallelSiCalculator.shutdown()
+
+            context = multiprocessing.get_context()
+            if os.name == 'nt':
+                context.set_executable(os.path.join(sys.exec_prefix, 'pythonw.exe'))
+            elif sys.platform == 'darwin' and os.path.exists(os.path.join(sys.exec_prefix, 'bin', 'python3')):
+                context.set_executable(os.path.join(sys.exec_prefix, 'bin', 'python3'))
+
+            ParallelSiCalculator._pool = context.Pool(processes)
+            ParallelSiCalculator._pool_processes = processes
+
+        return ParallelSiCalculator._pool
+
+    @staticmethod
+    def shutdown() -> None:
+        if ParallelSiCalculator._pool is not None:
+            ParallelSiCalculator._pool.terminate()
+            ParallelSiCalculator._pool.join()
+
+            ParallelSiCalculator._pool = None
+            ParallelSiCalculator._pool_processes = 0
+
+    @staticmethod
+    def _load_mask(raster_path: str, mask_path: str, build_up_value: int, window: RasterWindow) -> None:
+        mask = numpy.lib.format.open_memmap(mask_path, mode='w+', dtype=bool, shape=(window.rows, window.columns))
+        Common.get_mask_from_path(raster_path, build_up_value, mask, window)
+        mask.flush()
+
+    def _get_stripes(self, rows: int) -> List[Tuple[int, int]]:
+        stripe_count = min(rows, self._processes * ParallelSiCalculator.STRIPES_PER_PROCESS)
+        bounds = numpy.linspace(0, rows, stripe_count + 1).astype(int)
+
+        return [(int(start), int(end)) for (start, end) in zip(bounds[:-1], bounds[1:]) if end > start]
+
+    def calculate(self) -> numpy.ndarray:
+        window = self._si_calculator.get_read_window()
+        if window.is_empty():
+            return self._si_calculator.get_output_matrix(numpy.zeros((0, 0), dtype=numpy.float32), window)
+
+        with tempfile.TemporaryDirectory(prefix='usl_si_') as directory:
+            matrix_path = os.path.join(directory, 'matrix.npy')
+            clipped_matrix_path = os.path.join(directory, 'clipped_matrix.npy')
+            result_path = os.path.join(directory, 'result.npy')
+
+            ParallelSiCalculator._load_mask(self._si_calculator.raster_path, matrix_path, self._si_calculator.build_up_value, window)
+            ParallelSiCalculator._load_mask(self._si_calculator.clipped_raster_path,
+                                            clipped_matrix_path,
+                                            self._si_calculator.build_up_value,
+                                            window)
+
+            result_matrix = numpy.lib.format.open_memmap(result_path, mode='w+', dtype=numpy.float32, shape=(window.rows, window.columns))
+            result_matrix[:] = self._si_calculator.no_data_value
+            result_matrix.flush()
+            del result_matrix
+
+            stripes = self._get_stripes(window.rows)
+            results = ParallelSiCalculator.get_pool(self._processes).imap_unordered(
+                _calculate_stripe_arguments,
+                [(self._si_calculator, matrix_path, clipped_matrix_path, result_path, row_start, row_end)
+                 for (row_start, row_end) in stripes]
+            )
+
+            try:
+                self._wait(results, len(stripes))
+            except CanceledError:
+                ParallelSiCalculator.shutdown()
+                raise
+
+            return self._si_calculator.get_output_matrix(numpy.load(result_path), window)
+
+    def _wait(self, results: 'IMapIterator[None]', count: int) -> None:
+        progress = self._si_calculator.progress
+        done = 0
+
+        while done < count:
+            try:
+                results.next(ParallelSiCalculator.POLL_INTERVAL)
+            except multiprocessing.TimeoutError:
+                progress.check()
+                continue
+
+            done += 1
+            progress.update(done, count)
+
+
+atexit.register(ParallelSiCalculator.shutdown)
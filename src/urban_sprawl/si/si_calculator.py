@@ -1,47 +1,150 @@
 import math
 from typing import Optional
 
-import gdal
 import numpy
-from qgis.core import QgsPoint
 
 from ...urban_sprawl.common.common import Common
+from ...urban_sprawl.common.dataset_cache import DatasetCache
+from ...urban_sprawl.common.progress_monitor import ProgressMonitor
+from ...urban_sprawl.common.raster_window import RasterWindow
+from ...urban_sprawl.common.stage_metrics import StageMetrics
 
 
-class SiCalculator:
+class SiCalculator:  # pylint: disable=too-many-instance-attributes
     def __init__(self,
                  raster_path: str,
-                 clipped_raster_path: str,
+                 clipped_raster_path: Optional[str],
                  radius: int,
                  no_data_value: int,
                  build_up_value: int):
-        self._matrix = Common.get_matrix_from_path(raster_path)
-        self._clipped_matrix = Common.get_matrix_from_path(clipped_raster_path)
+        self._raster_path = raster_path
+        self._clipped_raster_path = clipped_raster_path
 
         self._radius = radius
         self._no_data_value = no_data_value
         self._build_up_value = build_up_value
 
-        self._pixel_size = Common.get_pixel_size(gdal.Open(raster_path))
+        self._pixel_size = DatasetCache.get_pixel_size(raster_path)
         self._wcc = self._calculate_wcc(self._pixel_size)
 
+        self._padded = False
+        self._region: Optional[RasterWindow] = None
+
+        self._metrics = StageMetrics()
+        self._progress = ProgressMonitor()
+
+    @property
+    def raster_path(self) -> str:
+        return self._raster_path
+
+    @property
+    def clipped_raster_path(self) -> str:
+        if self._clipped_raster_path is None:
+            raise ValueError('SI calculator was created without a clipped raster')
+
+        return self._clipped_raster_path
+
+    @property
+    def metrics(self) -> StageMetrics:
+        return self._metrics
+
+    @metrics.setter
+    def metrics(self, metrics: StageMetrics) -> None:
+        self._metrics = metrics
+
+    @property
+    def progress(self) -> ProgressMonitor:
+        return self._progress
+
+    @progress.setter
+    def progress(self, progress: ProgressMonitor) -> None:
+        self._progress = progress
+
+    @property
+    def padded(self) -> bool:
+        return self._padded
+
+    @padded.setter
+    def padded(self, padded: bool) -> None:
+        self._padded = padded
+
+    @property
+    def pixel_size(self) -> float:
+        return self._pixel_size
+
+    @property
+    def radius(self) -> int:
+        return self._radius
+
+    @property
+    def wcc(self) -> float:
+        return self._wcc
+
+    @property
+    def no_data_value(self) -> int:
+        return self._no_data_value
+
+    @property
+    def build_up_value(self) -> int:
+        return self._build_up_value
+
+    @property
+    def offset(self) -> int:
+        return round(self._radius / self._pixel_size)
+
+    def get_region(self) -> RasterWindow:
+        if self._region is None:
+            self._region = Common.get_value_window(DatasetCache.open(self.clipped_raster_path), self._build_up_value)
+
+        return self._region
+
+    def get_read_window(self) -> RasterWindow:
+        clipped_raster = DatasetCache.open(self.clipped_raster_path)
+
+        return self.get_region().expand(self.offset, clipped_raster.RasterYSize, clipped_raster.RasterXSize)
+
+    def get_output_window(self) -> RasterWindow:
+        region = self.get_region()
+
+        if self._padded or region.is_empty():
+            return RasterWindow.from_raster(DatasetCache.open(self.clipped_raster_path))
+
+        return region
+
+    def get_output_matrix(self, result_matrix: numpy.ndarray, window: RasterWindow) -> numpy.ndarray:
+        region = self.get_region()
+        output_window = self.get_output_window()
+
+        output_matrix = numpy.full((output_window.rows, output_window.columns), fill_value=self._no_data_value, dtype=numpy.float32)
+        if not region.is_empty():
+            output_matrix[region.relative_to(output_window).slices] = result_matrix[region.relative_to(window).slices]
+
+        return output_matrix
+
     @staticmethod
     def _calculate_wcc(pixel_size: float) -> float:
         return math.sqrt(0.97428 * pixel_size + 1.046) - 0.996249
 
+    def _get_mask(self, matrix: numpy.ndarray) -> numpy.ndarray:
+        if matrix.dtype == numpy.bool_:
+            return matrix
+
+        return matrix == self._build_up_value
+
     def _calculate_point(self,
+                         matrix: numpy.ndarray,
                          center_x: int,
                          center_y: int) -> Optional[float]:
-        shape = Common.get_shape(self._matrix)
-        offset = round(self._radius / self._pixel_size)
+        shape = Common.get_shape(matrix)
+        offset = self.offset
 
         count = 0
         distance_sum = float(0)
 
         for x in range(max(0, center_x - offset), min(shape.rows, center_x + offset + 1)):
             for y in range(max(0, center_y - offset), min(shape.columns, center_y + offset + 1)):
-                if self._matrix[x, y] == self._build_up_value:
-                    distance = QgsPoint(center_x, center_y).distance(QgsPoint(x, y)) * self._pixel_size
+                if matrix[x, y]:
+                    distance = math.hypot(center_x - x, center_y - y) * self._pixel_size
 
                     if distance <= self._radius:
                         count += 1
@@ -53,16 +156,35 @@ class SiCalculator:
             return None
 
     def calculate(self) -> numpy.ndarray:
-        shape = Common.get_shape(self._clipped_matrix)
+        with self._metrics.measure('SI read') as record:
+            window = self.get_read_window()
+            matrix = Common.get_mask_from_path(self._raster_path, self._build_up_value, window=window)
+            clipped_matrix = Common.get_mask_from_path(self.clipped_raster_path, self._build_up_value, window=window)
+
+            record.add_cells(matrix.size + clipped_matrix.size)
+            record.add_bytes_read(matrix.nbytes + clipped_matrix.nbytes)
 
-        result_matrix = numpy.full(shape=(shape.rows, shape.columns), fill_value=self._no_data_value, dtype=float)
+        if window.is_empty():
+            return self.get_output_matrix(matrix, window)
+
+        with self._metrics.measure('SI calculation', matrix.size):
+            return self.get_output_matrix(self.calculate_matrix(matrix, clipped_matrix), window)
+
+    def calculate_matrix(self, matrix: numpy.ndarray, clipped_matrix: numpy.ndarray) -> numpy.ndarray:
+        shape = Common.get_shape(clipped_matrix)
+        mask = self._get_mask(matrix)
+        clipped_mask = self._get_mask(clipped_matrix)
+
+        result_matrix = numpy.full(shape=(shape.rows, shape.columns), fill_value=self._no_data_value, dtype=numpy.float32)
 
         for x in range(0, shape.rows):
             for y in range(0, shape.columns):
-                if self._clipped_matrix[x, y] == self._build_up_value:
-                    result = self._calculate_point(x, y)
+                if clipped_mask[x, y]:
+                    result = self._calculate_point(mask, x, y)
 
                     if result:
                         result_matrix[x, y] = result
 
+            self._progress.update(x + 1, shape.rows)
+
         return result_matrix
@@ -0,0 +1,36 @@
+from typing import Dict, List, Optional, Type
+
+from ...urban_sprawl.si.compiled_si_calculator import CompiledSiCalculator
+from ...urban_sprawl.si.convolution_si_calculator import ConvolutionSiCalculator
+from ...urban_sprawl.si.si_calculator import SiCalculator
+from ...urban_sprawl.si.sparse_si_calculator import SparseSiCalculator
+
+
+class SiEngine:
+    CONVOLUTION = 'convolution'
+    DIRECT = 'direct'
+    SPARSE = 'sparse'
+    COMPILED = 'compiled'
+
+    VERSION = 1
+
+    ENGINES: List[str] = [CONVOLUTION, DIRECT, SPARSE, COMPILED]
+
+    _CALCULATORS: Dict[str, Type[SiCalculator]] = {
+        CONVOLUTION: ConvolutionSiCalculator,
+        DIRECT: SiCalculator,
+        SPARSE: SparseSiCalculator,
+        COMPILED: CompiledSiCalculator,
+    }
+
+    @staticmethod
+    def create(engine: str,  # pylint: disable=too-many-positional-arguments
+               raster_path: str,
+               clipped_raster_path: Optional[str],
+               radius: int,
+               no_data_value: int,
+               build_up_value: int) -> SiCalculator:
+        if engine not in SiEngine._CALCULATORS:
+            raise ValueError(f'Unknown SI engine: {engine}')
+
+        return SiEngine._CALCULATORS[engine](raster_path, clipped_raster_path, radius, no_data_value, build_up_value)
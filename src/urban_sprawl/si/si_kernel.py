@@ -0,0 +1,68 @@
+from functools import lru_cache
+
+import numpy
+
+
+class SiKernel:
+    def __init__(self, radius: int, pixel_size: float):
+        self._radius = radius
+        self._pixel_size = pixel_size
+        self._offset = round(radius / pixel_size)
+
+        indices = numpy.arange(-self._offset, self._offset + 1, dtype=numpy.float64)
+        rows, columns = numpy.meshgrid(indices, indices, indexing='ij')
+        distances = numpy.sqrt(rows ** 2 + columns ** 2) * pixel_size
+        inside = distances <= radius
+
+        self._counts = inside.astype(numpy.float64)
+        self._weights = numpy.where(inside, numpy.sqrt((distances * 2) + 1) - 1, 0.0)
+
+        (offset_rows, offset_columns) = numpy.nonzero(inside)
+        self._offset_rows = offset_rows - self._offset
+        self._offset_columns = offset_columns - self._offset
+        self._offset_distances = distances[offset_rows, offset_columns]
+        self._offset_weights = self._weights[offset_rows, offset_columns]
+
+    def __str__(self) -> str:
+        return f'SiKernel(radius={self._radius}, pixel_size={self._pixel_size}, offset={self._offset})'
+
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def get(radius: int, pixel_size: float) -> 'SiKernel':
+        return SiKernel(radius, pixel_size)
+
+    @property
+    def radius(self) -> int:
+        return self._radius
+
+    @property
+    def pixel_size(self) -> float:
+        return self._pixel_size
+
+    @property
+    def offset(self) -> int:
+        return self._offset
+
+    @property
+    def counts(self) -> numpy.ndarray:
+        return self._counts
+
+    @property
+    def weights(self) -> numpy.ndarray:
+        return self._weights
+
+    @property
+    def offset_rows(self) -> numpy.ndarray:
+        return self._offset_rows
+
+    @property
+    def offset_columns(self) -> numpy.ndarray:
+        return self._offset_columns
+
+    @property
+    def offset_distances(self) -> numpy.ndarray:
+        return self._offset_distances
+
+    @property
+    def offset_weights(self) -> numpy.ndarray:
+        return self._offset_weights
@@ -0,0 +1,74 @@
+import numpy
+
+from ...urban_sprawl.si.si_calculator import SiCalculator
+
+
+class SparseSiCalculator(SiCalculator):
+    MAX_PAIRS_PER_CHUNK = 4_000_000
+
+    def calculate_matrix(self, matrix: numpy.ndarray, clipped_matrix: numpy.ndarray) -> numpy.ndarray:
+        result_matrix = numpy.full(clipped_matrix.shape, fill_value=self._no_data_value, dtype=numpy.float32)
+
+        (center_rows, center_columns) = numpy.nonzero(self._get_mask(clipped_matrix))
+        (point_rows, point_columns) = numpy.nonzero(self._get_mask(matrix))
+
+        if center_rows.size == 0 or point_rows.size == 0:
+            return result_matrix
+
+        cell_size = max(1, round(self._radius / self._pixel_size))
+        grid_columns = matrix.shape[1] // cell_size + 1
+
+        point_keys = (point_rows // cell_size) * grid_columns + point_columns // cell_size
+        point_order = numpy.argsort(point_keys, kind='stable')
+        point_keys = point_keys[point_order]
+        point_rows = point_rows[point_order]
+        point_columns = point_columns[point_order]
+
+        center_keys = (center_rows // cell_size) * grid_columns + center_columns // cell_size
+        center_order = numpy.argsort(center_keys, kind='stable')
+        center_keys = center_keys[center_order]
+        center_rows = center_rows[center_order]
+        center_columns = center_columns[center_order]
+
+        (cell_keys, cell_starts) = numpy.unique(center_keys, return_index=True)
+        cell_ends = numpy.append(cell_starts[1:], center_keys.size)
+
+        for (cell_key, cell_start, cell_end) in zip(cell_keys, cell_starts, cell_ends):
+            self._progress.update(int(cell_start), center_keys.size)
+
+            (cell_row, cell_column) = divmod(int(cell_key), grid_columns)
+
+            neighbour_keys = numpy.array([(cell_row + row_shift) * grid_columns + cell_column + column_shift
+                                          for row_shift in (-1, 0, 1)
+                                          for column_shift in (-1, 0, 1)
+                                          if cell_row + row_shift >= 0 and 0 <= cell_column + column_shift < grid_columns])
+            starts = numpy.searchsorted(point_keys, neighbour_keys, side='left')
+            ends = numpy.searchsorted(point_keys, neighbour_keys, side='right')
+            candidates = numpy.concatenate([numpy.arange(start, end) for (start, end) in zip(starts, ends)])
+
+            if candidates.size == 0:
+                continue
+
+            candidate_rows = point_rows[candidates].astype(numpy.float64)
+            candidate_columns = point_columns[candidates].astype(numpy.float64)
+
+            chunk_size = max(1, SparseSiCalculator.MAX_PAIRS_PER_CHUNK // candidates.size)
+
+            for chunk_start in range(cell_start, cell_end, chunk_size):
+                chunk_end = min(cell_end, chunk_start + chunk_size)
+                rows = center_rows[chunk_start:chunk_end]
+                columns = center_columns[chunk_start:chunk_end]
+
+                distances = numpy.sqrt((rows[:, None] - candidate_rows[None, :]) ** 2
+                                       + (columns[:, None] - candidate_columns[None, :]) ** 2) * self._pixel_size
+                inside = distances <= self._radius
+
+                counts = numpy.count_nonzero(inside, axis=1)
+                distance_sums = numpy.where(inside, numpy.sqrt((distances * 2) + 1) - 1, 0.0).sum(axis=1)
+
+                found = counts > 0
+                result_matrix[rows[found], columns[found]] = (distance_sums[found] + self._wcc) / counts[found]
+
+        self._progress.update(center_keys.size, center_keys.size)
+
+        return result_matrix
@@ -0,0 +1,78 @@
+import math
+from typing import Callable, Iterator, Tuple
+
+import numpy
+from osgeo import gdal
+
+from ...urban_sprawl.common.dataset_cache import DatasetCache
+from ...urban_sprawl.common.raster_window import RasterWindow
+from ...urban_sprawl.si.si_calculator import SiCalculator
+
+
+class TiledSiCalculator:
+    BYTES_PER_CELL = 64
+
+    def __init__(self, si_calculator: SiCalculator, memory_budget: int):
+        self._si_calculator = si_calculator
+        self._halo = si_calculator.offset
+        self._tile_size = TiledSiCalculator.get_tile_size(memory_budget, self._halo)
+
+    @staticmethod
+    def get_tile_size(memory_budget: int, halo: int) -> int:
+        tile_size = int(math.sqrt(memory_budget / TiledSiCalculator.BYTES_PER_CELL)) - 2 * halo
+
+        if tile_size < 1:
+            raise ValueError(f'Memory budget of {memory_budget} bytes is too small for a halo of {halo} pixels')
+
+        return tile_size
+
+    @property
+    def tile_size(self) -> int:
+        return self._tile_size
+
+    def calculate(self, output_band: gdal.Band) -> None:
+        clipped_band = DatasetCache.open(self._si_calculator.clipped_raster_path).GetRasterBand(1)
+
+        region = self._si_calculator.get_region()
+        output_window = self._si_calculator.get_output_window()
+        if self._si_calculator.padded or region.is_empty():
+            output_band.Fill(self._si_calculator.no_data_value)
+
+        build_up_value = self._si_calculator.build_up_value
+        for (window, tile) in self.calculate_tiles(region, lambda window: window.read(clipped_band) == build_up_value):
+            output_band.WriteArray(tile,
+                                   xoff=window.column_start - output_window.column_start,
+                                   yoff=window.row_start - output_window.row_start)
+
+    def calculate_tiles(self,
+                        region: RasterWindow,
+                        get_clipped_mask: Callable[[RasterWindow], numpy.ndarray]) -> Iterator[Tuple[RasterWindow, numpy.ndarray]]:
+        band = DatasetCache.open(self._si_calculator.raster_path).GetRasterBand(1)
+
+        progress = self._si_calculator.progress
+        tiles = [RasterWindow(row_start,
+                              column_start,
+                              min(self._tile_size, region.row_start + region.rows - row_start),
+                              min(self._tile_size, region.column_start + region.columns - column_start))
+                 for row_start in range(region.row_start, region.row_start + region.rows, self._tile_size)
+                 for column_start in range(region.column_start, region.column_start + region.columns, self._tile_size)]
+
+        for (index, window) in enumerate(tiles):
+            with progress.sub_range(100 * index / len(tiles), 100 * (index + 1) / len(tiles)):
+                tile = self._calculate_tile(band, window, get_clipped_mask(window))
+
+            yield window, tile
+            progress.update(index + 1, len(tiles))
+
+    def _calculate_tile(self, band: gdal.Band, window: RasterWindow, clipped_core: numpy.ndarray) -> numpy.ndarray:
+        if not numpy.any(clipped_core):
+            return numpy.full((window.rows, window.columns), fill_value=self._si_calculator.no_data_value, dtype=numpy.float32)
+
+        halo_window = window.expand(self._halo, band.YSize, band.XSize)
+        matrix = halo_window.read(band)
+        core = window.relative_to(halo_window).slices
+
+        clipped_mask = numpy.zeros(matrix.shape, dtype=bool)
+        clipped_mask[core] = clipped_core
+
+        return self._si_calculator.calculate_matrix(matrix, clipped_mask)[core]
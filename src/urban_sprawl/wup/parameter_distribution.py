@@ -0,0 +1,61 @@
+from typing import Dict, List
+
+import numpy
+
+
+class ParameterDistribution:
+    FIXED = 'fixed'
+    UNIFORM = 'uniform'
+    NORMAL = 'normal'
+    TRIANGULAR = 'triangular'
+
+    PARAMETER_COUNTS: Dict[str, int] = {FIXED: 1, UNIFORM: 2, NORMAL: 2, TRIANGULAR: 3}
+
+    def __init__(self, kind: str, parameters: List[float]):
+        if kind not in ParameterDistribution.PARAMETER_COUNTS:
+            raise ValueError(f'Unknown distribution: {kind}')
+
+        if len(parameters) != ParameterDistribution.PARAMETER_COUNTS[kind]:
+            raise ValueError(f'Distribution {kind} needs {ParameterDistribution.PARAMETER_COUNTS[kind]} parameters')
+
+        self._kind = kind
+        self._parameters = parameters
+
+    def __str__(self) -> str:
+        return f'ParameterDistribution(kind={self._kind}, parameters={self._parameters})'
+
+    @staticmethod
+    def parse(string: str) -> 'ParameterDistribution':
+        tokens = string.lower().replace('(', ' ').replace(')', ' ').replace(',', ' ').replace(';', ' ').split()
+        if not tokens:
+            raise ValueError('Distribution is empty')
+
+        (kind, values) = (tokens[0], tokens[1:]) if tokens[0].isalpha() else (ParameterDistribution.FIXED, tokens)
+
+        try:
+            return ParameterDistribution(kind, [float(value) for value in values])
+        except ValueError as error:
+            raise ValueError(f'Invalid distribution {string}: {error}') from error
+
+    @property
+    def kind(self) -> str:
+        return self._kind
+
+    @property
+    def parameters(self) -> List[float]:
+        return self._parameters
+
+    def sample(self, count: int, generator: numpy.random.Generator) -> numpy.ndarray:
+        if self._kind == ParameterDistribution.UNIFORM:
+            (low, high) = self._parameters
+            return generator.uniform(low, high, count)
+
+        if self._kind == ParameterDistribution.NORMAL:
+            (mean, deviation) = self._parameters
+            return generator.normal(mean, deviation, count)
+
+        if self._kind == ParameterDistribution.TRIANGULAR:
+            (left, mode, right) = self._parameters
+            return generator.triangular(left, mode, right, count)
+
+        return numpy.full(count, self._parameters[0])
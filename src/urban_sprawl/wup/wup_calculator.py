@@ -0,0 +1,24 @@
+from typing import TypeVar, cast
+
+import numpy
+
+Values = TypeVar('Values', float, numpy.ndarray)
+
+
+class WupCalculator:
+    @staticmethod
+    def get_lup_weight(lup_value: Values) -> Values:
+        value = numpy.exp(4.159 - 613.125 / lup_value)
+        return cast(Values, value / (1 + value))
+
+    @staticmethod
+    def get_dis_weight(dis_value: Values) -> Values:
+        value = numpy.exp(0.294432 * dis_value - 12.955)
+        return cast(Values, value / (1 + value))
+
+    @staticmethod
+    def calculate(dis_value: Values, lup_value: Values, ssa_value: Values) -> Values:
+        up = ssa_value * dis_value
+        wup_value: Values = up * WupCalculator.get_lup_weight(lup_value) * (0.5 + WupCalculator.get_dis_weight(dis_value))
+
+        return wup_value
@@ -0,0 +1,31 @@
+from typing import List
+
+import numpy
+
+from ...urban_sprawl.wup.wup_calculator import WupCalculator
+
+
+class WupMonteCarlo:
+    @staticmethod
+    def get_lup(build_up_areas: numpy.ndarray, resident_counts: numpy.ndarray, employee_counts: numpy.ndarray) -> numpy.ndarray:
+        resident_employee_counts = resident_counts + employee_counts
+
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            return numpy.where((resident_employee_counts > 0) & (build_up_areas >= 0),
+                               build_up_areas / resident_employee_counts,
+                               numpy.nan)
+
+    @staticmethod
+    def calculate(dis_values: numpy.ndarray, lup_values: numpy.ndarray, ssa_values: numpy.ndarray) -> numpy.ndarray:
+        with numpy.errstate(divide='ignore', over='ignore', invalid='ignore'):
+            wup_values = WupCalculator.calculate(dis_values, lup_values, ssa_values)
+
+        return numpy.where((ssa_values >= 0) & (ssa_values <= 1) & (dis_values >= 0), wup_values, numpy.nan)
+
+    @staticmethod
+    def get_quantiles(values: numpy.ndarray, quantiles: List[float]) -> numpy.ndarray:
+        valid_values = values[~numpy.isnan(values)]
+        if valid_values.size == 0:
+            raise ValueError('No valid samples')
+
+        return numpy.percentile(valid_values, quantiles)
@@ -1,19 +1,38 @@
+import os
+import tempfile
 from typing import Dict, Any, Optional
 
+from osgeo import gdal
 from qgis import processing
 from qgis.PyQt.QtCore import QCoreApplication
 from qgis.core import QgsProcessingOutputNumber, QgsProcessingParameterVectorLayer, \
     QgsProcessingContext, QgsProcessingFeedback, QgsProcessing, QgsProcessingAlgorithm, \
     QgsProcessingParameterRasterLayer, QgsProcessingParameterNumber, QgsProcessingParameterRasterDestination, \
-    QgsProcessingException
+    QgsProcessingException, QgsProcessingParameterBoolean, QgsProcessingParameterFileDestination, \
+    QgsProcessingMultiStepFeedback
 
 from . import constants
+from .calculate_si_processing_script import CalculateSiProcessingScript
+from .clip_raster_processing_script import ClipRasterProcessingScript
+from .urban_sprawl.common.dataset_cache import DatasetCache
+from .urban_sprawl.common.progress_monitor import CanceledError
+from .urban_sprawl.common.raster_writer import RasterWriter
+from .urban_sprawl.common.raw_raster import RawRaster
+from .urban_sprawl.common.result_cache import ResultCache
+from .urban_sprawl.common.stage_metrics import StageMetrics
+from .urban_sprawl.pipeline.urban_sprawl_pipeline import UrbanSprawlPipeline, UrbanSprawlResult
+from .urban_sprawl.si.si_engine import SiEngine
+from .urban_sprawl.wup.wup_calculator import WupCalculator
 
 
 class UrbanSprawlCalculatorProcessingScript(QgsProcessingAlgorithm):  # type: ignore
     SSA = 'SSA'
     NO_DATA_VALUE = 'NO_DATA_VALUE'
     BUILD_UP_VALUE = 'BUILD_UP_VALUE'
+    FUSED = 'FUSED'
+    CACHE_SIZE = 'CACHE_SIZE'
+    MEMORY_BUDGET = 'MEMORY_BUDGET'
+    METRICS = 'METRICS'
 
     RESIDENT_COUNT = 'RESIDENT_COUNT'
     EMPLOYEE_COUNT = 'EMPLOYEE_COUNT'
@@ -22,8 +41,12 @@ class UrbanSprawlCalculatorProcessingScript(QgsProcessingAlgorithm):  # type: ig
     VECTOR = 'VECTOR'
 
     OUTPUT_RASTER = 'SI_RASTER'
+    METRICS_FILE = 'METRICS_FILE'
     OUTPUT = 'WUP'
 
+    DIS_METADATA = 'USL_DIS'
+    BUILD_UP_AREA_METADATA = 'USL_BUILD_UP_AREA'
+
     @staticmethod
     def tr(string: str) -> str:
         return QCoreApplication.translate('Processing', string)  # type: ignore
@@ -58,6 +81,8 @@ class UrbanSprawlCalculatorProcessingScript(QgsProcessingAlgorithm):  # type: ig
             '\n3. USL DIS Calculator (usl_dis_calculator)'
             '\n4. USL LUP Calculator (usl_lup_calculator)'
             '\n5. USL WUP Calculator (usl_wup_calculator)'
+            '\nIn the in-memory mode the stages are executed without the child algorithms:'
+            ' the raster is read once and only the requested outputs are written.'
         )
 
     def initAlgorithm(self, _: Optional[Dict[str, Any]] = None) -> None:  # type: ignore
@@ -104,7 +129,8 @@ class UrbanSprawlCalculatorProcessingScript(QgsProcessingAlgorithm):  # type: ig
         self.addParameter(
             QgsProcessingParameterRasterDestination(
                 self.OUTPUT_RASTER,
-                self.tr('Output SI Raster')
+                self.tr('Output SI Raster'),
+                optional=True
             )
         )
 
@@ -126,6 +152,52 @@ class UrbanSprawlCalculatorProcessingScript(QgsProcessingAlgorithm):  # type: ig
             )
         )
 
+        self.addParameter(
+            QgsProcessingParameterBoolean(
+                self.FUSED,
+                self.tr('Run all stages in memory'),
+                defaultValue=True
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.MEMORY_BUDGET,
+                self.tr('Memory budget in MB for tiled SI calculation (0 = load the SI read window at once)'),
+                QgsProcessingParameterNumber.Integer,
+                defaultValue=constants.MEMORY_BUDGET_VALUE,
+                minValue=0
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.CACHE_SIZE,
+                self.tr('Result cache size in MB (0 = disabled)'),
+                QgsProcessingParameterNumber.Integer,
+                defaultValue=constants.CACHE_SIZE_VALUE,
+                minValue=0
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterBoolean(
+                self.METRICS,
+                self.tr('Report time, memory and throughput of each stage (in memory mode only)'),
+                defaultValue=False
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterFileDestination(
+                self.METRICS_FILE,
+                self.tr('Stage metrics JSON file'),
+                fileFilter='JSON files (*.json)',
+                optional=True,
+                createByDefault=False
+            )
+        )
+
         self.addOutput(
             QgsProcessingOutputNumber(
                 self.OUTPUT,
@@ -148,13 +220,18 @@ class UrbanSprawlCalculatorProcessingScript(QgsProcessingAlgorithm):  # type: ig
         if ssa_value < 0 or ssa_value > 1:
             raise QgsProcessingException('SSA value needs to be between 0 and 1 or less')
 
+        if self.parameterAsBool(parameters, self.FUSED, context):
+            return self._process_fused(parameters, context, feedback, resident_count, employee_count, ssa_value)
+
         outputs = {}
+        feedback = QgsProcessingMultiStepFeedback(5, feedback)
 
         # USL Clip Raster
         alg_params = {
             'NO_DATA_VALUE': parameters[self.NO_DATA_VALUE],
             'RASTER': parameters[self.RASTER],
             'VECTOR': parameters[self.VECTOR],
+            'CACHE_SIZE': self.parameterAsInt(parameters, self.CACHE_SIZE, context),
             'CLIPPED_RASTER': QgsProcessing.TEMPORARY_OUTPUT
         }
         outputs['UslClipRaster'] = processing.run('usl:usl_clip_raster', alg_params, context=context,
@@ -162,6 +239,8 @@ class UrbanSprawlCalculatorProcessingScript(QgsProcessingAlgorithm):  # type: ig
         if feedback.isCanceled():
             return {}
 
+        feedback.setCurrentStep(1)
+
         # USL SI Calculator
         alg_params = {
             'BUILD_UP_VALUE': parameters[self.BUILD_UP_VALUE],
@@ -169,13 +248,17 @@ class UrbanSprawlCalculatorProcessingScript(QgsProcessingAlgorithm):  # type: ig
             'NO_DATA_VALUE': parameters[self.NO_DATA_VALUE],
             'RADIUS': constants.RADIUS_VALUE,
             'RASTER': parameters[self.RASTER],
-            'SI_RASTER': parameters[self.OUTPUT_RASTER]
+            'CACHE_SIZE': self.parameterAsInt(parameters, self.CACHE_SIZE, context),
+            'MEMORY_BUDGET': self.parameterAsInt(parameters, self.MEMORY_BUDGET, context),
+            'SI_RASTER': parameters.get(self.OUTPUT_RASTER) or QgsProcessing.TEMPORARY_OUTPUT
         }
         outputs['UslSiCalculator'] = processing.run('usl:usl_si_calculator', alg_params, context=context,
                                                     feedback=feedback, is_child_algorithm=True)
         if feedback.isCanceled():
             return {}
 
+        feedback.setCurrentStep(2)
+
         # USL DIS Calculator
         alg_params = {
             'SI_RASTER': outputs['UslSiCalculator']['SI_RASTER']
@@ -186,6 +269,8 @@ class UrbanSprawlCalculatorProcessingScript(QgsProcessingAlgorithm):  # type: ig
         if feedback.isCanceled():
             return {}
 
+        feedback.setCurrentStep(3)
+
         # USL LUP Calculator
         alg_params = {
             'BUILD_UP_VALUE': parameters[self.BUILD_UP_VALUE],
@@ -199,6 +284,8 @@ class UrbanSprawlCalculatorProcessingScript(QgsProcessingAlgorithm):  # type: ig
         if feedback.isCanceled():
             return {}
 
+        feedback.setCurrentStep(4)
+
         # USL WUP Calculator
         alg_params = {
             'DIS': outputs['UslDisCalculator']['DIS'],
@@ -208,6 +295,136 @@ class UrbanSprawlCalculatorProcessingScript(QgsProcessingAlgorithm):  # type: ig
         outputs['UslWupCalculator'] = processing.run('usl:usl_wup_calculator', alg_params, context=context,
                                                      feedback=feedback, is_child_algorithm=True)
         feedback.pushInfo('WUP,DIS,LUP')
-        feedback.pushInfo(outputs['UslWupCalculator']['WUP'], outputs['UslDisCalculator']['DIS'], outputs['UslLupCalculator']['LUP'])
+        feedback.pushInfo(f"{outputs['UslWupCalculator']['WUP']},{outputs['UslDisCalculator']['DIS']},"
+                          f"{outputs['UslLupCalculator']['LUP']}")
 
         return {self.OUTPUT: outputs['UslWupCalculator']['WUP']}
+
+    def _process_fused(self,  # pylint: disable=too-many-positional-arguments
+                       parameters: Dict[str, Any],
+                       context: QgsProcessingContext,
+                       feedback: QgsProcessingFeedback,
+                       resident_count: int,
+                       employee_count: int,
+                       ssa_value: float) -> Dict[str, Any]:
+        raster_layer = self.parameterAsRasterLayer(parameters, self.RASTER, context)
+        vector_layer = self.parameterAsVectorLayer(parameters, self.VECTOR, context)
+        no_data_value = self.parameterAsInt(parameters, self.NO_DATA_VALUE, context)
+        build_up_value = self.parameterAsInt(parameters, self.BUILD_UP_VALUE, context)
+        output_path = ClipRasterProcessingScript.get_output_path(parameters,
+                                                                 self.parameterAsOutputLayer(parameters, self.OUTPUT_RASTER, context),
+                                                                 self.OUTPUT_RASTER,
+                                                                 context)
+        metrics_path = self.parameterAsFileOutput(parameters, self.METRICS_FILE, context)
+        metrics = StageMetrics(self.parameterAsBool(parameters, self.METRICS, context) or bool(metrics_path))
+
+        with metrics.measure('Geometry transform'):
+            wkt_geometries = ClipRasterProcessingScript.get_wkt_geometries(vector_layer, raster_layer.crs(), context)
+
+        result_cache = ResultCache(self.parameterAsInt(parameters, self.CACHE_SIZE, context) * 1024 ** 2)
+        cache_key = ''
+        if result_cache.size_limit > 0:
+            cache_key = ResultCache.get_key(self.name(),
+                                            SiEngine.VERSION,
+                                            SiEngine.CONVOLUTION,
+                                            ResultCache.get_raster_hash(raster_layer.source()),
+                                            wkt_geometries,
+                                            constants.RADIUS_VALUE,
+                                            no_data_value,
+                                            build_up_value,
+                                            RawRaster.is_raw_path(output_path))
+
+        result = self._get_cached_result(result_cache, cache_key, output_path, resident_count + employee_count, ssa_value)
+        if result is not None:
+            feedback.pushInfo('SI raster and DIS loaded from cache')
+        else:
+            pipeline = UrbanSprawlPipeline(raster_layer.source(),
+                                           wkt_geometries,
+                                           constants.RADIUS_VALUE,
+                                           no_data_value,
+                                           build_up_value,
+                                           SiEngine.CONVOLUTION,
+                                           metrics,
+                                           CalculateSiProcessingScript.get_progress_monitor(feedback),
+                                           self.parameterAsInt(parameters, self.MEMORY_BUDGET, context) * 1024 ** 2)
+
+            try:
+                result = pipeline.calculate(resident_count, employee_count, ssa_value)
+            except CanceledError:
+                feedback.pushInfo('Calculation canceled')
+                return {}
+            except ValueError as error:
+                raise QgsProcessingException(str(error)) from error
+
+            if output_path or cache_key:
+                self._write_si_raster(result, raster_layer.source(), no_data_value, output_path, result_cache, cache_key, metrics)
+
+        results: Dict[str, Any] = {self.OUTPUT: result.wup}
+        if output_path:
+            results[self.OUTPUT_RASTER] = output_path
+
+        metrics.report(feedback.pushInfo)
+        if metrics_path:
+            metrics.save(metrics_path)
+            results[self.METRICS_FILE] = metrics_path
+
+        feedback.pushInfo('WUP,DIS,LUP')
+        feedback.pushInfo(f'{result.wup},{result.dis},{result.lup}')
+
+        return results
+
+    def _get_cached_result(self,
+                           result_cache: ResultCache,
+                           cache_key: str,
+                           output_path: str,
+                           resident_employee_count: int,
+                           ssa_value: float) -> Optional[UrbanSprawlResult]:
+        if not cache_key:
+            return None
+
+        metadata = result_cache.get_metadata(cache_key) or {}
+        if self.DIS_METADATA not in metadata or self.BUILD_UP_AREA_METADATA not in metadata:
+            return None
+
+        if output_path and not result_cache.get(cache_key, output_path):
+            return None
+
+        dis = float(metadata[self.DIS_METADATA])
+        build_up_area = float(metadata[self.BUILD_UP_AREA_METADATA])
+        lup = build_up_area / resident_employee_count
+
+        return UrbanSprawlResult(dis, lup, WupCalculator.calculate(dis, lup, ssa_value), None, build_up_area)
+
+    def _write_si_raster(self,  # pylint: disable=too-many-positional-arguments
+                         result: UrbanSprawlResult,
+                         raster_path: str,
+                         no_data_value: int,
+                         output_path: str,
+                         result_cache: ResultCache,
+                         cache_key: str,
+                         metrics: StageMetrics) -> None:
+        si_matrix = result.si_matrix
+        if si_matrix is None:
+            raise QgsProcessingException('SI values were not calculated')
+
+        si_path = output_path
+        if not si_path:
+            (handle, si_path) = tempfile.mkstemp(suffix=ResultCache.EXTENSION)
+            os.close(handle)
+
+        with metrics.measure('SI write') as record:
+            RasterWriter.write(si_path,
+                               si_matrix,
+                               DatasetCache.open(raster_path),
+                               gdal.GDT_Float32,
+                               window=result.si_window,
+                               metadata={self.DIS_METADATA: repr(result.dis), self.BUILD_UP_AREA_METADATA: repr(result.build_up_area)},
+                               no_data_value=no_data_value)
+            record.add_cells(si_matrix.size)
+            record.add_bytes_written(si_matrix.nbytes)
+
+        if cache_key:
+            result_cache.put(cache_key, si_path)
+
+        if not output_path:
+            os.remove(si_path)
@@ -0,0 +1,12 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from osgeo import gdal  # noqa: F401  # pylint: disable=unused-import
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import gdal_stub  # pylint: disable=import-error
+
+    gdal_stub.install()
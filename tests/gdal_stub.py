@@ -0,0 +1,187 @@
+import os
+import sys
+import types
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy
+
+GDT_Byte = 1
+GDT_Int16 = 3
+GDT_Int32 = 5
+GDT_Float32 = 6
+GDT_Float64 = 7
+
+GA_ReadOnly = 0
+GA_Update = 1
+
+DATA_TYPES: Dict[int, type] = {GDT_Byte: numpy.uint8,
+                               GDT_Int16: numpy.int16,
+                               GDT_Int32: numpy.int32,
+                               GDT_Float32: numpy.float32,
+                               GDT_Float64: numpy.float64}
+
+_datasets: Dict[str, 'Dataset'] = {}
+
+
+class Band:
+    def __init__(self, dataset: 'Dataset', data_type: int):
+        self._dataset = dataset
+        self._array = numpy.zeros((dataset.RasterYSize, dataset.RasterXSize), dtype=DATA_TYPES[data_type])
+        self._no_data_value: Optional[float] = None
+        self.DataType = data_type
+        self.XSize = dataset.RasterXSize
+        self.YSize = dataset.RasterYSize
+
+    @property
+    def array(self) -> numpy.ndarray:
+        return self._array
+
+    def GetBlockSize(self) -> List[int]:
+        return [self.XSize, 1]
+
+    def ReadAsArray(self,
+                    xoff: int = 0,
+                    yoff: int = 0,
+                    win_xsize: Optional[int] = None,
+                    win_ysize: Optional[int] = None,
+                    buf_obj: Optional[numpy.ndarray] = None) -> numpy.ndarray:
+        win_xsize = self.XSize - xoff if win_xsize is None else win_xsize
+        win_ysize = self.YSize - yoff if win_ysize is None else win_ysize
+        block = self._array[yoff:yoff + win_ysize, xoff:xoff + win_xsize].copy()
+
+        if buf_obj is None:
+            return block
+
+        buf_obj[...] = block
+        return buf_obj
+
+    def ReadRaster(self, xoff: int, yoff: int, xsize: int, ysize: int) -> bytes:
+        return self.ReadAsArray(xoff, yoff, xsize, ysize).tobytes()
+
+    def WriteArray(self, array: numpy.ndarray, xoff: int = 0, yoff: int = 0) -> int:
+        self._array[yoff:yoff + array.shape[0], xoff:xoff + array.shape[1]] = array
+        return 0
+
+    def Fill(self, value: float) -> int:
+        self._array.fill(value)
+        return 0
+
+    def SetNoDataValue(self, value: float) -> int:
+        self._no_data_value = value
+        return 0
+
+    def GetNoDataValue(self) -> Optional[float]:
+        return self._no_data_value
+
+
+class Dataset:
+    def __init__(self, path: str, driver: 'Driver', xsize: int, ysize: int, bands: int, data_type: int):
+        self._path = path
+        self._driver = driver
+        self.RasterXSize = xsize
+        self.RasterYSize = ysize
+        self.RasterCount = bands
+        self._bands = [Band(self, data_type) for _ in range(bands)]
+        self._geo_transform: Tuple[float, ...] = (0.0, 1.0, 0.0, 0.0, 0.0, -1.0)
+        self._projection = ''
+        self._metadata: Dict[str, str] = {}
+
+    def GetRasterBand(self, index: int) -> Band:
+        return self._bands[index - 1]
+
+    def GetDriver(self) -> 'Driver':
+        return self._driver
+
+    def GetFileList(self) -> List[str]:
+        return [self._path]
+
+    def GetGeoTransform(self) -> Tuple[float, ...]:
+        return self._geo_transform
+
+    def SetGeoTransform(self, geo_transform: Sequence[float]) -> int:
+        self._geo_transform = tuple(geo_transform)
+        return 0
+
+    def GetProjection(self) -> str:
+        return self._projection
+
+    def SetProjection(self, projection: str) -> int:
+        self._projection = projection
+        return 0
+
+    def GetMetadata(self) -> Dict[str, str]:
+        return dict(self._metadata)
+
+    def SetMetadata(self, metadata: Dict[str, str]) -> int:
+        self._metadata = dict(metadata)
+        return 0
+
+    def BuildOverviews(self, *_: object) -> int:
+        return 0
+
+    def FlushCache(self) -> None:
+        with open(self._path, 'wb') as file:
+            for band in self._bands:
+                file.write(band.array.tobytes())
+
+
+class Driver:
+    def __init__(self, name: str):
+        self.ShortName = name
+
+    def Create(self,
+               path: str,
+               xsize: int,
+               ysize: int,
+               bands: int = 1,
+               eType: int = GDT_Byte,
+               options: Optional[List[str]] = None) -> Dataset:
+        del options
+        dataset = Dataset(path, self, xsize, ysize, bands, eType)
+        if path:
+            _datasets[os.path.abspath(path)] = dataset
+            dataset.FlushCache()
+
+        return dataset
+
+    @staticmethod
+    def Delete(path: str) -> int:
+        _datasets.pop(os.path.abspath(path), None)
+        if os.path.exists(path):
+            os.remove(path)
+
+        return 0
+
+
+def GetDriverByName(name: str) -> Driver:
+    return Driver(name)
+
+
+def Open(path: str, access: int = GA_ReadOnly) -> Optional[Dataset]:
+    del access
+    return _datasets.get(os.path.abspath(path))
+
+
+def UseExceptions() -> None:
+    pass
+
+
+def GetDataTypeSize(data_type: int) -> int:
+    return numpy.dtype(DATA_TYPES[data_type]).itemsize * 8
+
+
+def install() -> None:
+    osgeo = types.ModuleType('osgeo')
+    gdal_array = types.ModuleType('osgeo.gdal_array')
+    gdal_array.GDALTypeCodeToNumericTypeCode = DATA_TYPES.get  # type: ignore
+
+    modules = {'osgeo': osgeo,
+               'osgeo.gdal': sys.modules[__name__],
+               'osgeo.gdal_array': gdal_array,
+               'osgeo.ogr': types.ModuleType('osgeo.ogr'),
+               'osgeo.osr': types.ModuleType('osgeo.osr')}
+
+    for (name, module) in modules.items():
+        if name != 'osgeo':
+            setattr(osgeo, name.split('.')[1], module)
+        sys.modules[name] = module
@@ -0,0 +1,28 @@
+from pathlib import Path
+from typing import Optional
+
+from src.urban_sprawl.benchmark.benchmark_runner import BenchmarkResult, BenchmarkRunner
+
+
+def _result(stage: str, seconds: float, radius: Optional[int] = 500) -> BenchmarkResult:
+    return BenchmarkResult(stage, 1000, radius, 'convolution' if radius else None, 0.1, 0.5, seconds)
+
+
+def test_compare_reports_regressions_over_threshold() -> None:
+    baseline = [_result('si', 1.0), _result('dis', 1.0), _result('lup', 1.0, None), _result('clip', 1.0, 2000)]
+    results = [_result('si', 1.2), _result('dis', 1.05), _result('lup', 0.5, None), _result('clip', 5.0), _result('pipeline', 9.0)]
+
+    regressions = BenchmarkRunner.compare(results, baseline, 0.1)
+
+    assert [(result.stage, baseline_result.seconds) for (result, baseline_result) in regressions] == [('si', 1.0)]
+
+
+def test_saved_results_are_compared(tmp_path: Path) -> None:
+    path = str(tmp_path / 'baseline.json')
+    BenchmarkRunner.save(path, [_result('si', 1.0), _result('lup', 1.0, None)])
+
+    baseline = BenchmarkRunner.load(path)
+
+    assert [result.key for result in baseline] == [_result('si', 1.0).key, _result('lup', 1.0, None).key]
+    assert not BenchmarkRunner.compare(baseline, baseline, 0.0)
+    assert len(BenchmarkRunner.compare([_result('lup', 1.5, None)], baseline, 0.1)) == 1
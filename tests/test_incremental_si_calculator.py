@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import numpy
+from osgeo import gdal
+
+from src.urban_sprawl.common.dataset_cache import DatasetCache
+from src.urban_sprawl.si.incremental_si_calculator import IncrementalSiCalculator
+from src.urban_sprawl.si.si_engine import SiEngine
+
+ABSOLUTE_TOLERANCE = 1e-4
+
+RADIUS = 200
+PIXEL_SIZE = 25
+
+
+def _create_calculator(tmp_path: Path, matrix: numpy.ndarray, clip_mask: numpy.ndarray) -> IncrementalSiCalculator:
+    path = str(tmp_path / 'raster.tif')
+    raster = gdal.GetDriverByName('GTiff').Create(path, matrix.shape[1], matrix.shape[0], 1, gdal.GDT_Int16)
+    raster.SetGeoTransform((2600000, PIXEL_SIZE, 0, 1200000, 0, -PIXEL_SIZE))
+    raster.GetRasterBand(1).WriteArray(matrix)
+    raster.FlushCache()
+    del raster
+
+    DatasetCache.clear()
+    return IncrementalSiCalculator(SiEngine.create(SiEngine.CONVOLUTION, path, None, RADIUS, 0, 1), matrix, clip_mask)
+
+
+def test_update_matches_full_recompute(tmp_path: Path) -> None:
+    generator = numpy.random.default_rng(3)
+    matrix = (generator.random((60, 70)) < 0.2).astype(numpy.int16)
+    clip_mask = numpy.zeros(matrix.shape, dtype=bool)
+    clip_mask[10:50, 15:60] = True
+
+    incremental_si_calculator = _create_calculator(tmp_path, matrix, clip_mask)
+
+    matrix[25, 35] = 0
+    matrix[40, 44] = 0
+    rows = numpy.array([20, 25, 25, 40, 40, 40, 12])
+    columns = numpy.array([30, 35, 35, 44, 44, 44, 18])
+    values = numpy.array([matrix[20, 30], 1, 1, 1, 0, 1, 1 - matrix[12, 18]], dtype=numpy.int16)
+
+    expected_matrix = matrix.copy()
+    for (row, column, value) in zip(rows, columns, values):
+        expected_matrix[row, column] = value
+
+    incremental_si_calculator.update_matrix(matrix)
+    changed = incremental_si_calculator.update(rows, columns, values)
+    expected = _create_calculator(tmp_path, expected_matrix, clip_mask)
+
+    assert changed == numpy.count_nonzero(expected_matrix != matrix)
+    numpy.testing.assert_array_equal(incremental_si_calculator.matrix, expected_matrix)
+    numpy.testing.assert_allclose(incremental_si_calculator.si_matrix, expected.si_matrix, rtol=0, atol=ABSOLUTE_TOLERANCE)
+    assert abs(incremental_si_calculator.dis - expected.dis) < ABSOLUTE_TOLERANCE
+    assert incremental_si_calculator.build_up_area == expected.build_up_area
+
+
+def test_saved_sums_restore_calculator(tmp_path: Path) -> None:
+    generator = numpy.random.default_rng(5)
+    matrix = (generator.random((50, 40)) < 0.3).astype(numpy.int16)
+    clip_mask = numpy.zeros(matrix.shape, dtype=bool)
+    clip_mask[5:45, 5:35] = True
+
+    incremental_si_calculator = _create_calculator(tmp_path, matrix, clip_mask)
+    sums_path = str(tmp_path / 'sums.npz')
+    incremental_si_calculator.save_sums(sums_path)
+
+    si_calculator = SiEngine.create(SiEngine.CONVOLUTION, str(tmp_path / 'raster.tif'), None, RADIUS, 0, 1)
+    restored = IncrementalSiCalculator(si_calculator, matrix, clip_mask, IncrementalSiCalculator.load_sums(sums_path, si_calculator))
+
+    assert restored.si_matrix.dtype == numpy.float32
+    numpy.testing.assert_array_equal(restored.si_matrix, incremental_si_calculator.si_matrix)
+    assert restored.dis == incremental_si_calculator.dis
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+import numpy
+from osgeo import gdal
+
+from src.urban_sprawl.common.dataset_cache import DatasetCache
+from src.urban_sprawl.si.multi_radius_si_calculator import MultiRadiusSiCalculator
+from src.urban_sprawl.si.si_engine import SiEngine
+
+ABSOLUTE_TOLERANCE = 1e-6
+
+RADII = [300, 100, 200]
+PIXEL_SIZE = 25
+
+
+def _write_raster(path: str, matrix: numpy.ndarray) -> str:
+    raster = gdal.GetDriverByName('GTiff').Create(path, matrix.shape[1], matrix.shape[0], 1, gdal.GDT_Int16)
+    raster.SetGeoTransform((2600000, PIXEL_SIZE, 0, 1200000, 0, -PIXEL_SIZE))
+    raster.GetRasterBand(1).WriteArray(matrix)
+    raster.FlushCache()
+    del raster
+
+    return path
+
+
+def test_calculate_all_matches_direct_per_radius(tmp_path: Path) -> None:
+    generator = numpy.random.default_rng(11)
+    matrix = (generator.random((70, 80)) < 0.2).astype(numpy.int16)
+    clipped_matrix = numpy.zeros_like(matrix)
+    clipped_matrix[15:55, 20:65] = matrix[15:55, 20:65]
+
+    DatasetCache.clear()
+    raster_path = _write_raster(str(tmp_path / 'raster.tif'), matrix)
+    clipped_raster_path = _write_raster(str(tmp_path / 'clipped.tif'), clipped_matrix)
+
+    multi_radius_si_calculator = MultiRadiusSiCalculator(raster_path, clipped_raster_path, RADII, 0, 1)
+    multi_radius_si_calculator.padded = True
+    si_matrices = multi_radius_si_calculator.calculate_all()
+
+    assert multi_radius_si_calculator.radii == sorted(RADII)
+    for (radius, si_matrix) in zip(multi_radius_si_calculator.radii, si_matrices):
+        si_calculator = SiEngine.create(SiEngine.DIRECT, raster_path, clipped_raster_path, radius, 0, 1)
+        si_calculator.padded = True
+        expected = si_calculator.calculate()
+
+        assert numpy.count_nonzero(expected) > 0
+        numpy.testing.assert_allclose(si_matrix, expected, rtol=0, atol=ABSOLUTE_TOLERANCE)
@@ -0,0 +1,73 @@
+from pathlib import Path
+from typing import Tuple
+
+import numpy
+import pytest
+from osgeo import gdal
+
+from src.urban_sprawl.common.dataset_cache import DatasetCache
+from src.urban_sprawl.si.si_engine import SiEngine
+from src.urban_sprawl.si.tiled_si_calculator import TiledSiCalculator
+
+ABSOLUTE_TOLERANCE = 1e-6
+
+RADIUS = 300
+PIXEL_SIZE = 25
+
+
+def _write_raster(path: str, matrix: numpy.ndarray) -> str:
+    raster = gdal.GetDriverByName('GTiff').Create(path, matrix.shape[1], matrix.shape[0], 1, gdal.GDT_Int16)
+    raster.SetGeoTransform((2600000, PIXEL_SIZE, 0, 1200000, 0, -PIXEL_SIZE))
+    raster.GetRasterBand(1).WriteArray(matrix)
+    raster.FlushCache()
+    del raster
+
+    return path
+
+
+@pytest.fixture(name='rasters', params=[0.05, 0.3])
+def fixture_rasters(request: pytest.FixtureRequest, tmp_path: Path) -> Tuple[str, str]:
+    generator = numpy.random.default_rng(7)
+    matrix = (generator.random((90, 110)) < request.param).astype(numpy.int16)
+
+    clipped_matrix = numpy.zeros_like(matrix)
+    clipped_matrix[20:70, 15:95] = matrix[20:70, 15:95]
+
+    DatasetCache.clear()
+    return (_write_raster(str(tmp_path / 'raster.tif'), matrix), _write_raster(str(tmp_path / 'clipped.tif'), clipped_matrix))
+
+
+def _calculate(engine: str, raster_path: str, clipped_raster_path: str) -> numpy.ndarray:
+    si_calculator = SiEngine.create(engine, raster_path, clipped_raster_path, RADIUS, 0, 1)
+    si_calculator.padded = True
+
+    return si_calculator.calculate()
+
+
+@pytest.mark.parametrize('engine', [engine for engine in SiEngine.ENGINES if engine != SiEngine.DIRECT])
+def test_engine_matches_direct(engine: str, rasters: Tuple[str, str]) -> None:
+    expected = _calculate(SiEngine.DIRECT, *rasters)
+    actual = _calculate(engine, *rasters)
+
+    assert numpy.count_nonzero(expected) > 0
+    numpy.testing.assert_array_equal(actual == 0, expected == 0)
+    numpy.testing.assert_allclose(actual, expected, rtol=0, atol=ABSOLUTE_TOLERANCE)
+
+
+def test_window_matches_padded(rasters: Tuple[str, str]) -> None:
+    si_calculator = SiEngine.create(SiEngine.CONVOLUTION, *rasters, RADIUS, 0, 1)
+    window = si_calculator.get_output_window()
+
+    numpy.testing.assert_array_equal(si_calculator.calculate(), _calculate(SiEngine.CONVOLUTION, *rasters)[window.slices])
+
+
+def test_tiled_matches_direct(rasters: Tuple[str, str], tmp_path: Path) -> None:
+    expected = _calculate(SiEngine.DIRECT, *rasters)
+
+    si_calculator = SiEngine.create(SiEngine.CONVOLUTION, *rasters, RADIUS, 0, 1)
+    si_calculator.padded = True
+
+    output = gdal.GetDriverByName('GTiff').Create(str(tmp_path / 'si.tif'), expected.shape[1], expected.shape[0], 1, gdal.GDT_Float32)
+    TiledSiCalculator(si_calculator, 40 * 40 * TiledSiCalculator.BYTES_PER_CELL).calculate(output.GetRasterBand(1))
+
+    numpy.testing.assert_allclose(output.GetRasterBand(1).ReadAsArray(), expected, rtol=0, atol=ABSOLUTE_TOLERANCE)
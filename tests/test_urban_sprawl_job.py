@@ -0,0 +1,44 @@
+import json
+import os
+from pathlib import Path
+
+from src import constants
+from src.urban_sprawl.jobs.urban_sprawl_job import UrbanSprawlJob
+from src.urban_sprawl.si.si_engine import SiEngine
+
+
+def test_from_dict_normalizes_values(tmp_path: Path) -> None:
+    job = UrbanSprawlJob.from_dict({' Raster ': 'zurich.tif ', 'VECTOR': 'zurich.gpkg', 'residents': '1000', 'employees': 500,
+                                    'ssa': '0.5', 'engine': '', 'si_output': 'si.tif', 'layer': None},
+                                   2,
+                                   str(tmp_path))
+
+    assert job.error is None
+    assert job.job_id == '3'
+    assert job.raster_path == os.path.join(str(tmp_path), 'zurich.tif')
+    assert job.vector_path == os.path.join(str(tmp_path), 'zurich.gpkg')
+    assert job.si_output_path == os.path.join(str(tmp_path), 'si.tif')
+    assert (job.resident_count, job.employee_count, job.ssa_value) == (1000, 500, 0.5)
+    assert job.layer is None
+    assert job.engine == SiEngine.CONVOLUTION
+    assert job.radius == constants.RADIUS_VALUE
+
+
+def test_from_dict_reports_invalid_rows(tmp_path: Path) -> None:
+    missing = UrbanSprawlJob.from_dict({'id': 'bern', 'raster': 'bern.tif', 'residents': '1000', 'employees': ''}, 0, str(tmp_path))
+    invalid = UrbanSprawlJob.from_dict(['bern.tif'], 1, str(tmp_path))
+
+    assert missing.job_id == 'bern'
+    assert missing.error == 'Job 1 is missing vector, employees'
+    assert invalid.job_id == '2'
+    assert invalid.error == 'Job 2 is not an object'
+
+
+def test_load_reports_duplicate_ids(tmp_path: Path) -> None:
+    path = tmp_path / 'jobs.json'
+    job = {'id': 'a', 'raster': 'a.tif', 'vector': 'a.gpkg', 'residents': 1, 'employees': 1}
+    path.write_text(json.dumps({'jobs': [job, job]}), encoding='utf-8')
+
+    jobs = UrbanSprawlJob.load(str(path))
+
+    assert [job.error for job in jobs] == [None, 'Job 2 has the duplicate id a']
@@ -0,0 +1,65 @@
+from typing import List
+
+import numpy
+import pytest
+
+from src.urban_sprawl.wup.parameter_distribution import ParameterDistribution
+from src.urban_sprawl.wup.wup_calculator import WupCalculator
+from src.urban_sprawl.wup.wup_monte_carlo import WupMonteCarlo
+
+
+@pytest.mark.parametrize('string, kind, parameters', [
+    ('1000', ParameterDistribution.FIXED, [1000.0]),
+    ('uniform 900 1100', ParameterDistribution.UNIFORM, [900.0, 1100.0]),
+    ('Normal(1000, 50)', ParameterDistribution.NORMAL, [1000.0, 50.0]),
+    ('triangular 900;1000;1200', ParameterDistribution.TRIANGULAR, [900.0, 1000.0, 1200.0]),
+])
+def test_parse(string: str, kind: str, parameters: List[float]) -> None:
+    distribution = ParameterDistribution.parse(string)
+
+    assert distribution.kind == kind
+    assert distribution.parameters == parameters
+
+
+@pytest.mark.parametrize('string', ['', 'uniform 900', 'poisson 3', 'normal 1000 a'])
+def test_parse_rejects_invalid_distribution(string: str) -> None:
+    with pytest.raises(ValueError):
+        ParameterDistribution.parse(string)
+
+
+def test_sample_is_reproducible() -> None:
+    distribution = ParameterDistribution.parse('triangular 900 1000 1200')
+
+    samples = distribution.sample(1000, numpy.random.default_rng(0))
+
+    numpy.testing.assert_array_equal(samples, distribution.sample(1000, numpy.random.default_rng(0)))
+    assert samples.min() >= 900
+    assert samples.max() <= 1200
+
+
+def test_calculate_matches_wup_calculator() -> None:
+    dis_values = numpy.array([10.0, 35.0, 50.0])
+    build_up_areas = numpy.array([250000.0, 900000.0, 1500000.0])
+    resident_counts = numpy.array([800, 1000, 3000])
+    employee_counts = numpy.array([200, 500, 1000])
+    ssa_values = numpy.array([1.0, 0.5, 0.8])
+
+    lup_values = WupMonteCarlo.get_lup(build_up_areas, resident_counts, employee_counts)
+    wup_values = WupMonteCarlo.calculate(dis_values, lup_values, ssa_values)
+
+    for (index, wup_value) in enumerate(wup_values):
+        lup_value = build_up_areas[index] / (resident_counts[index] + employee_counts[index])
+        assert wup_value == pytest.approx(WupCalculator.calculate(float(dis_values[index]), lup_value, float(ssa_values[index])))
+
+
+def test_invalid_samples_are_ignored() -> None:
+    lup_values = WupMonteCarlo.get_lup(numpy.array([-1.0, 1000.0, 1000.0]), numpy.array([10, 0, 10]), numpy.array([0, 0, 0]))
+    wup_values = WupMonteCarlo.calculate(numpy.array([20.0, 20.0, 20.0, -1.0]),
+                                         numpy.append(lup_values, 100.0),
+                                         numpy.array([1.0, 1.0, 1.5, 1.0]))
+
+    assert numpy.isnan(wup_values).all()
+    with pytest.raises(ValueError):
+        WupMonteCarlo.get_quantiles(wup_values, [50])
+
+    numpy.testing.assert_array_equal(WupMonteCarlo.get_quantiles(numpy.array([numpy.nan, 1.0, 3.0]), [0, 50, 100]), [1.0, 2.0, 3.0])
@@ -1,11 +1,16 @@
 from qgis.core import QgsProcessingProvider
 
 from .src import constants
+from .src.calculate_batch_wup_processing_script import CalculateBatchWupProcessingScript
 from .src.calculate_dis_processing_script import CalculateDisProcessingScript
 from .src.calculate_lup_processing_script import CalculateLupProcessingScript
 from .src.calculate_si_processing_script import CalculateSiProcessingScript
+from .src.calculate_si_sweep_processing_script import CalculateSiSweepProcessingScript
+from .src.calculate_time_series_wup_processing_script import CalculateTimeSeriesWupProcessingScript
+from .src.calculate_wup_monte_carlo_processing_script import CalculateWupMonteCarloProcessingScript
 from .src.calculate_wup_processing_script import CalculateWupProcessingScript
 from .src.clip_raster_processing_script import ClipRasterProcessingScript
+from .src.urban_sprawl.si.parallel_si_calculator import ParallelSiCalculator
 from .src.urban_sprawl_calculator_processing_script import UrbanSprawlCalculatorProcessingScript
 
 
@@ -14,13 +19,17 @@ class UrbanSprawlProvider(QgsProcessingProvider):
         QgsProcessingProvider.__init__(self)
 
     def unload(self) -> None:
-        pass
+        ParallelSiCalculator.shutdown()
 
     def loadAlgorithms(self) -> None:
+        self.addAlgorithm(CalculateBatchWupProcessingScript())
         self.addAlgorithm(CalculateDisProcessingScript())
         self.addAlgorithm(CalculateLupProcessingScript())
         self.addAlgorithm(CalculateSiProcessingScript())
+        self.addAlgorithm(CalculateSiSweepProcessingScript())
+        self.addAlgorithm(CalculateTimeSeriesWupProcessingScript())
         self.addAlgorithm(CalculateWupProcessingScript())
+        self.addAlgorithm(CalculateWupMonteCarloProcessingScript())
         self.addAlgorithm(ClipRasterProcessingScript())
         self.addAlgorithm(UrbanSprawlCalculatorProcessingScript())
 